@@ -0,0 +1,120 @@
+"""
+Admission control: per-process limits on concurrent requests per route class.
+
+Each pool in settings.ADMISSION_POOLS admits up to `limit` requests at once.
+Further requests wait in a queue of at most `queue` entries for up to
+`timeout` seconds; when the queue is full or the wait runs out they are
+turned away, so a spike sheds load instead of piling up until timeouts.
+Routes are mapped to pools by view name in settings.ADMISSION_ROUTES.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+
+class AdmissionPool:
+    """
+    A counting semaphore with a bounded, timed wait queue and usage counters.
+    """
+
+    def __init__(self, name, limit, queue, timeout):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.peak_active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Take a slot, waiting in the queue if the pool is full.
+
+        Returns:
+            bool: True if admitted, False if the queue was full or the wait timed out.
+        """
+        with self._condition:
+            if self.active < self.limit and not self.waiting:
+                self._admit()
+                return True
+            if self.waiting >= self.queue:
+                self.rejected += 1
+                return False
+
+            deadline = time.monotonic() + self.timeout
+            self.waiting += 1
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        return False
+                    self._condition.wait(remaining)
+                self._admit()
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    def _admit(self):
+        self.active += 1
+        self.admitted += 1
+        self.peak_active = max(self.peak_active, self.active)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'pool': self.name,
+                'limit': self.limit,
+                'active': self.active,
+                'utilization': round(self.active / self.limit, 3) if self.limit else 0,
+                'waiting': self.waiting,
+                'queue': self.queue,
+                'peak_active': self.peak_active,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name):
+    """
+    Return the pool configured under `name`, created on first use.
+    """
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = AdmissionPool(name, **settings.ADMISSION_POOLS[name])
+        return _pools[name]
+
+
+def get_pool_name(view_name):
+    return settings.ADMISSION_ROUTES.get(view_name, 'default')
+
+
+def pool_stats():
+    """
+    Return the counters of every configured pool of this process.
+    """
+    return [get_pool(name).stats() for name in settings.ADMISSION_POOLS]
+
+
+def reset_pools():
+    """
+    Drop all pools, e.g. after the settings changed. Requests in flight
+    release their slot on the pool they took it from.
+    """
+    with _pools_lock:
+        _pools.clear()
@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# Imported once Django is set up; preloads the lazily initialized parts of
+# the app before the server sends this worker any requests.
+from core.warmup import warm_up  # noqa: E402
+
+warm_up()
@@ -0,0 +1,139 @@
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from django.middleware.gzip import GZipMiddleware
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.admission import get_pool, get_pool_name
+from core.profiling import run_profiled
+from core.slow_queries import SlowQueryWatcher
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that only compresses responses of at least
+    settings.GZIP_MIN_LENGTH bytes. Small payloads are sent as they are,
+    since compressing them costs more CPU than it saves on the wire.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.GZIP_MIN_LENGTH:
+            return response
+        return super().process_response(request, response)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests with cProfile and records their SQL statements.
+
+    A request is profiled when a staff user sends the `X-Profile: 1` header,
+    or at random with probability settings.PROFILING_SAMPLE_RATE. Captures
+    are written to settings.PROFILING_DIR; see `manage.py profiles`.
+    """
+    header = 'HTTP_X_PROFILE'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.META.get(self.header) and self.is_staff(request):
+            response, name = run_profiled(self.get_response, request)
+            response['X-Profile-Id'] = name
+            return response
+
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            response, name = run_profiled(self.get_response, request)
+            return response
+
+        return self.get_response(request)
+
+    def is_staff(self, request):
+        """
+        Check for a staff user via the session or, for API clients, the auth token.
+        DRF only authenticates inside the view, so the token is resolved here.
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+
+        try:
+            result = TokenAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return result is not None and result[0].is_staff
+
+
+class SlowQueryLogMiddleware:
+    """
+    Times every statement of every request, on all databases, and records
+    slow ones in core.slow_queries.slow_query_log. Statements repeated too
+    often are counted in a sampled share of requests
+    (settings.SLOW_QUERY_REPEAT_SAMPLE_RATE).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.SLOW_QUERY_REPEAT_SAMPLE_RATE
+        watcher = SlowQueryWatcher(request, count_repeats=bool(rate) and random.random() < rate)
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(watcher))
+            response = self.get_response(request)
+        watcher.flush()
+        return response
+
+
+class AdmissionControlMiddleware:
+    """
+    Admits each resolved request through the admission pool of its route
+    (see core.admission) and answers 503 with Retry-After when the pool
+    sheds it. The slot is held until the response has been produced.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            pool = getattr(request, '_admission_pool', None)
+            if pool is not None:
+                pool.release()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        pool = get_pool(get_pool_name(request.resolver_match.view_name))
+        if not pool.acquire():
+            response = JsonResponse(
+                {'detail': 'Der Server ist ausgelastet. Bitte versuche es gleich noch einmal.'},
+                status=503
+            )
+            response['Retry-After'] = str(settings.ADMISSION_RETRY_AFTER_SECONDS)
+            return response
+        request._admission_pool = pool
+        return None
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Reports the state of the client's token bucket (see core.throttling) in
+    the X-RateLimit-Limit, X-RateLimit-Remaining and X-RateLimit-Reset headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        state = getattr(request, 'rate_limit', None)
+        if state is not None:
+            response['X-RateLimit-Limit'] = str(state['limit'])
+            response['X-RateLimit-Remaining'] = str(state['remaining'])
+            response['X-RateLimit-Reset'] = str(state['reset'])
+        return response
@@ -0,0 +1,174 @@
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from rest_framework.permissions import BasePermission
+from rest_framework.serializers import Field
+from rest_framework.views import APIView
+
+
+PROJECT_ROOT = str(settings.BASE_DIR)
+SITE_PACKAGES = ('site-packages', 'dist-packages')
+
+
+def is_project_frame(frame):
+    """
+    Return True if the frame runs code from this project rather than from
+    Django, DRF or the profiling helpers themselves.
+    """
+    filename = frame.f_code.co_filename
+    return (
+        filename.startswith(PROJECT_ROOT)
+        and not any(part in filename for part in SITE_PACKAGES)
+        and filename != __file__
+    )
+
+
+def describe_frame_owner(frame):
+    """
+    Name the serializer field, permission class or view method a frame belongs to.
+
+    Returns:
+        str | None: e.g. "serializer field BoardDetailReadSerializer.members", or None.
+    """
+    owner = frame.f_locals.get('self')
+    if owner is None:
+        return None
+
+    # Checked on the type: isinstance() would evaluate lazy objects such as
+    # request.user, which can run a query from inside the query hook.
+    owner_type = type(owner)
+    if issubclass(owner_type, Field) and owner.field_name and owner.parent is not None:
+        return f'serializer field {type(owner.parent).__name__}.{owner.field_name}'
+    if issubclass(owner_type, BasePermission):
+        return f'permission {owner_type.__name__}.{frame.f_code.co_name}'
+    if issubclass(owner_type, APIView):
+        return f'view {owner_type.__name__}.{frame.f_code.co_name}'
+    return None
+
+
+def get_query_origin(skip=2):
+    """
+    Walk the current stack outwards and describe where a query came from.
+
+    Args:
+        skip (int): Innermost frames to ignore (the caller and its wrapper).
+
+    Returns:
+        dict: 'origin' is the closest serializer field, permission or view
+        method; 'stack' lists the project frames as "file:line in function".
+    """
+    frame = sys._getframe(skip)
+    origin = None
+    stack = []
+
+    while frame is not None:
+        if origin is None:
+            origin = describe_frame_owner(frame)
+        if is_project_frame(frame):
+            filename = os.path.relpath(frame.f_code.co_filename, PROJECT_ROOT)
+            stack.append(f'{filename}:{frame.f_lineno} in {frame.f_code.co_name}')
+        frame = frame.f_back
+
+    return {'origin': origin or 'unknown', 'stack': stack}
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that records every statement with its database,
+    duration and origin. Install it with `connection.execute_wrapper(recorder)`.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries.append({
+                'database': context['connection'].alias,
+                'sql': sql,
+                'duration_ms': round(duration * 1000, 3),
+                **get_query_origin(),
+            })
+
+
+def get_profile_dir():
+    """
+    Return the directory profiles are written to, creating it if needed.
+    """
+    path = Path(settings.PROFILING_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def save_profile(profiler, recorder, request, response, duration):
+    """
+    Write the cProfile stats and the SQL trace of one request to the profile
+    directory, then drop the oldest captures beyond PROFILING_MAX_FILES.
+
+    Returns:
+        str: The base name shared by the .prof and .json files.
+    """
+    directory = get_profile_dir()
+    slug = request.path.strip('/').replace('/', '-') or 'root'
+    name = f'{timezone.now():%Y%m%d-%H%M%S-%f}-{request.method}-{slug}'
+
+    profiler.dump_stats(directory / f'{name}.prof')
+    with open(directory / f'{name}.json', 'w') as trace_file:
+        json.dump({
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+            'queries': recorder.queries,
+        }, trace_file, indent=2)
+
+    rotate_profiles(directory)
+    return name
+
+
+def rotate_profiles(directory):
+    """
+    Keep only the newest PROFILING_MAX_FILES captures.
+    """
+    traces = sorted(directory.glob('*.json'))
+    excess = len(traces) - settings.PROFILING_MAX_FILES
+    for trace in traces[:max(excess, 0)]:
+        trace.unlink(missing_ok=True)
+        trace.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def run_profiled(get_response, request):
+    """
+    Run the request under cProfile with a QueryRecorder installed on every
+    database, so queries on board shards are traced too.
+
+    Returns:
+        tuple: (response, profile name)
+    """
+    profiler = cProfile.Profile()
+    recorder = QueryRecorder()
+    start = time.perf_counter()
+
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+
+    name = save_profile(profiler, recorder, request, response, time.perf_counter() - start)
+    return response, name
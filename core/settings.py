@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,17 +42,23 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'auth_app',
-    'kanban_app'
+    'kanban_app',
+    'jobs_app',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ThresholdGZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.AdmissionControlMiddleware',
+    'core.middleware.RateLimitHeadersMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.SlowQueryLogMiddleware',
+    'core.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -131,5 +139,161 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
-    ]
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'core.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.TokenBucketThrottle',
+    ],
+}
+
+# Responses smaller than this many bytes are not gzip-compressed.
+GZIP_MIN_LENGTH = 1024
+
+# Done tasks untouched for this many days are moved to the archive tables
+# by `manage.py archive_tasks`, in transactions of KANBAN_ARCHIVE_BATCH_SIZE tasks.
+KANBAN_ARCHIVE_AFTER_DAYS = 90
+KANBAN_ARCHIVE_BATCH_SIZE = 500
+
+# Admin changelists of the kanban tables count at most this many rows
+# (kanban_app.admin.EstimatedCountPaginator).
+ADMIN_COUNT_LIMIT = 10000
+
+# Rows read and bulk-inserted per statement when a board is cloned (kanban_app.cloning).
+KANBAN_CLONE_BATCH_SIZE = 2000
+
+# Requests from staff users with the `X-Profile: 1` header, plus this share
+# of all requests, are profiled into PROFILING_DIR (see `manage.py profiles`).
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_MAX_FILES = 100
+
+# Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their query
+# plan and kept in a per-process table (GET /api/slow-queries/), as are
+# statements run more than SLOW_QUERY_REPEAT_THRESHOLD times in one request.
+# Repeats are counted in SLOW_QUERY_REPEAT_SAMPLE_RATE of the requests.
+SLOW_QUERY_REPEAT_SAMPLE_RATE = 1.0
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_REPEAT_THRESHOLD = 20
+SLOW_QUERY_LOG_MAX_ENTRIES = 200
+
+# Deleted boards are hidden immediately and purged later in transactions of
+# this many rows (`manage.py purge_deleted_boards`).
+KANBAN_PURGE_BATCH_SIZE = 1000
+
+# Background jobs (`manage.py run_worker`). Failed attempts are retried after
+# JOBS_RETRY_BACKOFF_SECONDS * 2^(attempt - 1), capped at JOBS_RETRY_MAX_BACKOFF_SECONDS.
+# Workers renew the lock of a running job every JOBS_HEARTBEAT_INTERVAL_SECONDS;
+# running jobs whose lock has not been renewed for JOBS_LOCK_TIMEOUT_SECONDS
+# (the worker died) are claimed again.
+JOBS_CONCURRENCY = 2
+JOBS_POLL_INTERVAL_SECONDS = 1.0
+JOBS_RETRY_BACKOFF_SECONDS = 10
+JOBS_RETRY_MAX_BACKOFF_SECONDS = 3600
+JOBS_LOCK_TIMEOUT_SECONDS = 600
+JOBS_HEARTBEAT_INTERVAL_SECONDS = 30
+
+# How long GET /api/dashboard/ results are cached per user.
+DASHBOARD_CACHE_SECONDS = 30
+
+# A board opened without a snapshot queues its build at most once per this many seconds.
+BOARD_SNAPSHOT_QUEUE_SECONDS = 60
+
+# Task position keys longer than this trigger a background rebalance of their
+# column, queued at most once per KANBAN_REBALANCE_QUEUE_SECONDS per column.
+KANBAN_POSITION_REBALANCE_LENGTH = 24
+KANBAN_REBALANCE_QUEUE_SECONDS = 60
+
+# Activity log entries are buffered per request/worker and bulk-inserted in
+# batches of this size; `manage.py prune_activity` drops entries older than
+# ACTIVITY_LOG_RETENTION_DAYS.
+ACTIVITY_LOG_BATCH_SIZE = 500
+ACTIVITY_LOG_RETENTION_DAYS = 180
+
+# Maximum number of sub-requests accepted by POST /api/batch/.
+BATCH_MAX_REQUESTS = 20
+
+# Nested users in API responses come from a per-process cache
+# (kanban_app.user_directory) holding at most this many users. Changes reach
+# other processes after USER_DIRECTORY_TTL_SECONDS.
+USER_DIRECTORY_MAX_ENTRIES = 10000
+USER_DIRECTORY_TTL_SECONDS = 60
+
+# Comment bodies of at least this many characters are stored zlib-compressed
+# (kanban_app.fields.CompressedTextField).
+TEXT_COMPRESS_MIN_LENGTH = 2000
+
+# Admission control (core.admission), per worker process: each pool admits
+# `limit` concurrent requests, queues up to `queue` more for at most `timeout`
+# seconds and answers the rest with 503 and Retry-After. ADMISSION_ROUTES maps
+# view names to pools; all other routes share the default pool.
+ADMISSION_POOLS = {
+    'heavy': {'limit': 4, 'queue': 8, 'timeout': 2.0},
+    'auth': {'limit': 4, 'queue': 16, 'timeout': 5.0},
+    'default': {'limit': 32, 'queue': 64, 'timeout': 5.0},
 }
+ADMISSION_ROUTES = {
+    'board-detail': 'heavy',
+    'board-clone': 'heavy',
+    'dashboard': 'heavy',
+    'batch': 'heavy',
+    'login': 'auth',
+    'registration': 'auth',
+}
+ADMISSION_RETRY_AFTER_SECONDS = 1
+
+# Preload URLs, serializers and model caches when a worker starts
+# (core.warmup, called from core.wsgi and core.asgi).
+# `manage.py startup_report` shows what startup and first requests cost.
+WARMUP_ON_STARTUP = True
+
+# Responses to task and comment writes sent with an Idempotency-Key header
+# are replayed for retries within this period (kanban_app.idempotency);
+# `manage.py prune_idempotency_keys` deletes older keys.
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 60 * 60
+# A key whose first request has not finished within this many seconds (for
+# instance because its worker died) is handed to the next retry.
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = 60
+
+# Token-bucket rate limits per user (or client address) and route class
+# (core.throttling), as "requests/period" with period s, min, h or day.
+# THROTTLE_ROUTES maps view names to route classes, like ADMISSION_ROUTES;
+# other routes use 'default'. Buckets are shared by all workers on the host
+# through THROTTLE_STORE_PATH, a table of THROTTLE_STORE_SLOTS buckets.
+THROTTLE_RATES = {
+    'heavy': '120/min',
+    'auth': '20/min',
+    'default': '1200/min',
+}
+THROTTLE_ROUTES = ADMISSION_ROUTES
+THROTTLE_STORE_PATH = Path(os.environ.get(
+    'THROTTLE_STORE_PATH',
+    '/dev/shm/kanmind-throttle' if Path('/dev/shm').is_dir() else Path(tempfile.gettempdir()) / 'kanmind-throttle'
+))
+THROTTLE_STORE_SLOTS = 65536
+
+# Optional board sharding (see kanban_app.sharding): with KANBAN_SHARDS > 0
+# boards and everything on them are spread over that many SQLite files in
+# KANBAN_SHARD_DIR, while users, tokens and jobs stay in the default database.
+# Migrate each shard with `manage.py migrate --database shard_<n>`.
+KANBAN_SHARDS = int(os.environ.get('KANBAN_SHARDS', 0))
+KANBAN_SHARD_DIR = Path(os.environ.get('KANBAN_SHARD_DIR', BASE_DIR))
+
+for index in range(KANBAN_SHARDS):
+    DATABASES[f'shard_{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': KANBAN_SHARD_DIR / f'shard_{index}.sqlite3',
+    }
+
+if KANBAN_SHARDS:
+    DATABASE_ROUTERS = ['kanban_app.sharding.BoardShardRouter']
+    MIDDLEWARE.append('kanban_app.sharding.ShardMiddleware')
@@ -0,0 +1,237 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.profiling import get_query_origin
+
+
+logger = logging.getLogger(__name__)
+
+_explaining = threading.local()
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape: literals become placeholders and
+    IN lists of any length collapse to one form. Cached, since the ORM
+    sends the same parameterized SQL over and over.
+
+    Args:
+        sql (str): The raw SQL as passed to the cursor.
+
+    Returns:
+        str: The normalized statement.
+    """
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = IN_LIST.sub('IN (...)', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+@lru_cache(maxsize=1024)
+def fingerprint_sql(normalized):
+    """
+    Return a short stable id for a normalized statement.
+    """
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def explain_query(connection, sql, params):
+    """
+    Return the query plan of a SELECT statement on `connection`, or None.
+
+    Uses EXPLAIN QUERY PLAN on SQLite and plain EXPLAIN elsewhere; neither
+    executes the statement.
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    _explaining.active = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except Exception as exc:
+        return f'EXPLAIN failed: {exc}'
+    finally:
+        _explaining.active = False
+
+    if connection.vendor == 'sqlite':
+        return '\n'.join(str(row[-1]) for row in rows)
+    return '\n'.join(str(row[0]) for row in rows)
+
+
+class SlowQueryLog:
+    """
+    Process-wide rolling table of problem statements, keyed by fingerprint.
+
+    Holds at most settings.SLOW_QUERY_LOG_MAX_ENTRIES fingerprints; the one
+    seen least recently is dropped first.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_entry(self, fingerprint, normalized):
+        entry = self.entries.pop(fingerprint, None)
+        if entry is None:
+            entry = {
+                'fingerprint': fingerprint,
+                'sql': normalized,
+                'plan': None,
+                'slow_count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'repeated_requests': 0,
+                'max_repeats': 0,
+                'views': Counter(),
+                'origins': Counter(),
+                'last_seen': None,
+            }
+        self.entries[fingerprint] = entry
+
+        while len(self.entries) > settings.SLOW_QUERY_LOG_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+        return entry
+
+    def record_slow(self, fingerprint, normalized, duration_ms, view, origin, plan):
+        with self.lock:
+            entry = self.get_entry(fingerprint, normalized)
+            entry['slow_count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['views'][view] += 1
+            entry['origins'][origin] += 1
+            entry['last_seen'] = timezone.now()
+            if plan is not None:
+                entry['plan'] = plan
+
+    def record_repeated(self, fingerprint, normalized, repeats, view, origin):
+        with self.lock:
+            entry = self.get_entry(fingerprint, normalized)
+            entry['repeated_requests'] += 1
+            entry['max_repeats'] = max(entry['max_repeats'], repeats)
+            entry['views'][view] += 1
+            entry['origins'][origin] += 1
+            entry['last_seen'] = timezone.now()
+
+    def has_plan(self, fingerprint):
+        entry = self.entries.get(fingerprint)
+        return entry is not None and entry['plan'] is not None
+
+    def top(self, limit=20, order_by='total_ms'):
+        """
+        Return copies of the worst entries, sorted descending by `order_by`.
+
+        Raises:
+            ValueError: If limit is not a positive integer.
+        """
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise ValueError('limit must be a positive integer')
+        with self.lock:
+            entries = sorted(self.entries.values(), key=lambda entry: entry[order_by], reverse=True)
+            return [
+                {**entry, 'views': dict(entry['views']), 'origins': dict(entry['origins'])}
+                for entry in entries[:limit]
+            ]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+class SlowQueryWatcher:
+    """
+    Execute wrapper for one request, installed on every database connection.
+    Logs statements slower than settings.SLOW_QUERY_THRESHOLD_MS right away
+    and, when the request ends and `count_repeats` is set, statements that
+    ran more than settings.SLOW_QUERY_REPEAT_THRESHOLD times. Without
+    count_repeats a fast statement costs only its timing.
+    """
+
+    def __init__(self, request, count_repeats=True):
+        self.request = request
+        self.count_repeats = count_repeats
+        self.counts = Counter()
+        self.samples = {}
+
+    def get_view(self):
+        """
+        Describe the request as "<url name> (<view class>)", falling back to the path
+        while the URL has not been resolved yet.
+        """
+        match = getattr(self.request, 'resolver_match', None)
+        if match is None:
+            return self.request.path
+        view = getattr(match.func, 'view_class', match.func)
+        return f'{match.url_name or match.route} ({view.__name__})'
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_explaining, 'active', False):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.observe(context['connection'], sql, params, many, (time.perf_counter() - start) * 1000)
+
+    def observe(self, connection, sql, params, many, duration_ms):
+        slow = duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS
+        if not (slow or self.count_repeats):
+            return
+
+        normalized = normalize_sql(sql)
+        fingerprint = fingerprint_sql(normalized)
+        if self.count_repeats:
+            self.counts[fingerprint] += 1
+            # The stack is only walked once a statement starts repeating too often.
+            if self.counts[fingerprint] == settings.SLOW_QUERY_REPEAT_THRESHOLD + 1:
+                self.samples[fingerprint] = (normalized, get_query_origin(skip=3)['origin'])
+
+        if slow:
+            self.log_slow(connection, sql, params, many, fingerprint, normalized, duration_ms)
+
+    def log_slow(self, connection, sql, params, many, fingerprint, normalized, duration_ms):
+        view = self.get_view()
+        origin = get_query_origin(skip=4)['origin']
+        plan = None
+        if not many and not slow_query_log.has_plan(fingerprint):
+            plan = explain_query(connection, sql, params)
+
+        slow_query_log.record_slow(fingerprint, normalized, duration_ms, view, origin, plan)
+        logger.warning(
+            'Slow query %s (%.1f ms) in %s from %s: %s\n%s',
+            fingerprint, duration_ms, view, origin, normalized, plan or '',
+        )
+
+    def flush(self):
+        """
+        Record the statements this request repeated too often.
+        """
+        view = self.get_view()
+        for fingerprint, (normalized, origin) in self.samples.items():
+            repeats = self.counts[fingerprint]
+            slow_query_log.record_repeated(fingerprint, normalized, repeats, view, origin)
+            logger.warning(
+                'Query %s ran %d times in %s from %s: %s',
+                fingerprint, repeats, view, origin, normalized,
+            )
@@ -0,0 +1,387 @@
+import datetime
+import gzip
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import msgpack
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.core.management.base import CommandError
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core import throttling
+from core.admission import AdmissionPool, get_pool, reset_pools
+from core.renderers import FastJSONRenderer
+from core.slow_queries import normalize_sql, slow_query_log
+from core.throttling import SharedBucketStore, parse_rate
+from core.warmup import WARMUP_STEPS
+from jobs_app.models import Job
+from kanban_app.api.views import DashboardView
+from kanban_app.models import Board
+
+
+class RendererTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.board_id = self.client.post('/api/boards/', {'title': 'Board', 'members': []}, format='json').json()['id']
+
+    def test_fast_json_matches_drf(self):
+        data = {
+            'text': 'Zeile\u2028Absatz\u2029 äöü',
+            'created': datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2025, 1, 2),
+            'amount': Decimal('1.50'),
+            'nested': [{1: None, 'ok': True}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_accept_header_selects_renderer(self):
+        url = f'/api/boards/{self.board_id}/'
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), self.client.get(url).json())
+        self.assertTrue(self.client.get(url)['Content-Type'].startswith('application/json'))
+
+    def test_request_bodies_are_parsed(self):
+        body = {'board': self.board_id, 'title': 'Packed', 'description': 'd', 'due_date': '2025-02-01'}
+        response = self.client.post('/api/tasks/', msgpack.packb(body), content_type='application/msgpack')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['title'], 'Packed')
+
+        for content_type, payload in [('application/json', b'{bad'), ('application/msgpack', b'\xc1')]:
+            response = self.client.post('/api/tasks/', payload, content_type=content_type)
+            self.assertEqual(response.status_code, 400, content_type)
+
+    @override_settings(GZIP_MIN_LENGTH=500)
+    def test_only_large_responses_are_compressed(self):
+        small = self.client.get('/api/tasks/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertLess(len(small.content), 500)
+        self.assertFalse(small.has_header('Content-Encoding'))
+
+        for i in range(10):
+            self.client.post('/api/tasks/', {
+                'board': self.board_id, 'title': f'Task {i}', 'description': 'd' * 50, 'due_date': '2025-02-01',
+            }, format='json')
+        large = self.client.get('/api/tasks/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(large['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(large.content)), self.client.get('/api/tasks/').json())
+
+    def test_benchmark_rolls_back_its_synthetic_board(self):
+        out = StringIO()
+        call_command('benchmark_renderers', synthetic_tasks=20, repeat=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[:2] for line in lines[-9:]][::3], [
+            ['board-detail', 'drf-json'], ['task-list', 'drf-json'], ['comment-list', 'drf-json'],
+        ])
+        self.assertFalse(Board.objects.filter(title='Benchmark board').exists())
+        self.assertFalse(User.objects.filter(username='benchmark-user').exists())
+
+
+class ProfilingTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(PROFILING_DIR=self.directory, PROFILING_SAMPLE_RATE=0, PROFILING_MAX_FILES=3))
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.board_id = self.client.post('/api/boards/', {'title': 'Board', 'members': []}, format='json').json()['id']
+        self.client.post('/api/tasks/', {
+            'board': self.board_id, 'title': 'Task', 'description': 'd', 'due_date': '2025-01-01',
+        }, format='json')
+
+    def captures(self, suffix='.json'):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(suffix))
+
+    def test_header_is_honoured_for_staff_tokens_only(self):
+        response = self.client.get('/api/tasks/', HTTP_X_PROFILE='1')
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(self.captures(), [])
+
+        self.user.is_staff = True
+        self.user.save()
+        self.assertFalse(self.client.get('/api/tasks/').has_header('X-Profile-Id'))
+        response = self.client.get('/api/tasks/', HTTP_X_PROFILE='1')
+        name = response['X-Profile-Id']
+        self.assertEqual(self.captures(), [f'{name}.json'])
+        self.assertEqual(self.captures('.prof'), [f'{name}.prof'])
+
+        with open(os.path.join(self.directory, f'{name}.json')) as trace_file:
+            trace = json.load(trace_file)
+        self.assertEqual((trace['method'], trace['path'], trace['status']), ('GET', '/api/tasks/', 200))
+        # Tasks live on a shard in sharded mode; those statements are traced too.
+        self.assertTrue(any('"kanban_app_task"' in query['sql'] for query in trace['queries']))
+        self.assertTrue(all(query['origin'] and query['database'] for query in trace['queries']))
+
+    def test_header_is_honoured_for_staff_sessions(self):
+        self.user.is_staff = self.user.is_superuser = True
+        self.user.save()
+        client = Client()
+        client.force_login(self.user)
+        self.assertTrue(client.get('/admin/kanban_app/task/', HTTP_X_PROFILE='1').has_header('X-Profile-Id'))
+
+    def test_sampled_requests_are_captured_without_header(self):
+        with override_settings(PROFILING_SAMPLE_RATE=1):
+            response = self.client.get('/api/tasks/')
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(len(self.captures()), 1)
+
+    def test_oldest_captures_are_rotated_out(self):
+        self.user.is_staff = True
+        self.user.save()
+        names = [self.client.get('/api/tasks/', HTTP_X_PROFILE='1')['X-Profile-Id'] for _ in range(5)]
+        self.assertEqual(self.captures(), [f'{name}.json' for name in names[2:]])
+        self.assertEqual(self.captures('.prof'), [f'{name}.prof' for name in names[2:]])
+
+    def test_profiles_command(self):
+        self.user.is_staff = True
+        self.user.save()
+        name = self.client.get(f'/api/boards/{self.board_id}/', HTTP_X_PROFILE='1')['X-Profile-Id']
+
+        out = StringIO()
+        call_command('profiles', stdout=out)
+        self.assertIn(name, out.getvalue())
+
+        out = StringIO()
+        call_command('profiles', name, limit=5, stdout=out)
+        self.assertIn(f'GET /api/boards/{self.board_id}/ → 200', out.getvalue())
+        self.assertIn('Queries by origin:', out.getvalue())
+        self.assertIn('Hottest functions', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('profiles', 'missing', stdout=StringIO())
+
+
+class SlowQueryLogTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        board = self.client.post('/api/boards/', {'title': 'Board', 'members': []}, format='json').json()
+        for i in range(5):
+            self.client.post('/api/tasks/', {
+                'board': board['id'], 'title': f'Task {i}', 'description': 'd',
+                'assignee_id': self.user.pk, 'due_date': '2025-01-01',
+            }, format='json')
+        slow_query_log.clear()
+
+    def test_normalize_sql_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND a = 'b''c' AND n = 5"),
+            'SELECT * FROM t WHERE id IN (...) AND a = ? AND n = ?'
+        )
+
+    @override_settings(SLOW_QUERY_REPEAT_SAMPLE_RATE=1, SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_REPEAT_THRESHOLD=0)
+    def test_sampled_request_records_statements(self):
+        self.client.get('/api/tasks/')
+
+        entries = slow_query_log.top(limit=50)
+        self.assertTrue(entries)
+        self.assertTrue(all(entry['slow_count'] >= 1 for entry in entries))
+        self.assertTrue(any(entry['repeated_requests'] for entry in entries))
+        # Task rows live on the shards in sharded mode; those connections are watched too.
+        self.assertTrue(any('"kanban_app_task"' in entry['sql'] for entry in entries))
+
+    @override_settings(SLOW_QUERY_REPEAT_SAMPLE_RATE=0, SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_REPEAT_THRESHOLD=0)
+    def test_unsampled_request_logs_slow_statements_only(self):
+        self.client.get('/api/tasks/')
+        entries = slow_query_log.top(limit=50)
+        self.assertTrue(any('"kanban_app_task"' in entry['sql'] for entry in entries))
+        self.assertTrue(all(entry['slow_count'] >= 1 and entry['repeated_requests'] == 0 for entry in entries))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60000, SLOW_QUERY_REPEAT_THRESHOLD=1000)
+    def test_fast_statements_are_not_logged(self):
+        self.client.get('/api/tasks/')
+        self.assertEqual(slow_query_log.top(), [])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_session_authenticated_request_is_watched(self):
+        self.user.is_superuser = True
+        self.user.save()
+        client = Client()
+        client.force_login(self.user)
+        response = client.get('/admin/kanban_app/task/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(slow_query_log.top())
+
+    def test_limit_must_be_positive_integer(self):
+        for limit in ['0', '-1', 'abc']:
+            response = self.client.get(f'/api/slow-queries/?limit={limit}')
+            self.assertEqual(response.status_code, 400, limit)
+        self.assertEqual(self.client.get('/api/slow-queries/?limit=5').status_code, 200)
+
+        for limit in [0, -3, 2.5, True]:
+            with self.assertRaises(ValueError):
+                slow_query_log.top(limit=limit)
+
+
+class AdmissionTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        reset_pools()
+        self.addCleanup(reset_pools)
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pool_admits_queues_rejects_and_times_out(self):
+        pool = AdmissionPool('test', limit=1, queue=1, timeout=0.05)
+        self.assertTrue(pool.acquire())
+
+        queued = []
+        waiter = threading.Thread(target=lambda: queued.append(pool.acquire()))
+        waiter.start()
+        while not pool.stats()['waiting']:
+            time.sleep(0.001)
+        # The queue holds one request, so the next one is turned away at once.
+        self.assertFalse(pool.acquire())
+        pool.release()
+        waiter.join()
+        self.assertEqual(queued, [True])
+
+        # The waiter now holds the only slot; a new request waits out the timeout.
+        self.assertFalse(pool.acquire())
+        pool.release()
+        self.assertEqual(
+            {key: value for key, value in pool.stats().items() if key in ('active', 'admitted', 'rejected', 'timed_out')},
+            {'active': 0, 'admitted': 2, 'rejected': 1, 'timed_out': 1}
+        )
+
+    @override_settings(ADMISSION_POOLS={
+        'heavy': {'limit': 0, 'queue': 0, 'timeout': 0},
+        'default': {'limit': 4, 'queue': 0, 'timeout': 0},
+    }, ADMISSION_RETRY_AFTER_SECONDS=3)
+    def test_full_pool_answers_503_with_retry_after(self):
+        response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+
+        # Routes of other pools are unaffected.
+        self.assertEqual(self.client.get('/api/boards/').status_code, 200)
+        self.assertEqual(get_pool('heavy').stats()['rejected'], 1)
+
+    def test_slot_is_released_when_view_raises(self):
+        with mock.patch.object(DashboardView, 'get', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                self.client.get('/api/dashboard/')
+        stats = get_pool('heavy').stats()
+        self.assertEqual((stats['active'], stats['admitted']), (0, 1))
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.client.get('/api/dashboard/')
+        self.assertEqual(self.client.get('/api/admission/').status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        pools = {entry['pool']: entry for entry in self.client.get('/api/admission/').json()}
+        self.assertEqual(set(pools), {'heavy', 'auth', 'default'})
+        self.assertEqual((pools['heavy']['admitted'], pools['heavy']['active']), (1, 0))
+        # The stats request itself holds a default slot while it is answered.
+        self.assertEqual(pools['default']['active'], 1)
+
+
+def drain_bucket(path, requests):
+    store = SharedBucketStore(path, 64)
+    return sum(store.consume('key', 50, 0.0001)[0] for _ in range(requests))
+
+
+class TokenBucketStoreTests(TestCase):
+    def setUp(self):
+        self.path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'buckets')
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('120/min'), (120, 2))
+        self.assertEqual(parse_rate('5/s'), (5, 5))
+
+    def test_bucket_refills_over_time(self):
+        store = SharedBucketStore(self.path, 64)
+        results = [store.consume('key', 3, 1, now=100)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(store.consume('key', 3, 1, now=100), (False, 0, 1))
+        self.assertTrue(store.consume('key', 3, 1, now=101)[0])
+        self.assertTrue(store.consume('other', 3, 1, now=100)[0])
+
+    def test_processes_share_buckets(self):
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            allowed = pool.starmap(drain_bucket, [(self.path, 30)] * 4)
+        self.assertEqual(sum(allowed), 50)
+
+
+@override_settings(THROTTLE_RATES={'heavy': '3/min', 'default': '100/min'}, THROTTLE_STORE_SLOTS=64)
+class ThrottleTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(THROTTLE_STORE_PATH=os.path.join(directory, 'buckets')))
+        throttling._store = None
+        self.addCleanup(setattr, throttling, '_store', None)
+
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.board_id = self.client.post('/api/boards/', {'title': 'Board', 'members': []}, format='json').json()['id']
+
+    def test_heavy_route_is_limited_per_user(self):
+        responses = [self.client.get(f'/api/boards/{self.board_id}/') for _ in range(4)]
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200, 429])
+        self.assertEqual([response['X-RateLimit-Remaining'] for response in responses[:3]], ['2', '1', '0'])
+        self.assertEqual(responses[0]['X-RateLimit-Limit'], '3')
+        self.assertIn('Retry-After', responses[3])
+
+        # Other route classes and other users have their own buckets.
+        self.assertEqual(self.client.get('/api/boards/').status_code, 200)
+        other = User.objects.create_user('bob', 'bob@example.com', 'pw')
+        client = APIClient()
+        client.force_authenticate(other)
+        self.assertEqual(client.get('/api/boards/').status_code, 200)
+
+    def test_batch_requests_count_against_the_heavy_bucket(self):
+        for _ in range(3):
+            self.client.get(f'/api/boards/{self.board_id}/')
+        response = self.client.post('/api/batch/', {'requests': [{'path': '/api/boards/'}]}, format='json')
+        self.assertEqual(response.status_code, 429)
+
+
+class StartupReportTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw')
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.post('/api/boards/', {'title': 'Board', 'members': []}, format='json')
+
+    def test_warm_up_does_not_connect_databases(self):
+        self.assertNotIn('databases', [name for name, _ in WARMUP_STEPS])
+
+    def test_child_requests_leave_no_trace(self):
+        cache.clear()
+        out = StringIO()
+        with mock.patch('core.throttling.get_store') as get_store:
+            call_command('startup_report', '--child', '--warm', stdout=out)
+
+        result = json.loads(out.getvalue())
+        self.assertEqual({request['status'] for request in result['requests']}, {200})
+        get_store.assert_not_called()
+        # A board detail request without a snapshot queues its build.
+        self.assertFalse(Job.objects.exists())
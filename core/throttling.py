@@ -0,0 +1,159 @@
+"""
+Token-bucket rate limiting shared by all worker processes on a host.
+
+Every client (the authenticated user, whose token maps to exactly one user,
+or the client address for anonymous requests) has one bucket per route class.
+A bucket holds up to N tokens for a rate of "N/period" and refills
+continuously; each request takes one token. Route classes and rates are set
+by settings.THROTTLE_ROUTES and settings.THROTTLE_RATES.
+
+Buckets live in a fixed-size table in a memory-mapped file
+(settings.THROTTLE_STORE_PATH, on /dev/shm by default) guarded by a file
+lock, so a decision costs no database or network round trip.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+
+# One bucket: key hash (0 = free), tokens left, last refill (unix time).
+SLOT = struct.Struct('=Qdd')
+# Slots searched for a key before the stalest one is taken over.
+PROBE_LENGTH = 8
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parse a rate like '60/min'.
+
+    Returns:
+        tuple: (bucket capacity, tokens refilled per second)
+    """
+    count, period = rate.split('/')
+    count = int(count)
+    return count, count / PERIODS[period]
+
+
+class SharedBucketStore:
+    """
+    Hash table of token buckets in a shared memory-mapped file.
+
+    Keys are stored as 64-bit hashes with linear probing over PROBE_LENGTH
+    slots; when all are taken by other keys the least recently used one is
+    reset, which at worst hands a client a fresh bucket.
+    """
+
+    def __init__(self, path, slots):
+        self.path = path
+        self.slots = slots
+        self.size = slots * SLOT.size
+        self.pid = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        """
+        (Re)open the file in this process; forked workers need their own
+        descriptor for the file lock to exclude each other.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(fd).st_size < self.size:
+            os.ftruncate(fd, self.size)
+        self.fd = fd
+        self.map = mmap.mmap(fd, self.size)
+        self.pid = os.getpid()
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """
+        Take one token from the bucket of `key`.
+
+        Returns:
+            tuple: (allowed, tokens left, seconds until the next token)
+        """
+        if now is None:
+            now = time.time()
+        key_hash = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+        with self._lock:
+            if self.pid != os.getpid():
+                self.open()
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                offset, tokens, updated = self.find_slot(key_hash, capacity, now)
+                tokens = min(capacity, tokens + (now - updated) * refill_rate)
+                allowed = tokens >= 1
+                if allowed:
+                    tokens -= 1
+                SLOT.pack_into(self.map, offset, key_hash, tokens, now)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+        wait = 0 if tokens >= 1 else (1 - tokens) / refill_rate
+        return allowed, int(tokens), wait
+
+    def find_slot(self, key_hash, capacity, now):
+        """
+        Return (offset, tokens, last refill) of the key's bucket, or of the
+        slot it takes over with a full bucket.
+        """
+        start = key_hash % self.slots
+        stalest = None
+        for step in range(PROBE_LENGTH):
+            offset = ((start + step) % self.slots) * SLOT.size
+            slot_hash, tokens, updated = SLOT.unpack_from(self.map, offset)
+            if slot_hash == key_hash:
+                return offset, tokens, updated
+            if slot_hash == 0:
+                return offset, capacity, now
+            if stalest is None or updated < stalest[1]:
+                stalest = (offset, updated)
+        return stalest[0], capacity, now
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SharedBucketStore(str(settings.THROTTLE_STORE_PATH), settings.THROTTLE_STORE_SLOTS)
+        return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle drawing from the shared token buckets. The bucket state is
+    left on the request for RateLimitHeadersMiddleware to report.
+    """
+
+    def allow_request(self, request, view):
+        match = getattr(request._request, 'resolver_match', None)
+        scope = settings.THROTTLE_ROUTES.get(match.view_name if match else None, 'default')
+        rate = settings.THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+
+        capacity, refill_rate = parse_rate(rate)
+        user = request.user
+        client = f'user:{user.pk}' if user and user.is_authenticated else f'ip:{self.get_ident(request)}'
+        allowed, remaining, self.wait_seconds = get_store().consume(f'{scope}:{client}', capacity, refill_rate)
+
+        request._request.rate_limit = {
+            'limit': capacity,
+            'remaining': remaining,
+            'reset': max(1, round((capacity - remaining) / refill_rate)),
+        }
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
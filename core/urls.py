@@ -17,8 +17,13 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import AdmissionPoolListView, SlowQueryListView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/slow-queries/', SlowQueryListView.as_view(), name='slow-queries'),
+    path('api/admission/', AdmissionPoolListView.as_view(), name='admission-pools'),
     path('api/', include('auth_app.api.urls')),
     path('api/', include('kanban_app.api.urls')),
+    path('api/', include('jobs_app.api.urls')),
 ]
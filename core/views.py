@@ -0,0 +1,52 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.admission import pool_stats
+from core.slow_queries import slow_query_log
+
+
+class SlowQueryListView(APIView):
+    """
+    GET    /slow-queries/   → List the worst statements recorded by this worker process.
+    DELETE /slow-queries/   → Reset the table.
+    """
+    permission_classes = [IsAdminUser]
+    ORDER_CHOICES = ['total_ms', 'max_ms', 'slow_count', 'max_repeats', 'repeated_requests']
+
+    def get(self, request):
+        """
+        Accepts optional query parameters:
+        - order: one of ORDER_CHOICES (default 'total_ms')
+        - limit: positive number of entries (default 20)
+        """
+        order_by = request.query_params.get('order', 'total_ms')
+        if order_by not in self.ORDER_CHOICES:
+            return Response(
+                {'order': f'Must be one of: {", ".join(self.ORDER_CHOICES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return Response({'limit': 'Must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(slow_query_log.top(limit=limit, order_by=order_by), status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        slow_query_log.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AdmissionPoolListView(APIView):
+    """
+    GET /admission/   → Utilization and counters of this worker process's admission pools.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(pool_stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,128 @@
+"""
+Worker warm-up.
+
+core.wsgi and core.asgi call warm_up() once the application is set up and
+before the server hands the worker any traffic, so the first requests do not
+pay for lazily initialized state: the URLconf and its view modules, DRF's
+configured renderer/parser/auth classes, the model field caches and the
+fields of every project serializer.
+
+Database connections are not opened here: servers that preload the
+application import it before forking, and a connection opened then would be
+shared by every worker. Django opens them on each worker's first query.
+"""
+import logging
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.urls import URLResolver, get_resolver
+from rest_framework.serializers import BaseSerializer, ListSerializer
+from rest_framework.settings import api_settings
+
+
+logger = logging.getLogger(__name__)
+
+# Settings holding lazily imported DRF classes.
+REST_FRAMEWORK_CLASSES = [
+    'DEFAULT_RENDERER_CLASSES',
+    'DEFAULT_PARSER_CLASSES',
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS',
+    'DEFAULT_METADATA_CLASS',
+    'DEFAULT_VERSIONING_CLASS',
+    'DEFAULT_PAGINATION_CLASS',
+    'DEFAULT_FILTER_BACKENDS',
+    'EXCEPTION_HANDLER',
+]
+
+
+def iter_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def load_urls():
+    """
+    Import every URLconf and view module and build the reverse lookup tables.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    return sum(1 for _ in iter_patterns(resolver.url_patterns))
+
+
+def load_rest_framework():
+    for name in REST_FRAMEWORK_CLASSES:
+        getattr(api_settings, name)
+    return len(REST_FRAMEWORK_CLASSES)
+
+
+def load_models():
+    """
+    Fill the field and relation caches of every model's _meta.
+    """
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+    return len(models)
+
+
+def iter_serializer_classes(cls=BaseSerializer):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from iter_serializer_classes(subclass)
+
+
+def build_serializers():
+    """
+    Instantiate every project serializer once and build its fields, which
+    also resolves the model and relation lookups behind them.
+    """
+    built = 0
+    for cls in set(iter_serializer_classes()):
+        if cls.__module__.startswith(('rest_framework.', 'django.')) or issubclass(cls, ListSerializer):
+            continue
+        try:
+            cls().fields
+        except Exception:
+            logger.warning('Could not warm up serializer %s.%s', cls.__module__, cls.__qualname__, exc_info=True)
+            continue
+        built += 1
+    return built
+
+
+WARMUP_STEPS = [
+    ('urls', load_urls),
+    ('rest_framework', load_rest_framework),
+    ('models', load_models),
+    ('serializers', build_serializers),
+]
+
+
+def warm_up(force=False):
+    """
+    Run the warm-up steps, unless settings.WARMUP_ON_STARTUP is off.
+
+    Args:
+        force (bool): Run even if WARMUP_ON_STARTUP is off.
+
+    Returns:
+        list: (step, items warmed, milliseconds) per step; empty if skipped.
+    """
+    if not (force or settings.WARMUP_ON_STARTUP):
+        return []
+
+    timings = []
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        count = step()
+        timings.append((name, count, (time.perf_counter() - start) * 1000))
+
+    logger.info('Warm-up finished in %.1f ms (%s)', sum(ms for _, _, ms in timings), ', '.join(
+        f'{name}: {count} in {ms:.1f} ms' for name, count, ms in timings
+    ))
+    return timings
@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class JobPagination(CursorPagination):
+    """
+    Cursor pagination over the user's jobs, newest first.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,36 @@
+from rest_framework import generics
+
+from jobs_app.models import Job
+from .pagination import JobPagination
+from .serializers import JobSerializer
+
+
+class JobListView(generics.ListAPIView):
+    """
+    GET /jobs/
+    → List the current user's background jobs, newest first, one cursor page at a time.
+    """
+    serializer_class = JobSerializer
+    pagination_class = JobPagination
+
+    def get_queryset(self):
+        """
+        Return the jobs created by the current user.
+        """
+        return Job.objects.filter(created_by=self.request.user)
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    """
+    GET /jobs/<pk>/
+    → Status and result of a single job (own jobs only, staff can see all).
+    """
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        """
+        Staff may look at every job, other users only at their own.
+        """
+        if self.request.user.is_staff:
+            return Job.objects.all()
+        return Job.objects.filter(created_by=self.request.user)
@@ -0,0 +1,26 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs_app.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Process background jobs from the database queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, help='Worker threads; defaults to settings.JOBS_CONCURRENCY.')
+        parser.add_argument('--poll-interval', type=float, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due instead of waiting for more.')
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+        )
+        signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+
+        self.stdout.write(f'Worker started with {worker.concurrency} threads.')
+        processed = worker.run()
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped after {processed} jobs.'))
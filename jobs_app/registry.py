@@ -0,0 +1,55 @@
+from jobs_app.models import Job
+
+
+registry = {}
+
+
+def job(name):
+    """
+    Register a function as a background job under `name`.
+
+    The function is called with the job's payload as keyword arguments; its
+    return value must be JSON serializable and is stored as the job result.
+
+    Usage:
+        @job('kanban.purge_board')
+        def purge_board_job(board_id):
+            ...
+    """
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, user=None, max_attempts=3, run_after=None):
+    """
+    Queue a registered job. Inside a transaction, the job only becomes
+    visible to workers once the transaction commits.
+
+    Args:
+        name (str): The registered job name.
+        payload (dict, optional): Keyword arguments for the job function.
+        user (User, optional): The user the job runs on behalf of.
+        max_attempts (int): How often the job is tried before it is marked failed.
+        run_after (datetime, optional): Earliest time the job may start.
+
+    Raises:
+        KeyError: If no job is registered under `name`.
+
+    Returns:
+        Job: The created job.
+    """
+    if name not in registry:
+        raise KeyError(f'No job registered as "{name}".')
+
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'created_by': user,
+        'max_attempts': max_attempts,
+    }
+    if run_after is not None:
+        fields['run_after'] = run_after
+
+    return Job.objects.create(**fields)
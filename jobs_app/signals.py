@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+
+# Sent by the worker after every job, successful or not (sender: the Job).
+job_finished = Signal()
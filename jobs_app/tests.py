@@ -0,0 +1,150 @@
+import datetime
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from jobs_app.models import Job
+from jobs_app.registry import enqueue, job, registry
+from jobs_app import worker
+from jobs_app.worker import Worker, claim_job, run_job
+
+
+class JobTestMixin:
+    def register(self, name, func):
+        job(name)(func)
+        self.addCleanup(registry.pop, name)
+
+
+class ClaimJobTests(JobTestMixin, TestCase):
+    def setUp(self):
+        self.register('tests.noop', lambda: None)
+
+    def test_claims_due_jobs_once_in_order(self):
+        later = enqueue('tests.noop', run_after=timezone.now() + datetime.timedelta(hours=1))
+        first = enqueue('tests.noop')
+        second = enqueue('tests.noop')
+
+        claimed = claim_job('worker-a')
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.locked_by, claimed.attempts), ('running', 'worker-a', 1))
+
+        self.assertEqual(claim_job('worker-b').pk, second.pk)
+        self.assertIsNone(claim_job('worker-c'))
+        self.assertEqual(Job.objects.get(pk=later.pk).status, 'queued')
+
+    @override_settings(JOBS_LOCK_TIMEOUT_SECONDS=60)
+    def test_reclaims_job_with_stale_lock(self):
+        queued = enqueue('tests.noop')
+        claim_job('worker-a')
+        self.assertIsNone(claim_job('worker-b'))
+
+        Job.objects.filter(pk=queued.pk).update(locked_at=timezone.now() - datetime.timedelta(seconds=61))
+        reclaimed = claim_job('worker-b')
+        self.assertEqual((reclaimed.pk, reclaimed.locked_by, reclaimed.attempts), (queued.pk, 'worker-b', 2))
+
+
+class RunJobTests(JobTestMixin, TestCase):
+    def test_stores_result(self):
+        self.register('tests.add', lambda a, b: {'sum': a + b})
+        enqueue('tests.add', {'a': 1, 'b': 2})
+
+        self.assertTrue(run_job(claim_job('worker-a')))
+        finished = Job.objects.get()
+        self.assertEqual((finished.status, finished.result), ('done', {'sum': 3}))
+        self.assertIsNotNone(finished.finished_at)
+
+    @override_settings(JOBS_RETRY_BACKOFF_SECONDS=10)
+    def test_retries_with_backoff_then_fails(self):
+        def fail():
+            raise RuntimeError('boom')
+        self.register('tests.fail', fail)
+        queued = enqueue('tests.fail', max_attempts=2)
+
+        self.assertFalse(run_job(claim_job('worker-a')))
+        retry = Job.objects.get(pk=queued.pk)
+        self.assertEqual((retry.status, retry.locked_by, retry.attempts), ('queued', '', 1))
+        self.assertIn('RuntimeError: boom', retry.last_error)
+        self.assertGreater(retry.run_after, timezone.now() + datetime.timedelta(seconds=5))
+
+        Job.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        self.assertFalse(run_job(claim_job('worker-a')))
+        self.assertEqual(Job.objects.get(pk=queued.pk).status, 'failed')
+
+    def test_lost_lock_does_not_overwrite_new_owner(self):
+        def taken_over():
+            # Another worker reclaims the job while this one is still running it.
+            Job.objects.update(locked_by='worker-b', attempts=2)
+            return {'by': 'worker-a'}
+        self.register('tests.taken_over', taken_over)
+        enqueue('tests.taken_over')
+
+        self.assertFalse(run_job(claim_job('worker-a')))
+        current = Job.objects.get()
+        self.assertEqual((current.status, current.locked_by, current.result), ('running', 'worker-b', None))
+
+
+class HeartbeatTests(JobTestMixin, TransactionTestCase):
+    @override_settings(JOBS_HEARTBEAT_INTERVAL_SECONDS=0.05)
+    def test_running_job_renews_its_lock(self):
+        lock_times = []
+
+        def slow():
+            for _ in range(3):
+                time.sleep(0.2)
+                lock_times.append(Job.objects.values_list('locked_at', flat=True).get())
+            return 'ok'
+        self.register('tests.slow', slow)
+        enqueue('tests.slow')
+
+        self.assertEqual(Worker(concurrency=1, burst=True).run(), 1)
+        self.assertEqual(len(set(lock_times)), 3)
+        self.assertEqual(Job.objects.get().status, 'done')
+
+
+class WorkerLoopTests(JobTestMixin, TransactionTestCase):
+    def test_database_error_is_logged_and_retried(self):
+        self.register('tests.noop', lambda: None)
+        enqueue('tests.noop')
+        calls = []
+
+        def flaky_claim(worker_id):
+            calls.append(worker_id)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return claim_job(worker_id)
+
+        with mock.patch.object(worker, 'claim_job', side_effect=flaky_claim):
+            with self.assertLogs('jobs_app.worker', 'ERROR') as logs:
+                processed = Worker(concurrency=1, poll_interval=0.01, burst=True).run()
+
+        self.assertEqual(processed, 1)
+        self.assertEqual(len(calls), 3)
+        self.assertIn('database is locked', logs.output[0])
+        self.assertEqual(Job.objects.get().status, 'done')
+
+
+class JobListTests(JobTestMixin, TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.register('tests.noop', lambda: None)
+        self.user = User.objects.create_user('jobs', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def test_lists_own_jobs_in_cursor_pages(self):
+        jobs = [enqueue('tests.noop', user=self.user) for _ in range(3)]
+        enqueue('tests.noop')
+
+        first = self.client.get('/api/jobs/', {'page_size': 2}).json()
+        self.assertEqual([item['id'] for item in first['results']], [jobs[2].pk, jobs[1].pk])
+
+        second = self.client.get(first['next']).json()
+        self.assertEqual([item['id'] for item in second['results']], [jobs[0].pk])
+        self.assertIsNone(second['next'])
@@ -0,0 +1,252 @@
+import datetime
+import logging
+import os
+import socket
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs_app.models import Job
+from jobs_app.registry import registry
+from jobs_app.signals import job_finished
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_worker_id(index=0):
+    """
+    Identify a worker thread as "<host>:<pid>:<index>".
+    """
+    return f'{socket.gethostname()}:{os.getpid()}:{index}'
+
+
+def get_backoff(attempts):
+    """
+    Return the delay before retrying a job that failed `attempts` times.
+    """
+    seconds = settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0)
+    return datetime.timedelta(seconds=min(seconds, settings.JOBS_RETRY_MAX_BACKOFF_SECONDS))
+
+
+def claim_job(worker_id):
+    """
+    Atomically take the next due job.
+
+    A candidate is picked with a plain SELECT and then claimed with a
+    conditional UPDATE that only succeeds while the job is still in the
+    state it was read in. If another worker was faster, the next candidate
+    is tried. This needs no row locks, so it works on SQLite as well.
+
+    Running jobs keep their lock fresh through a Heartbeat; those whose lock
+    is older than JOBS_LOCK_TIMEOUT_SECONDS are treated as abandoned by a
+    crashed worker and can be claimed again.
+
+    Returns:
+        Job | None: The claimed job, or None if nothing is due.
+    """
+    while True:
+        now = timezone.now()
+        stale = now - datetime.timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+        candidate = (
+            Job.objects.filter(
+                Q(status='queued', run_after__lte=now) | Q(status='running', locked_at__lt=stale)
+            )
+            .order_by('run_after', 'id')
+            .values('id', 'status', 'locked_at')
+            .first()
+        )
+        if candidate is None:
+            return None
+
+        claimed = Job.objects.filter(
+            pk=candidate['id'],
+            status=candidate['status'],
+            locked_at=candidate['locked_at'],
+        ).update(
+            status='running',
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=candidate['id'])
+
+
+class Heartbeat:
+    """
+    Renews the lock of a running job every JOBS_HEARTBEAT_INTERVAL_SECONDS
+    from a background thread, so a long but healthy job is not taken for
+    abandoned and claimed by a second worker.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.beat, name=f'job-heartbeat-{job.pk}', daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def beat(self):
+        try:
+            while not self.stopped.wait(settings.JOBS_HEARTBEAT_INTERVAL_SECONDS):
+                try:
+                    renewed = get_own_job(self.job).update(locked_at=timezone.now())
+                except DatabaseError:
+                    logger.warning('Could not renew the lock of job %s #%s', self.job.name, self.job.pk, exc_info=True)
+                    continue
+                if not renewed:
+                    logger.warning('Job %s #%s was taken over by another worker', self.job.name, self.job.pk)
+                    return
+        finally:
+            connection.close()
+
+
+def get_own_job(job):
+    """
+    Return a queryset matching the job only while this worker still holds its lock.
+    """
+    return Job.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by)
+
+
+def run_job(job):
+    """
+    Execute a claimed job and store its outcome.
+
+    On failure the job is requeued with exponential backoff until
+    max_attempts is reached, then marked failed. The outcome is only stored
+    while the job is still locked by this worker; if the lock was lost and
+    the job claimed again, the new owner's result is left alone.
+
+    Returns:
+        bool: True if the job succeeded and its result was stored.
+    """
+    func = registry.get(job.name)
+
+    try:
+        if func is None:
+            raise KeyError(f'No job registered as "{job.name}".')
+        with Heartbeat(job):
+            result = func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Job %s #%s failed (attempt %s of %s)', job.name, job.pk, job.attempts, job.max_attempts)
+
+        if job.attempts < job.max_attempts:
+            get_own_job(job).update(
+                status='queued',
+                run_after=timezone.now() + get_backoff(job.attempts),
+                locked_by='',
+                locked_at=None,
+                last_error=error,
+            )
+        else:
+            get_own_job(job).update(
+                status='failed',
+                finished_at=timezone.now(),
+                last_error=error,
+            )
+        return False
+
+    stored = get_own_job(job).update(
+        status='done',
+        result=result,
+        finished_at=timezone.now(),
+    )
+    if not stored:
+        logger.warning('Result of job %s #%s dropped: another worker took it over', job.name, job.pk)
+    return bool(stored)
+
+
+class Worker:
+    """
+    Runs jobs in `concurrency` threads until stopped. With `burst=True` each
+    thread exits as soon as no job is due.
+    """
+
+    def __init__(self, concurrency=None, poll_interval=None, burst=False):
+        self.concurrency = concurrency or settings.JOBS_CONCURRENCY
+        self.poll_interval = poll_interval or settings.JOBS_POLL_INTERVAL_SECONDS
+        self.burst = burst
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.lock = threading.Lock()
+
+    def stop(self):
+        self.stopping.set()
+
+    def loop(self, index):
+        """
+        Run jobs until stopped. Database errors (such as a locked SQLite file)
+        are logged and retried after the poll interval instead of ending the thread.
+        """
+        worker_id = get_worker_id(index)
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    if self.run_next(worker_id):
+                        continue
+                except DatabaseError:
+                    logger.exception('Worker %s hit a database error, retrying in %s s', worker_id, self.poll_interval)
+                    close_old_connections()
+                else:
+                    if self.burst:
+                        return
+                self.stopping.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+    def run_next(self, worker_id):
+        """
+        Claim and run one due job.
+
+        Returns:
+            bool: False if no job was due.
+        """
+        job = claim_job(worker_id)
+        if job is None:
+            return False
+
+        try:
+            run_job(job)
+        finally:
+            job_finished.send(sender=Job, job=job)
+        with self.lock:
+            self.processed += 1
+        return True
+
+    def run(self):
+        """
+        Start the worker threads and block until they have all finished.
+
+        Returns:
+            int: The number of jobs processed.
+        """
+        threads = [
+            threading.Thread(target=self.loop, args=(index,), name=f'job-worker-{index}', daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+        return self.processed
@@ -0,0 +1,137 @@
+"""
+Keeps BoardAccess in step with Board.owner and the membership table.
+
+Regular ORM writes are followed through signals. Code that writes the
+membership table in bulk (bypassing m2m_changed) calls grant_members() and
+revoke_members() itself; `manage.py reconcile_board_access` repairs any drift.
+"""
+import threading
+from contextlib import contextmanager
+
+from kanban_app.models import Board, BoardAccess
+
+
+Membership = Board.members.through
+
+_local = threading.local()
+
+
+def grant_members(board_id, user_ids):
+    """
+    Give users member access to a board. Existing rows, including the owner's, are kept.
+    """
+    BoardAccess.objects.bulk_create(
+        [BoardAccess(user_id=user_id, board_id=board_id, role='member') for user_id in user_ids],
+        ignore_conflicts=True
+    )
+
+
+def revoke_members(board_id, user_ids=None):
+    """
+    Drop member access to a board, for the given users or for all members.
+    The owner's row is never touched.
+    """
+    rows = BoardAccess.objects.filter(board_id=board_id, role='member')
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+    rows.delete()
+
+
+def sync_board_access(board_ids):
+    """
+    Recompute the access rows of the given boards from their owner and members
+    and write only the difference.
+
+    Returns:
+        tuple: (rows created, rows deleted)
+    """
+    expected = {
+        (owner_id, board_id): 'owner'
+        for board_id, owner_id in Board.all_objects.filter(pk__in=board_ids).values_list('id', 'owner_id')
+    }
+    for board_id, user_id in Membership.objects.filter(board_id__in=board_ids).values_list('board_id', 'user_id'):
+        expected.setdefault((user_id, board_id), 'member')
+
+    current = {
+        (user_id, board_id): (pk, role)
+        for pk, user_id, board_id, role in BoardAccess.objects.filter(board_id__in=board_ids)
+        .values_list('pk', 'user_id', 'board_id', 'role')
+    }
+
+    stale = [pk for key, (pk, role) in current.items() if expected.get(key) != role]
+    missing = [
+        BoardAccess(user_id=user_id, board_id=board_id, role=role)
+        for (user_id, board_id), role in expected.items()
+        if current.get((user_id, board_id), (None, None))[1] != role
+    ]
+
+    BoardAccess.objects.filter(pk__in=stale).delete()
+    BoardAccess.objects.bulk_create(missing)
+    return len(missing), len(stale)
+
+
+def board_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    post_save hook for Board: grant the owner's row, and resync if the owner changed.
+    """
+    if raw:
+        return
+    if created:
+        BoardAccess.objects.update_or_create(user_id=instance.owner_id, board_id=instance.pk, defaults={'role': 'owner'})
+    elif BoardAccess.objects.filter(board_id=instance.pk, role='owner').exclude(user_id=instance.owner_id).exists():
+        sync_board_access([instance.pk])
+
+
+def members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    m2m_changed hook for Board.members, from either side of the relation.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        if action == 'post_add':
+            grant_members(instance.pk, pk_set)
+        elif action == 'post_remove':
+            revoke_members(instance.pk, pk_set)
+        else:
+            revoke_members(instance.pk)
+        return
+
+    # user.board_members.add(...): instance is the user, pk_set holds board ids.
+    if action == 'post_add':
+        for board_id in pk_set:
+            grant_members(board_id, [instance.pk])
+    elif action == 'post_remove':
+        BoardAccess.objects.filter(user_id=instance.pk, board_id__in=pk_set, role='member').delete()
+    else:
+        BoardAccess.objects.filter(user_id=instance.pk, role='member').delete()
+
+
+@contextmanager
+def access_cache():
+    """
+    Remember has_board_access() answers inside the block, so the sub-requests
+    of one batch request look each (user, board) pair up only once.
+    """
+    previous = getattr(_local, 'cache', None)
+    _local.cache = {}
+    try:
+        yield
+    finally:
+        _local.cache = previous
+
+
+def has_board_access(user, board_id):
+    """
+    Return True if the user owns or belongs to the board (one indexed lookup).
+    """
+    cache = getattr(_local, 'cache', None)
+    key = (user.pk, int(board_id))
+    if cache is not None and key in cache:
+        return cache[key]
+
+    allowed = BoardAccess.objects.filter(user_id=user.pk, board_id=board_id).exists()
+    if cache is not None:
+        cache[key] = allowed
+    return allowed
@@ -0,0 +1,101 @@
+import datetime
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from kanban_app.models import Activity
+from kanban_app.purge import delete_in_batches
+from kanban_app.sharding import each_shard, get_db, shard_for_board
+
+
+_local = threading.local()
+
+
+def get_buffer():
+    """
+    Return the pending events of the current thread (request or worker).
+    """
+    if not hasattr(_local, 'events'):
+        _local.events = []
+    return _local.events
+
+
+def record(board_id, verb, actor=None, task_id=None, **data):
+    """
+    Queue an activity entry without touching the database.
+
+    The entry only enters the buffer once the surrounding transaction
+    commits, so rolled back changes leave no trace. The buffer is written
+    with one bulk insert at the end of the request or job, or as soon as it
+    holds settings.ACTIVITY_LOG_BATCH_SIZE entries.
+
+    Args:
+        board_id (int): The board the event belongs to.
+        verb (str): One of Activity.VERB_CHOICES.
+        actor (User, optional): The user who caused the event.
+        task_id (int, optional): The task the event concerns.
+        **data: Event details stored as JSON.
+    """
+    event = Activity(
+        board_id=board_id,
+        verb=verb,
+        actor_id=getattr(actor, 'pk', None),
+        task_id=task_id,
+        data=data,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: buffer_event(event), using=get_db())
+
+
+def buffer_event(event):
+    events = get_buffer()
+    events.append(event)
+    if len(events) >= settings.ACTIVITY_LOG_BATCH_SIZE:
+        flush()
+
+
+def flush(**kwargs):
+    """
+    Write all buffered entries of the current thread with bulk_create, one
+    insert per shard. Connected to request_finished and job_finished.
+
+    Returns:
+        int: The number of written entries.
+    """
+    events = get_buffer()
+    if not events:
+        return 0
+
+    _local.events = []
+    shards = {board_id: shard_for_board(board_id) for board_id in {event.board_id for event in events}}
+    by_shard = {}
+    for event in events:
+        by_shard.setdefault(shards[event.board_id], []).append(event)
+    for alias, shard_events in by_shard.items():
+        Activity.objects.using(alias).bulk_create(shard_events, batch_size=settings.ACTIVITY_LOG_BATCH_SIZE)
+    return len(events)
+
+
+def prune_activity(days=None, batch_size=None):
+    """
+    Delete activity entries older than the retention period in batches.
+
+    Args:
+        days (int, optional): Retention in days; defaults to settings.ACTIVITY_LOG_RETENTION_DAYS.
+        batch_size (int, optional): Rows per transaction; defaults to settings.KANBAN_PURGE_BATCH_SIZE.
+
+    Returns:
+        int: The number of deleted entries.
+    """
+    if days is None:
+        days = settings.ACTIVITY_LOG_RETENTION_DAYS
+    if batch_size is None:
+        batch_size = settings.KANBAN_PURGE_BATCH_SIZE
+
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    deleted = 0
+    for alias in each_shard():
+        deleted += delete_in_batches(Activity.objects.filter(created_at__lt=cutoff), batch_size)
+    return deleted
@@ -1,3 +1,79 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
-# Register your models here.
+from kanban_app.models import Board, Comment, Task
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for large tables that never runs a full COUNT(*).
+
+    Unfiltered PostgreSQL tables use the planner's row estimate; everything
+    else is counted up to settings.ADMIN_COUNT_LIMIT rows, so the changelist
+    shows at most that many pages.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] > 0:
+                return int(row[0])
+        return queryset.order_by()[:settings.ADMIN_COUNT_LIMIT].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist defaults for tables with millions of rows: estimated counts,
+    no second unfiltered count, and newest rows first along the primary key.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ['-id']
+
+
+@admin.register(Board)
+class BoardAdmin(LargeTableAdmin):
+    list_display = ['id', 'title', 'owner', 'deleted_at']
+    list_select_related = ['owner']
+    list_filter = [('deleted_at', admin.EmptyFieldListFilter)]
+    raw_id_fields = ['owner', 'members']
+
+    def get_queryset(self, request):
+        """
+        Include boards marked as deleted that are still waiting to be purged.
+        """
+        return Board.all_objects.all()
+
+
+@admin.register(Task)
+class TaskAdmin(LargeTableAdmin):
+    list_display = ['id', 'title', 'board', 'status', 'priority', 'assigned_to', 'due_date', 'updated_at']
+    list_select_related = ['board', 'assigned_to']
+    # Backed by the (status, id) and (priority, id) indexes.
+    list_filter = ['status', 'priority']
+    raw_id_fields = ['board', 'assigned_to', 'reviewer', 'author']
+
+
+@admin.register(Comment)
+class CommentAdmin(LargeTableAdmin):
+    list_display = ['id', 'task', 'author', 'preview', 'created_at']
+    list_select_related = ['task', 'author']
+    raw_id_fields = ['task', 'author']
+    readonly_fields = ['preview', 'content_length']
+
+    def get_queryset(self, request):
+        """
+        The list only shows previews, so the (possibly compressed) bodies are not loaded.
+        """
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('changelist'):
+            queryset = queryset.defer('content')
+        return queryset
@@ -0,0 +1,111 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from .serializers import TaskQuerySerializer
+
+
+# Model columns each serialized task field reads. Users are resolved from
+# kanban_app.user_directory, so only their foreign key column is needed.
+TASK_FIELD_COLUMNS = {
+    'id': ['id'],
+    'board': ['board'],
+    'title': ['title'],
+    'description': ['description'],
+    'status': ['status'],
+    'priority': ['priority'],
+    'assignee': ['assigned_to'],
+    'reviewer': ['reviewer'],
+    'due_date': ['due_date'],
+    'comments_count': ['comments_count'],
+    'position': ['position'],
+}
+
+class TaskListQueryMixin:
+    """
+    Adds filtering, ordering and sparse fieldsets to task list views.
+
+    Supported query parameters:
+    - board, status, priority          → exact match
+    - due_before, due_after            → inclusive due_date range
+    - ordering                         → one of TaskQuerySerializer.ORDERING_CHOICES, optionally prefixed with "-"
+    - fields                           → comma separated subset of the TaskSerializer output
+    """
+
+    def get_task_query(self):
+        """
+        Validate the query parameters once per request and cache the result.
+
+        Raises:
+            ValidationError: If a parameter has an invalid value (400).
+
+        Returns:
+            dict: The validated query parameters.
+        """
+        if not hasattr(self, '_task_query'):
+            serializer = TaskQuerySerializer(data=self.request.query_params)
+            serializer.is_valid(raise_exception=True)
+            self._task_query = serializer.validated_data
+        return self._task_query
+
+    def get_requested_fields(self):
+        """
+        Return the list of fields requested via `?fields=`, or None for all fields.
+        Sparse fieldsets only apply to reads.
+        """
+        if self.request.method not in SAFE_METHODS:
+            return None
+        return self.get_task_query().get('fields')
+
+    def filter_tasks(self, queryset):
+        """
+        Apply filters, ordering and column selection to a task queryset.
+
+        Args:
+            queryset (QuerySet): The base task queryset of the view.
+
+        Returns:
+            QuerySet: The narrowed, ordered queryset.
+        """
+        params = self.get_task_query()
+
+        if 'board' in params:
+            queryset = queryset.filter(board_id=params['board'])
+        if 'status' in params:
+            queryset = queryset.filter(status=params['status'])
+        if 'priority' in params:
+            queryset = queryset.filter(priority=params['priority'])
+        if 'due_before' in params:
+            queryset = queryset.filter(due_date__lte=params['due_before'])
+        if 'due_after' in params:
+            queryset = queryset.filter(due_date__gte=params['due_after'])
+
+        ordering = params.get('ordering', 'id')
+        if ordering.lstrip('-') != 'id':
+            queryset = queryset.order_by(ordering, '-id' if ordering.startswith('-') else 'id')
+        else:
+            queryset = queryset.order_by(ordering)
+
+        return self.select_task_columns(queryset)
+
+    def select_task_columns(self, queryset):
+        """
+        Load only the columns needed for the requested fields.
+        """
+        fields = self.get_requested_fields()
+
+        if fields is None:
+            return queryset
+
+        columns = {'id'}
+        for name in fields:
+            columns.update(TASK_FIELD_COLUMNS[name])
+
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Pass the requested sparse fieldset on to the serializer.
+        """
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,84 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from kanban_app.idempotency import claim_key, release_key, store_response
+from kanban_app.sharding import get_db
+
+
+class LeaseLost(Exception):
+    """
+    A retry took the idempotency key over while the request was running.
+    """
+
+
+class IdempotentWriteMixin:
+    """
+    Makes create and update replayable with an `Idempotency-Key` header
+    (see kanban_app.idempotency).
+
+    Authentication and the view-level permission checks still run on a
+    replay; validation, object lookups and every write are skipped, and the
+    stored response is returned with `Idempotent-Replayed: true`.
+
+    The handler and storing its response run in one transaction on the
+    default database (which holds the keys) and the current shard, so a
+    request whose key was taken over by a retry leaves no writes behind.
+    """
+    idempotency_header = 'Idempotency-Key'
+
+    def create(self, request, *args, **kwargs):
+        return self.run_idempotent(super().create, request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        return self.run_idempotent(super().update, request, *args, **kwargs)
+
+    def run_idempotent(self, handler, request, *args, **kwargs):
+        """
+        Run the handler once per key, or replay the response stored for the key.
+
+        Returns:
+            Response: The handler's or the stored response; 409 while the first
+            request with the key is still running, 422 if the key was used for
+            another endpoint, 400 for an invalid key.
+        """
+        key = request.headers.get(self.idempotency_header)
+        if key is None:
+            return handler(request, *args, **kwargs)
+        if not key or len(key) > 255:
+            return Response({'error': 'Ungültiger Idempotency-Key.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        record, existing = claim_key(request.user, key, request.method, request.path)
+        if record is None:
+            return self.replay(request, existing)
+
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS), transaction.atomic(using=get_db()):
+                response = handler(request, *args, **kwargs)
+                if not store_response(record, response):
+                    raise LeaseLost
+        except LeaseLost:
+            return self.in_progress()
+        except Exception:
+            release_key(record)
+            raise
+        return response
+
+    def in_progress(self):
+        return Response(
+            {'error': 'Eine Anfrage mit diesem Idempotency-Key wird noch verarbeitet.'},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    def replay(self, request, existing):
+        if existing is None or existing.status_code is None:
+            return self.in_progress()
+        if (existing.method, existing.path) != (request.method, request.path):
+            return Response(
+                {'error': 'Dieser Idempotency-Key wurde bereits für eine andere Anfrage verwendet.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        response = Response(existing.response, status=existing.status_code)
+        response['Idempotent-Replayed'] = 'true'
+        return response
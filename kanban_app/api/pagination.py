@@ -0,0 +1,142 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CommentCursorPagination(BasePagination):
+    """
+    Keyset pagination over the comment timeline, newest first.
+
+    The cursor encodes the (created_at, id) pair of the last comment on the
+    current page. The next page is fetched with a single range condition on
+    the (task, created_at, id) index, so every page costs the same no matter
+    how deep into the thread the client has scrolled.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 200
+    invalid_cursor_message = 'Ungültiger Cursor.'
+
+    def get_page_size(self, request):
+        """
+        Return the requested page size, clamped to max_page_size.
+        Falls back to the default for missing or invalid values.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, comment):
+        """
+        Build the opaque cursor string pointing behind the given comment.
+        """
+        raw = f'{comment.created_at.isoformat()}|{comment.pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor query parameter.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+
+        Returns:
+            tuple | None: (created_at, id) of the last seen comment, or None on the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            created_at, pk = raw.rsplit('|', 1)
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return created_at, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of comments following the cursor.
+
+        The queryset must already be restricted to a single task; ordering is
+        applied here so it always matches the index.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        queryset = queryset.order_by('-created_at', '-id')
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        # Fetch one extra row to find out whether another page exists.
+        comments = list(queryset[:page_size + 1])
+        self.has_next = len(comments) > page_size
+        self.page = comments[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+
+class ArchivedTaskPagination(CursorPagination):
+    """
+    Cursor pagination over a board's archived tasks, most recently created first.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class ActivityPagination(CursorPagination):
+    """
+    Cursor pagination over a board's activity feed, newest first.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -1,9 +1,11 @@
 from rest_framework.permissions import BasePermission, IsAuthenticated, SAFE_METHODS
 
+from kanban_app.access import has_board_access
+
 
 class IsOwnerOrMember(BasePermission):
      def has_object_permission(self, request, view, obj):
-        return request.user == obj.owner or request.user in obj.members.all()
+        return has_board_access(request.user, obj.pk)
      
 
 class IsOwnerAndDeleteOnly(BasePermission):
@@ -25,7 +27,7 @@ class TaskDetailPermission(BasePermission):
         user = request.user
 
         if request.method in SAFE_METHODS:
-            return user == obj.board.owner or user in obj.board.members.all()
+            return has_board_access(user, obj.board_id)
 
         elif request.method == 'PATCH':
             return user == obj.assigned_to or user == obj.reviewer
@@ -45,7 +47,7 @@ class CommentPermission(BasePermission):
         user = request.user
 
         if request.method in SAFE_METHODS:
-            return user == obj.task.board.owner or user in obj.task.board.members.all()
+            return has_board_access(user, obj.task.board_id)
 
         elif request.method == 'DELETE':
             return user == obj.author
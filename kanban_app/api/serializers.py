@@ -1,10 +1,15 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.core.validators import EmailValidator
+from django.db.models import Q
+from django.db.models.manager import BaseManager
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import NotFound, PermissionDenied
 
 
-from kanban_app.models import Board, Comment, User, Task
+from kanban_app import activity, user_directory
+from kanban_app.columns import get_end_of_column
+from kanban_app.models import Activity, ArchivedTask, Board, Comment, User, Task
 
 
 class BoardSerializer(serializers.ModelSerializer):
@@ -47,10 +52,10 @@ class BoardSerializer(serializers.ModelSerializer):
         Returns:
             Board: The newly created Board instance with members set.
         """
-        members = validated_data.pop('members', [])
+        members = set(validated_data.pop('members', []))
+        members.add(self.context['request'].user)
         board = Board.objects.create(**validated_data)
-        board.members.set(members)
-        board.members.add(self.context['request'].user)
+        board.members.add(*members)
         return board
 
 
@@ -69,7 +74,51 @@ class MiniUserSerializer(serializers.ModelSerializer):
         return obj.username
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class DirectoryUserField(serializers.Field):
+    """
+    Read-only nested user with the output of MiniUserSerializer, resolved from
+    kanban_app.user_directory by the id in `source` (e.g. 'assigned_to_id'),
+    so the user row is never joined or loaded with the object.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return user_directory.get_user(value)
+
+
+class DirectoryListSerializer(serializers.ListSerializer):
+    """
+    Looks up every user the items refer to through DirectoryUserField in one
+    call before serializing them, so cache misses cost one query per list.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        sources = [field.source for field in self.child.fields.values() if isinstance(field, DirectoryUserField)]
+        if sources:
+            user_directory.get_users({getattr(item, source) for item in items for source in sources} - {None})
+        return super().to_representation(items)
+
+
+class SparseFieldsMixin:
+    """
+    Lets callers restrict the serialized output to a subset of fields
+    by passing `fields=[...]` when instantiating the serializer.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     assignee_id = serializers.PrimaryKeyRelatedField(
         source='assigned_to',
         queryset=User.objects.all(),
@@ -84,13 +133,14 @@ class TaskSerializer(serializers.ModelSerializer):
         required=False
     )
 
-    assignee = MiniUserSerializer(source='assigned_to', read_only=True)
-    reviewer = MiniUserSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    assignee = DirectoryUserField(source='assigned_to_id')
+    reviewer = DirectoryUserField(source='reviewer_id')
+    comments_count = serializers.IntegerField(read_only=True)
     
 
     class Meta:
         model = Task
+        list_serializer_class = DirectoryListSerializer
         fields = [
             'id',
             'board',
@@ -104,21 +154,9 @@ class TaskSerializer(serializers.ModelSerializer):
             'reviewer',
             'due_date',
             'comments_count',
+            'position',
         ]
-
-    
-    def get_comments_count(self, obj):
-        """
-        Return the count of comments related to the given object.
-
-        Args:
-            obj (Model instance): The instance (e.g., a Task) for which comments are counted.
-
-        Returns:
-            int: Number of comments if the 'comments' related manager exists, otherwise 0.
-        """
-        return obj.comments.count() if hasattr(obj, 'comments') else 0
-    
+        read_only_fields = ['position']
 
     
     def validate(self, data):
@@ -155,6 +193,7 @@ class TaskSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """
         Create and return a new Task instance, setting the author to the current user.
+        Task.save() places it at the bottom of its status column.
 
         Args:
             validated_data (dict): The validated data from the serializer input.
@@ -167,6 +206,58 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class TaskQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters accepted by the task list endpoints.
+    """
+    ORDERING_CHOICES = ['id', 'due_date', 'status', 'priority']
+    FIELD_CHOICES = [
+        'id',
+        'board',
+        'title',
+        'description',
+        'status',
+        'priority',
+        'assignee',
+        'reviewer',
+        'due_date',
+        'comments_count',
+        'position',
+    ]
+
+    board = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    due_before = serializers.DateField(required=False)
+    due_after = serializers.DateField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=ORDERING_CHOICES + [f'-{name}' for name in ORDERING_CHOICES],
+        required=False
+    )
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value):
+        """
+        Split the comma separated `fields` parameter and reject unknown names.
+
+        Args:
+            value (str): The raw parameter, e.g. "id,title,assignee".
+
+        Raises:
+            serializers.ValidationError: If a requested field does not exist.
+
+        Returns:
+            list: The requested field names in the given order.
+        """
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in self.FIELD_CHOICES]
+
+        if unknown:
+            raise serializers.ValidationError(f"Unbekannte Felder: {', '.join(unknown)}")
+
+        return fields
+
+
 class BoardDetailReadSerializer(serializers.ModelSerializer):
     owner_id = serializers.IntegerField(read_only=True)
     members = MiniUserSerializer(many=True, read_only=True)
@@ -184,7 +275,7 @@ class BoardDetailReadSerializer(serializers.ModelSerializer):
 
     
 class BoardDetailWriteSerializer(serializers.ModelSerializer):
-    owner_data = MiniUserSerializer(source='owner',read_only=True)
+    owner_data = DirectoryUserField(source='owner_id')
     members_data = MiniUserSerializer(source='members',many=True, read_only=True)
     members = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
@@ -227,8 +318,16 @@ class BoardDetailWriteSerializer(serializers.ModelSerializer):
         if members is not None:
             if instance.owner not in members:
                 members.append(instance.owner)
+            old_ids = set(instance.members.values_list('id', flat=True))
+            new_ids = {member.pk for member in members}
             instance.members.set(members)
 
+            actor = self.context['request'].user
+            for user_id in sorted(new_ids - old_ids):
+                activity.record(instance.pk, 'member_added', actor=actor, user_id=user_id)
+            for user_id in sorted(old_ids - new_ids):
+                activity.record(instance.pk, 'member_removed', actor=actor, user_id=user_id)
+
         return instance
 
 class TaskDetailSerializer(serializers.ModelSerializer):
@@ -246,8 +345,8 @@ class TaskDetailSerializer(serializers.ModelSerializer):
         required=False
     )
 
-    assignee = MiniUserSerializer(source='assigned_to', read_only=True)
-    reviewer = MiniUserSerializer(read_only=True)
+    assignee = DirectoryUserField(source='assigned_to_id')
+    reviewer = DirectoryUserField(source='reviewer_id')
     class Meta:
         model = Task
         fields = [
@@ -261,7 +360,108 @@ class TaskDetailSerializer(serializers.ModelSerializer):
             'reviewer_id',
             'reviewer',
             'due_date',
+            'position',
         ]
+        read_only_fields = ['position']
+
+    def update(self, instance, validated_data):
+        """
+        Update the task; if its status changes, move it to the bottom of the new column.
+
+        Args:
+            instance (Task): The task being updated.
+            validated_data (dict): The validated input data.
+
+        Returns:
+            Task: The updated task.
+        """
+        old = {
+            'status': instance.status,
+            'assigned_to': instance.assigned_to_id,
+            'reviewer': instance.reviewer_id,
+        }
+        status = validated_data.get('status', instance.status)
+        if status != instance.status:
+            validated_data['position'] = get_end_of_column(instance.board_id, status)
+        instance = super().update(instance, validated_data)
+        self.record_activity(instance, old)
+        return instance
+
+    def record_activity(self, instance, old):
+        """
+        Log status changes and reassignments made by this update.
+        """
+        actor = self.context['request'].user
+        if instance.status != old['status']:
+            activity.record(
+                instance.board_id, 'task_status_changed', actor=actor, task_id=instance.pk,
+                old=old['status'], new=instance.status
+            )
+        for field in ('assigned_to', 'reviewer'):
+            new = getattr(instance, f'{field}_id')
+            if new != old[field]:
+                activity.record(
+                    instance.board_id, 'task_reassigned', actor=actor, task_id=instance.pk,
+                    field=field, old=old[field], new=new
+                )
+
+
+class BoardCloneSerializer(serializers.Serializer):
+    """
+    Validates the options of a board clone (see kanban_app.cloning).
+    """
+    title = serializers.CharField(max_length=255, required=False)
+    members = serializers.BooleanField(default=False)
+    tasks = serializers.BooleanField(default=True)
+    comments = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        """
+        Raises:
+            serializers.ValidationError: If comments are requested without tasks.
+        """
+        if data['comments'] and not data['tasks']:
+            raise serializers.ValidationError("Kommentare können nur zusammen mit den Tasks kopiert werden.")
+        return data
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """
+    Validates a move of the task in context['task'] to a column position.
+    Neighbours must belong to the same board.
+    """
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    prev_id = serializers.IntegerField(required=False, allow_null=True)
+    next_id = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, data):
+        """
+        Default the status to the task's current column and make sure both
+        neighbours, if given, are tasks in that column.
+
+        Raises:
+            serializers.ValidationError: If a neighbour is not in the target column.
+
+        Returns:
+            dict: The validated data including 'status'.
+        """
+        task = self.context['task']
+        data.setdefault('status', task.status)
+        neighbour_ids = [data[name] for name in ('prev_id', 'next_id') if data.get(name)]
+
+        if task.pk in neighbour_ids:
+            raise serializers.ValidationError("Ein Task kann nicht sein eigener Nachbar sein.")
+
+        found = Task.objects.filter(
+            pk__in=neighbour_ids,
+            board_id=task.board_id,
+            status=data['status']
+        ).count()
+        if found != len(set(neighbour_ids)):
+            raise serializers.ValidationError("Nachbar-Tasks müssen in derselben Spalte liegen.")
+
+        return data
+
 
 class EmailCheckSerializer(serializers.Serializer):
 
@@ -297,7 +497,7 @@ class EmailCheckSerializer(serializers.Serializer):
     
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
-    created_at = serializers.DateField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
         model = Comment
@@ -345,4 +545,126 @@ class CommentSerializer(serializers.ModelSerializer):
         validated_data['author'] = self.context['request'].user
         validated_data['task'] = self.task
         return super().create(validated_data)
-            
+
+
+class CommentPreviewSerializer(serializers.ModelSerializer):
+    """
+    Comment list entry without the body: the stored preview and the full
+    length. The complete content is fetched from the comment detail endpoint.
+    """
+    author = serializers.StringRelatedField(read_only=True)
+    truncated = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = ['id', 'created_at', 'author', 'preview', 'content_length', 'truncated']
+        read_only_fields = fields
+
+    def get_truncated(self, obj):
+        return obj.content_length > len(obj.preview)
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    assignee = DirectoryUserField(source='assigned_to_id')
+    reviewer = DirectoryUserField(source='reviewer_id')
+
+    class Meta:
+        model = ArchivedTask
+        list_serializer_class = DirectoryListSerializer
+        fields = [
+            'id',
+            'board',
+            'title',
+            'description',
+            'status',
+            'priority',
+            'assignee',
+            'reviewer',
+            'due_date',
+            'comments_count',
+            'archived_at',
+        ]
+        read_only_fields = fields
+
+
+class BoardMembersSerializer(serializers.Serializer):
+    """
+    Validates a batch of users to add to or remove from a board,
+    given by id and/or email.
+    """
+    MAX_BATCH_SIZE = 1000
+
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        max_length=MAX_BATCH_SIZE
+    )
+    emails = serializers.ListField(
+        child=serializers.EmailField(),
+        required=False,
+        max_length=MAX_BATCH_SIZE
+    )
+
+    def validate(self, data):
+        """
+        Resolve all ids and emails to user ids with a single query.
+
+        Raises:
+            serializers.ValidationError: If the batch is empty or contains unknown users.
+
+        Returns:
+            dict: The data with an added 'users' set of user ids.
+        """
+        user_ids = set(data.get('user_ids', []))
+        emails = set(data.get('emails', []))
+
+        if not user_ids and not emails:
+            raise serializers.ValidationError("Bitte user_ids oder emails angeben.")
+
+        found = list(User.objects.filter(Q(id__in=user_ids) | Q(email__in=emails)).values_list('id', 'email'))
+        found_ids = {user_id for user_id, email in found}
+        found_emails = {email for user_id, email in found}
+
+        errors = {}
+        if user_ids - found_ids:
+            errors['user_ids'] = f"Unbekannte Benutzer: {sorted(user_ids - found_ids)}"
+        if emails - found_emails:
+            errors['emails'] = f"Unbekannte E-Mails: {sorted(emails - found_emails)}"
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        data['users'] = {user_id for user_id, email in found if user_id in user_ids or email in emails}
+        return data
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    actor = DirectoryUserField(source='actor_id')
+
+    class Meta:
+        model = Activity
+        list_serializer_class = DirectoryListSerializer
+        fields = [
+            'id',
+            'verb',
+            'actor',
+            'task_id',
+            'data',
+            'created_at',
+        ]
+        read_only_fields = fields
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET'], default='GET')
+    path = serializers.CharField(max_length=2000)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    Validates the body of a batch request: a list of GET sub-requests.
+    """
+    requests = serializers.ListField(
+        child=BatchItemSerializer(),
+        allow_empty=False,
+        max_length=settings.BATCH_MAX_REQUESTS
+    )
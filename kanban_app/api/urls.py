@@ -1,15 +1,23 @@
 from django.urls import path
-from .views import BoardViewSet, BoardDetailView, CheckMailView, TaskViewSet, AssignedDetailView, ReviewerDetailView, TaskDetailView, CommentViewSet, CommentDetailView
+from .views import BoardViewSet, BoardDetailView, BoardCloneView, BoardMembersView, CheckMailView, DashboardView, TaskViewSet, TaskMoveView, AssignedDetailView, ReviewerDetailView, TaskDetailView, CommentViewSet, CommentDetailView, ArchivedTaskListView, ArchivedTaskRestoreView, ActivityListView, BatchView
 
 
 urlpatterns = [
     path('boards/', BoardViewSet.as_view(), name='boards'),
     path('boards/<int:pk>/', BoardDetailView.as_view(), name='board-detail'),
+    path('boards/<int:pk>/clone/', BoardCloneView.as_view(), name='board-clone'),
+    path('boards/<int:pk>/members/', BoardMembersView.as_view(), name='board-members'),
     path('email-check/', CheckMailView.as_view(), name='email-check'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
     path('tasks/', TaskViewSet.as_view(), name='tasks'),
     path('tasks/<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
+    path('tasks/<int:pk>/move/', TaskMoveView.as_view(), name='task-move'),
     path('tasks/assigned-to-me/', AssignedDetailView.as_view(), name='assigned-to-me'),
     path('tasks/reviewing/', ReviewerDetailView.as_view(), name='rewiver-detail'),
     path('tasks/<int:task_id>/comments/', CommentViewSet.as_view(), name='comments'),
     path('tasks/<int:task_id>/comments/<int:comment_id>/', CommentDetailView.as_view(), name='comment-detail'),
+    path('boards/<int:pk>/archived-tasks/', ArchivedTaskListView.as_view(), name='archived-tasks'),
+    path('batch/', BatchView.as_view(), name='batch'),
+    path('boards/<int:pk>/activity/', ActivityListView.as_view(), name='board-activity'),
+    path('archived-tasks/<int:pk>/restore/', ArchivedTaskRestoreView.as_view(), name='archived-task-restore'),
 ]
\ No newline at end of file
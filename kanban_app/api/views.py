@@ -1,16 +1,42 @@
+import datetime
+import logging
+from collections import Counter
+
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, QueryDict
+from django.db import transaction
+from django.db.models import Count, F, Q
 from django.shortcuts import get_object_or_404
+from django.urls import Resolver404, resolve
+from django.utils import timezone
 
-from kanban_app.models import Board, Comment, User, Task
-from .serializers import BoardSerializer, BoardDetailReadSerializer, BoardDetailWriteSerializer, MiniUserSerializer, TaskSerializer, EmailCheckSerializer, TaskDetailSerializer, CommentSerializer
+from jobs_app.registry import enqueue
+from kanban_app import activity
+from kanban_app.access import access_cache, grant_members, has_board_access, revoke_members
+from kanban_app.archive import restore_task
+from kanban_app.cloning import clone_board
+from kanban_app.columns import move_task
+from kanban_app.models import Activity, ArchivedTask, Board, Comment, User, Task
+from kanban_app.sharding import CrossShardListMixin, each_shard, get_db, get_view_shard, place_new_board, shard_for_board, use_shard
+from kanban_app.signals import tasks_changed
+from kanban_app.snapshots import get_board_detail, refresh_members
+from .serializers import BoardSerializer, BoardDetailReadSerializer, BoardDetailWriteSerializer, MiniUserSerializer, TaskSerializer, EmailCheckSerializer, TaskDetailSerializer, CommentSerializer, CommentPreviewSerializer, ArchivedTaskSerializer, BoardCloneSerializer, BoardMembersSerializer, TaskMoveSerializer, ActivitySerializer, BatchRequestSerializer
 from .permissions import IsOwnerOrMember, IsAuthenticated, TaskDetailPermission, IsOwnerAndDeleteOnly, CommentPermission
+from .filters import TaskListQueryMixin
+from .idempotency import IdempotentWriteMixin
+from .pagination import CommentCursorPagination, ArchivedTaskPagination, ActivityPagination
+
+
+logger = logging.getLogger(__name__)
 
-class BoardViewSet(generics.ListCreateAPIView):
+class BoardViewSet(CrossShardListMixin, generics.ListCreateAPIView):
     """
-    GET  /boards/   → List all boards the user owns or belongs to.
+    GET  /boards/   → List all boards the user owns or belongs to (from every shard).
     POST /boards/   → Create a new board, automatically setting the request user as owner.
     """
     serializer_class = BoardSerializer
@@ -20,16 +46,16 @@ class BoardViewSet(generics.ListCreateAPIView):
         """
         Return boards where the current user is either the owner or a member.
         """
-        user = self.request.user
-        owned = Board.objects.filter(owner=user)
-        member = Board.objects.filter(members=user)
-        return (owned | member).distinct()
+        return Board.objects.accessible_to(self.request.user)
 
     def perform_create(self, serializer):
         """
-        Save a new board instance with the current user as its owner.
+        Save a new board instance with the current user as its owner,
+        on the shard chosen for its id in sharded mode.
         """
-        serializer.save(owner=self.request.user)
+        board_id, shard = place_new_board()
+        with use_shard(shard):
+            serializer.save(owner=self.request.user, id=board_id)
 
 
 
@@ -38,21 +64,37 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
     GET    /boards/<pk>/   → Retrieve a single board (403 if not owner or member).
     PATCH  /boards/<pk>/   → Update title or members (owner always preserved).
     PUT    /boards/<pk>/   → Same as PATCH.
-    DELETE /boards/<pk>/   → Delete the board (only owner allowed).
+    DELETE /boards/<pk>/   → Delete the board (only owner allowed); rows are purged in the background.
     """
     permission_classes = [IsOwnerAndDeleteOnly, IsOwnerOrMember, IsAuthenticated]
+    shard_lookup = ('board', 'pk')
 
     def get_object(self):
         """
         Fetch the board by PK and ensure the current user is owner or member.
         Raises PermissionDenied (403) if unauthorized.
         """
-        board = get_object_or_404(Board, pk=self.kwargs['pk'])
+        board = get_object_or_404(self.get_queryset(), pk=self.kwargs['pk'])
         user = self.request.user
-        if not (user == board.owner or user in board.members.all()):
+        if not has_board_access(user, board.pk):
             raise PermissionDenied("You are not allowed to access this board.")
         return board
 
+    def get_queryset(self):
+        """
+        For GET, join the board's stored snapshot (see kanban_app.snapshots).
+        """
+        if self.request.method != 'GET':
+            return Board.objects.all()
+        return Board.objects.select_related('snapshot')
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Assemble the response from the board's pre-rendered member list and
+        task fragments instead of serializing every task.
+        """
+        return Response(get_board_detail(self.get_object()))
+
     def get_serializer_class(self):
         """
         Select the read serializer for GET,
@@ -61,8 +103,209 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
         if self.request.method in ('PATCH', 'PUT'):
             return BoardDetailWriteSerializer
         return BoardDetailReadSerializer
+
+    def perform_destroy(self, instance):
+        """
+        Mark the board as deleted instead of running the cascade in the request.
+        The board and its tasks vanish from all querysets right away; the rows
+        are removed by a background job in small batches (kanban_app.purge).
+        """
+        Board.objects.filter(pk=instance.pk).update(deleted_at=timezone.now())
+        enqueue('kanban.purge_board', {'board_id': instance.pk}, user=self.request.user)
     
 
+class BoardCloneView(APIView):
+    """
+    POST /boards/<pk>/clone/   → Copy the board for the current user, optionally with
+                                 its members, tasks and comments (kanban_app.cloning).
+    """
+    permission_classes = [IsAuthenticated]
+    shard_lookup = ('board', 'pk')
+
+    def post(self, request, pk):
+        """
+        Accepts JSON with an optional 'title' and the flags 'members', 'tasks'
+        (default true) and 'comments'.
+        Returns 201 Created with the new board and the number of copied rows,
+        or 403 Forbidden if the user has no access to the source board.
+        """
+        source = get_object_or_404(Board, pk=pk)
+        if not has_board_access(request.user, source.pk):
+            raise PermissionDenied("You are not allowed to access this board.")
+
+        serializer = BoardCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        board, copied = clone_board(source, request.user, **serializer.validated_data)
+
+        with use_shard(board._state.db):
+            data = BoardSerializer(board).data
+        return Response({**data, 'copied': copied}, status=status.HTTP_201_CREATED)
+
+
+class BoardMembersView(APIView):
+    """
+    POST   /boards/<pk>/members/   → Add a batch of users (by id and/or email) to the board.
+    DELETE /boards/<pk>/members/   → Remove a batch of users from the board.
+
+    Only the difference to the current membership is written, with bulk
+    statements on the membership and access tables. The owner can never be removed.
+    """
+    permission_classes = [IsAuthenticated]
+    shard_lookup = ('board', 'pk')
+
+    def get_board(self, pk):
+        """
+        Fetch the board and ensure the current user is owner or member.
+        Raises PermissionDenied (403) if unauthorized.
+        """
+        board = get_object_or_404(Board, pk=pk)
+        user = self.request.user
+        if not has_board_access(user, board.pk):
+            raise PermissionDenied("You are not allowed to access this board.")
+        return board
+
+    def get_users(self, request):
+        serializer = BoardMembersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data['users']
+
+    def post(self, request, pk):
+        """
+        Accepts JSON with 'user_ids' and/or 'emails'.
+        Returns 200 OK with the ids that were actually added and the new member count.
+        """
+        board = self.get_board(pk)
+        users = self.get_users(request)
+        Membership = Board.members.through
+
+        with transaction.atomic(using=get_db()):
+            existing = set(
+                Membership.objects.filter(board_id=board.pk, user_id__in=users).values_list('user_id', flat=True)
+            )
+            added = sorted(users - existing)
+            Membership.objects.bulk_create(
+                [Membership(board_id=board.pk, user_id=user_id) for user_id in added],
+                ignore_conflicts=True
+            )
+            grant_members(board.pk, added)
+            refresh_members(board.pk)
+            for user_id in added:
+                activity.record(board.pk, 'member_added', actor=request.user, user_id=user_id)
+
+        data = {
+            'added': added,
+            'member_count': Membership.objects.filter(board_id=board.pk).count(),
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+    def delete(self, request, pk):
+        """
+        Accepts JSON with 'user_ids' and/or 'emails'.
+        Returns 200 OK with the ids that were actually removed and the new member count,
+        or 400 Bad Request if the batch contains the board owner.
+        """
+        board = self.get_board(pk)
+        users = self.get_users(request)
+        Membership = Board.members.through
+
+        if board.owner_id in users:
+            return Response(
+                {'error': 'Der Besitzer kann nicht aus dem Board entfernt werden.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic(using=get_db()):
+            memberships = Membership.objects.filter(board_id=board.pk, user_id__in=users)
+            removed = sorted(memberships.values_list('user_id', flat=True))
+            memberships.delete()
+            revoke_members(board.pk, removed)
+            refresh_members(board.pk)
+            for user_id in removed:
+                activity.record(board.pk, 'member_removed', actor=request.user, user_id=user_id)
+
+        data = {
+            'removed': removed,
+            'member_count': Membership.objects.filter(board_id=board.pk).count(),
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class DashboardView(APIView):
+    """
+    GET /dashboard/
+    → Task statistics across all boards the user owns or belongs to, plus the
+      number of tasks assigned to and reviewed by the user.
+
+    Each section is a single aggregate query; the result is cached per user
+    for settings.DASHBOARD_CACHE_SECONDS.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Returns 200 OK with:
+            {
+              'tasks_by_status': {status: int},
+              'tasks_by_priority': {priority: int},
+              'overdue_count': int,
+              'due_this_week_count': int,
+              'assigned_to_me_count': int,
+              'reviewing_count': int
+            }
+        """
+        cache_key = f'dashboard:{request.user.pk}'
+        data = cache.get(cache_key)
+
+        if data is None:
+            data = {**self.get_board_stats(request.user), **self.get_personal_stats(request.user)}
+            cache.set(cache_key, data, settings.DASHBOARD_CACHE_SECONDS)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    def get_board_stats(self, user):
+        """
+        Count the tasks of the user's boards by status, by priority and by due date
+        with conditional aggregation in one query per shard.
+        """
+        today = timezone.localdate()
+        end_of_week = today + datetime.timedelta(days=6 - today.weekday())
+        open_tasks = ~Q(status='done')
+
+        aggregates = {
+            f'status_{value}': Count('id', filter=Q(status=value)) for value, label in Task.STATUS_CHOICES
+        }
+        aggregates.update({
+            f'priority_{value}': Count('id', filter=Q(priority=value)) for value, label in Task.PRIORITY_CHOICES
+        })
+        aggregates['overdue_count'] = Count('id', filter=open_tasks & Q(due_date__lt=today))
+        aggregates['due_this_week_count'] = Count(
+            'id', filter=open_tasks & Q(due_date__gte=today, due_date__lte=end_of_week)
+        )
+
+        counts = Counter()
+        for alias in each_shard():
+            counts.update(Task.objects.accessible_to(user).aggregate(**aggregates))
+
+        return {
+            'tasks_by_status': {value: counts[f'status_{value}'] for value, label in Task.STATUS_CHOICES},
+            'tasks_by_priority': {value: counts[f'priority_{value}'] for value, label in Task.PRIORITY_CHOICES},
+            'overdue_count': counts['overdue_count'],
+            'due_this_week_count': counts['due_this_week_count'],
+        }
+
+    def get_personal_stats(self, user):
+        """
+        Count the tasks assigned to and reviewed by the user in one query per shard.
+        """
+        counts = Counter()
+        for alias in each_shard():
+            counts.update(Task.objects.filter(Q(assigned_to=user) | Q(reviewer=user)).aggregate(
+                assigned_to_me_count=Count('id', filter=Q(assigned_to=user)),
+                reviewing_count=Count('id', filter=Q(reviewer=user)),
+            ))
+        return {'assigned_to_me_count': counts['assigned_to_me_count'], 'reviewing_count': counts['reviewing_count']}
+
+
 class CheckMailView(APIView):
     """
     GET /email-check/?email=<email>
@@ -82,32 +325,45 @@ class CheckMailView(APIView):
         data = MiniUserSerializer(user).data
         return Response(data, status=status.HTTP_200_OK)
         
-class TaskViewSet(generics.ListCreateAPIView):
+class TaskViewSet(IdempotentWriteMixin, CrossShardListMixin, TaskListQueryMixin, generics.ListCreateAPIView):
     """
-    GET  /tasks/   → List all tasks.
-    POST /tasks/   → Create a new task.
+    GET  /tasks/   → List the tasks of all boards the user owns or belongs to (filterable, see TaskListQueryMixin).
+    POST /tasks/   → Create a new task (replayable with an Idempotency-Key header).
     """
-    queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsOwnerOrMember, IsAuthenticated]
 
+    def get_queryset(self):
+        """
+        Return the tasks the user can access, narrowed by the filter and ordering query parameters.
+        """
+        return self.filter_tasks(Task.objects.accessible_to(self.request.user))
+
     def get_serializer_context(self):
         """
         Inject the request into the serializer context for permission checks.
         """
         return {'request': self.request}
+
+    def create(self, request, *args, **kwargs):
+        """
+        Create the task on the shard of the board given in the body.
+        """
+        with use_shard(shard_for_board(request.data.get('board'))):
+            return super().create(request, *args, **kwargs)
     
     
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(IdempotentWriteMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /tasks/<pk>/   → Retrieve a single task.
-    PATCH  /tasks/<pk>/   → Update a task.
-    PUT    /tasks/<pk>/   → Replace a task.
+    PATCH  /tasks/<pk>/   → Update a task (replayable with an Idempotency-Key header).
+    PUT    /tasks/<pk>/   → Replace a task (same).
     DELETE /tasks/<pk>/   → Delete a task.
     """
     queryset = Task.objects.all()
     serializer_class = TaskDetailSerializer
     permission_classes = [TaskDetailPermission ,IsAuthenticated]
+    shard_lookup = ('task', 'pk')
 
     def get_serializer_context(self):
         """
@@ -115,7 +371,46 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         return {'request': self.request}
 
-class AssignedDetailView(generics.ListAPIView):
+class TaskMoveView(generics.GenericAPIView):
+    """
+    PATCH /tasks/<pk>/move/
+    → Move a task to another column and/or position, writing only that task's row.
+    """
+    queryset = Task.objects.all()
+    permission_classes = [TaskDetailPermission, IsAuthenticated]
+    shard_lookup = ('task', 'pk')
+
+    def patch(self, request, pk):
+        """
+        Accepts JSON with optional 'status', 'prev_id' and 'next_id'
+        (the tasks that should end up directly above and below).
+        - Returns 200 OK with the task in TaskSerializer format.
+        - Returns 400 Bad Request if the neighbours are invalid or out of order.
+        """
+        task = self.get_object()
+        serializer = TaskMoveSerializer(data=request.data, context={'task': task})
+        serializer.is_valid(raise_exception=True)
+        old_status = task.status
+
+        try:
+            task = move_task(task, **serializer.validated_data)
+        except ValueError:
+            return Response(
+                {'error': 'prev_id muss in der Spalte vor next_id liegen.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if task.status != old_status:
+            activity.record(
+                task.board_id, 'task_status_changed', actor=request.user, task_id=task.pk,
+                old=old_status, new=task.status
+            )
+
+        data = TaskSerializer(task, context={'request': request}).data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AssignedDetailView(CrossShardListMixin, TaskListQueryMixin, generics.ListAPIView):
     """
     GET /tasks/assigned-to-me/
     → List tasks where the current user is the assignee.
@@ -125,12 +420,13 @@ class AssignedDetailView(generics.ListAPIView):
 
     def get_queryset(self):
         """
-        Return tasks filtered by assigned_to == current user.
+        Return tasks filtered by assigned_to == current user,
+        narrowed by the filter and ordering query parameters.
         """
-        return Task.objects.filter(assigned_to=self.request.user)
+        return self.filter_tasks(Task.objects.filter(assigned_to=self.request.user))
 
 
-class ReviewerDetailView(generics.ListAPIView):
+class ReviewerDetailView(CrossShardListMixin, TaskListQueryMixin, generics.ListAPIView):
     """
     GET /tasks/reviewing/
     → List tasks where the current user is the reviewer.
@@ -140,18 +436,22 @@ class ReviewerDetailView(generics.ListAPIView):
 
     def get_queryset(self):
         """
-        Return tasks filtered by reviewer == current user.
+        Return tasks filtered by reviewer == current user,
+        narrowed by the filter and ordering query parameters.
         """
-        return Task.objects.filter(reviewer=self.request.user)
+        return self.filter_tasks(Task.objects.filter(reviewer=self.request.user))
 
 
-class CommentViewSet(generics.ListCreateAPIView):
+class CommentViewSet(IdempotentWriteMixin, generics.ListCreateAPIView):
     """
-    GET  /tasks/<task_id>/comments/   → List all comments for the task.
-    POST /tasks/<task_id>/comments/   → Create a new comment on the task.
+    GET  /tasks/<task_id>/comments/             → List the task's comments, newest first, one cursor page at a time.
+    GET  /tasks/<task_id>/comments/?preview=1   → Same, with a preview and the length instead of the full content.
+    POST /tasks/<task_id>/comments/             → Create a new comment on the task (replayable with an Idempotency-Key header).
     """
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CommentCursorPagination
+    shard_lookup = ('task', 'task_id')
 
     def get_queryset(self):
         """
@@ -162,10 +462,22 @@ class CommentViewSet(generics.ListCreateAPIView):
         task = get_object_or_404(Task, id=task_id)
         user = self.request.user
 
-        if user != task.board.owner and user not in task.board.members.all():
+        if not has_board_access(user, task.board_id):
             raise PermissionDenied("Du bist kein Mitglied dieses Boards.")
 
-        return Comment.objects.filter(task=task).order_by('-created_at')
+        comments = Comment.objects.filter(task=task).order_by('-created_at', '-id')
+        if self.is_preview():
+            comments = comments.defer('content')
+        return comments
+
+    def is_preview(self):
+        """
+        Return True for list requests with `?preview=1` (or `true`).
+        """
+        return self.request.method == 'GET' and self.request.query_params.get('preview') in ('1', 'true')
+
+    def get_serializer_class(self):
+        return CommentPreviewSerializer if self.is_preview() else CommentSerializer
 
     def get_serializer_context(self):
         """
@@ -175,6 +487,20 @@ class CommentViewSet(generics.ListCreateAPIView):
         context['task_id'] = self.kwargs.get('task_id')
         return context
 
+    def perform_create(self, serializer):
+        """
+        Save the comment and bump the task's comments_count in the same transaction.
+        The increment is done in SQL, so concurrent posts cannot lose updates.
+        """
+        with transaction.atomic(using=get_db()):
+            comment = serializer.save()
+            Task.objects.filter(pk=comment.task_id).update(comments_count=F('comments_count') + 1)
+            tasks_changed.send(sender=Task, task_ids=[comment.task_id])
+            activity.record(
+                comment.task.board_id, 'comment_added', actor=self.request.user, task_id=comment.task_id,
+                comment_id=comment.pk
+            )
+
 class CommentDetailView(generics.RetrieveDestroyAPIView):
     """
     GET    /tasks/<task_id>/comments/<comment_id>/   → Retrieve a single comment.
@@ -182,6 +508,7 @@ class CommentDetailView(generics.RetrieveDestroyAPIView):
     """
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, CommentPermission]
+    shard_lookup = ('task', 'task_id')
 
     def get_object(self):
         """
@@ -189,10 +516,171 @@ class CommentDetailView(generics.RetrieveDestroyAPIView):
         or the comment author (for DELETE). Raises PermissionDenied (403) otherwise.
         """
         comment_id = self.kwargs.get('comment_id')
-        comment = get_object_or_404(Comment, id=comment_id)
+        comment = get_object_or_404(Comment, id=comment_id, task__board__deleted_at__isnull=True)
+        user = self.request.user
+
+        if not has_board_access(user, comment.task.board_id):
+            raise PermissionDenied("Du bist kein Mitglied dieses Boards.")
+
+        return comment
+
+    def perform_destroy(self, instance):
+        """
+        Delete the comment and decrement the task's comments_count atomically.
+        """
+        comment_id = instance.pk
+        with transaction.atomic(using=get_db()):
+            instance.delete()
+            Task.objects.filter(pk=instance.task_id, comments_count__gt=0).update(
+                comments_count=F('comments_count') - 1
+            )
+            tasks_changed.send(sender=Task, task_ids=[instance.task_id])
+            activity.record(
+                instance.task.board_id, 'comment_deleted', actor=self.request.user, task_id=instance.task_id,
+                comment_id=comment_id
+            )
+
+
+class ArchivedTaskListView(generics.ListAPIView):
+    """
+    GET /boards/<pk>/archived-tasks/
+    → List the board's archived tasks, newest first, one cursor page at a time.
+    """
+    serializer_class = ArchivedTaskSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ArchivedTaskPagination
+    shard_lookup = ('board', 'pk')
+
+    def get_queryset(self):
+        """
+        Ensure the user has board access, then return the board's archived tasks.
+        Raises PermissionDenied (403) if user is not a board member.
+        """
+        board = get_object_or_404(Board, pk=self.kwargs['pk'])
+        user = self.request.user
+
+        if not has_board_access(user, board.pk):
+            raise PermissionDenied("Du bist kein Mitglied dieses Boards.")
+
+        return ArchivedTask.objects.filter(board=board)
+
+
+class ActivityListView(generics.ListAPIView):
+    """
+    GET /boards/<pk>/activity/
+    → List the board's activity log, newest first, one cursor page at a time.
+    """
+    serializer_class = ActivitySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ActivityPagination
+    shard_lookup = ('board', 'pk')
+
+    def get_queryset(self):
+        """
+        Ensure the user has board access, then return the board's activity entries.
+        Raises PermissionDenied (403) if user is not a board member.
+        """
+        board = get_object_or_404(Board, pk=self.kwargs['pk'])
         user = self.request.user
 
-        if user != comment.task.board.owner and user not in comment.task.board.members.all():
+        if not has_board_access(user, board.pk):
+            raise PermissionDenied("Du bist kein Mitglied dieses Boards.")
+
+        return Activity.objects.filter(board=board)
+
+
+class ArchivedTaskRestoreView(APIView):
+    """
+    POST /archived-tasks/<pk>/restore/
+    → Move an archived task and its comments back onto its board.
+    """
+    permission_classes = [IsAuthenticated]
+    shard_lookup = ('archived_task', 'pk')
+
+    def post(self, request, pk):
+        """
+        Restore the archived task if the user is owner or member of its board.
+        Returns the restored task in TaskSerializer format.
+        """
+        archived_task = get_object_or_404(ArchivedTask, pk=pk)
+        user = request.user
+
+        if not has_board_access(user, archived_task.board_id):
             raise PermissionDenied("Du bist kein Mitglied dieses Boards.")
 
-        return comment
\ No newline at end of file
+        task = restore_task(archived_task)
+        data = TaskSerializer(task, context={'request': request}).data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class BatchView(APIView):
+    """
+    POST /batch/
+    → Run several GET requests against the routes of this API in one round trip.
+
+    The sub-requests run in-process, in order, with the caller's already
+    authenticated user, and board access checks are looked up once per batch.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Accepts JSON like {"requests": [{"method": "GET", "path": "/api/boards/1/"}, ...]}.
+        Returns 200 OK with {"responses": [{"path", "status", "body"}, ...]} in request order;
+        a failing sub-request only affects its own entry.
+        """
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with access_cache():
+            responses = [self.run(request, item['path']) for item in serializer.validated_data['requests']]
+
+        return Response({'responses': responses}, status=status.HTTP_200_OK)
+
+    def run(self, request, full_path):
+        """
+        Resolve one path against kanban_app.api.urls and call its view. An
+        unexpected error in the view is logged and answered with a 500 entry.
+        """
+        path, _, query = full_path.partition('?')
+        route = '/' + path.removeprefix('/api/').lstrip('/')
+        try:
+            match = resolve(route, urlconf='kanban_app.api.urls')
+        except Resolver404:
+            return {'path': full_path, 'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Not found.'}}
+
+        sub_request = self.build_request(request, path, query)
+        sub_request.resolver_match = match
+        try:
+            with use_shard(get_view_shard(match.func, match.kwargs)):
+                response = match.func(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception('Batch sub-request %s failed', full_path)
+            return {
+                'path': full_path,
+                'status': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                'body': {'detail': 'A server error occurred.'},
+            }
+
+        return {'path': full_path, 'status': response.status_code, 'body': getattr(response, 'data', None)}
+
+    def build_request(self, request, path, query):
+        """
+        Build a GET request for `path` that inherits the caller's headers and user.
+        """
+        outer = request._request
+        sub_request = HttpRequest()
+        sub_request.method = 'GET'
+        sub_request.path = sub_request.path_info = '/' + path.lstrip('/')
+        sub_request.META = {
+            key: value for key, value in outer.META.items()
+            if key not in ('CONTENT_LENGTH', 'CONTENT_TYPE')
+        }
+        sub_request.META.update({'REQUEST_METHOD': 'GET', 'PATH_INFO': sub_request.path, 'QUERY_STRING': query})
+        sub_request.GET = QueryDict(query)
+        sub_request.COOKIES = outer.COOKIES
+        sub_request.user = request.user
+        # DRF's Request picks these up instead of running the authenticators again.
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        return sub_request
@@ -1,6 +1,38 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete, pre_save
 
 
 class KanbanAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kanban_app'
+
+    def ready(self):
+        from jobs_app.signals import job_finished
+        from kanban_app import access, activity, sharding, snapshots, user_directory
+        from kanban_app.models import Board, Comment, Task, User
+        from kanban_app.signals import tasks_changed
+
+        request_finished.connect(activity.flush, dispatch_uid='kanban_app.activity.flush')
+        job_finished.connect(activity.flush, dispatch_uid='kanban_app.activity.flush')
+
+        post_save.connect(access.board_saved, sender=Board, dispatch_uid='kanban_app.access.board_saved')
+        m2m_changed.connect(access.members_changed, sender=Board.members.through, dispatch_uid='kanban_app.access.members_changed')
+
+        if sharding.is_enabled():
+            pre_save.connect(sharding.assign_global_id, sender=Task, dispatch_uid='kanban_app.sharding.task_id')
+            pre_save.connect(sharding.assign_global_id, sender=Comment, dispatch_uid='kanban_app.sharding.comment_id')
+            post_save.connect(sharding.replicate_user, sender=User, dispatch_uid='kanban_app.sharding.replicate_user')
+            post_delete.connect(sharding.delete_user_replica, sender=User, dispatch_uid='kanban_app.sharding.delete_user')
+            post_migrate.connect(sharding.sync_user_replicas, sender=self, dispatch_uid='kanban_app.sharding.sync_users')
+
+        post_save.connect(user_directory.user_changed, sender=User, dispatch_uid='kanban_app.user_directory.saved')
+        post_delete.connect(user_directory.user_changed, sender=User, dispatch_uid='kanban_app.user_directory.deleted')
+
+        # After the user replication and directory eviction above, so re-rendering reads the new user row.
+        post_save.connect(snapshots.task_saved, sender=Task, dispatch_uid='kanban_app.snapshots.task_saved')
+        post_save.connect(snapshots.user_saved, sender=User, dispatch_uid='kanban_app.snapshots.user_saved')
+        pre_delete.connect(snapshots.user_deleting, sender=User, dispatch_uid='kanban_app.snapshots.user_deleting')
+        post_delete.connect(snapshots.user_deleted, sender=User, dispatch_uid='kanban_app.snapshots.user_deleted')
+        m2m_changed.connect(snapshots.members_changed, sender=Board.members.through, dispatch_uid='kanban_app.snapshots.members_changed')
+        tasks_changed.connect(snapshots.tasks_changed, sender=Task, dispatch_uid='kanban_app.snapshots.tasks_changed')
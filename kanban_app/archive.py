@@ -0,0 +1,133 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from kanban_app.columns import get_end_of_column
+from kanban_app.models import ArchivedComment, ArchivedTask, Comment, Task
+from kanban_app.sharding import each_shard, get_db
+
+
+TASK_COLUMNS = [
+    'id',
+    'board_id',
+    'title',
+    'description',
+    'assigned_to_id',
+    'reviewer_id',
+    'status',
+    'priority',
+    'due_date',
+    'author_id',
+    'comments_count',
+    'updated_at',
+]
+
+COMMENT_COLUMNS = ['id', 'task_id', 'author_id', 'content', 'created_at']
+
+
+def get_archive_cutoff(days=None):
+    """
+    Return the point in time before which done tasks count as archivable.
+
+    Args:
+        days (int, optional): Age in days; defaults to settings.KANBAN_ARCHIVE_AFTER_DAYS.
+
+    Returns:
+        datetime: The aware cutoff datetime.
+    """
+    if days is None:
+        days = settings.KANBAN_ARCHIVE_AFTER_DAYS
+    return timezone.now() - datetime.timedelta(days=days)
+
+
+def archive_done_tasks(days=None, batch_size=None, board_id=None):
+    """
+    Move done tasks older than the cutoff, with their comments, into the archive tables.
+
+    Every batch is copied and deleted in its own transaction, so the write lock
+    on the hot tables is only held for one batch at a time. In sharded mode
+    every shard is processed in turn.
+
+    Args:
+        days (int, optional): Minimum age in days since the task was last changed.
+        batch_size (int, optional): Tasks per transaction; defaults to settings.KANBAN_ARCHIVE_BATCH_SIZE.
+        board_id (int, optional): Restrict archiving to a single board.
+
+    Returns:
+        int: The number of archived tasks.
+    """
+    if batch_size is None:
+        batch_size = settings.KANBAN_ARCHIVE_BATCH_SIZE
+
+    candidates = Task.objects.filter(status='done', updated_at__lt=get_archive_cutoff(days))
+    if board_id is not None:
+        candidates = candidates.filter(board_id=board_id)
+
+    archived = 0
+    for alias in each_shard(board_id):
+        while True:
+            with transaction.atomic(using=alias):
+                task_ids = list(candidates.order_by('id').values_list('id', flat=True)[:batch_size])
+                if not task_ids:
+                    break
+                archive_tasks(task_ids)
+            archived += len(task_ids)
+
+    return archived
+
+
+def archive_tasks(task_ids):
+    """
+    Copy the given tasks and their comments into the archive and delete the originals.
+    Must be called inside a transaction.
+
+    Args:
+        task_ids (list): Primary keys of the tasks to archive.
+    """
+    ArchivedTask.objects.bulk_create(
+        ArchivedTask(**row)
+        for row in Task.objects.filter(id__in=task_ids).values(*TASK_COLUMNS)
+    )
+    ArchivedComment.objects.bulk_create(
+        (ArchivedComment(**row) for row in Comment.objects.filter(task_id__in=task_ids).values(*COMMENT_COLUMNS)),
+        batch_size=1000
+    )
+
+    Comment.objects.filter(task_id__in=task_ids).delete()
+    Task.objects.filter(id__in=task_ids).delete()
+
+
+def restored_comments(archived_task):
+    """
+    Yield the live comments for an archived task's comments, previews filled in.
+    """
+    for row in archived_task.comments.values(*COMMENT_COLUMNS):
+        comment = Comment(**row)
+        comment.update_preview()
+        yield comment
+
+
+def restore_task(archived_task):
+    """
+    Move an archived task and its comments back into the live tables.
+
+    The task keeps its original id, goes to the bottom of its column and gets
+    a fresh updated_at, so it is not picked up again by the next archiving run.
+
+    Args:
+        archived_task (ArchivedTask): The archived task to restore.
+
+    Returns:
+        Task: The restored task.
+    """
+    with transaction.atomic(using=get_db()):
+        row = {column: getattr(archived_task, column) for column in TASK_COLUMNS}
+        task = Task(**row, position=get_end_of_column(archived_task.board_id, archived_task.status))
+        task.save(force_insert=True)
+
+        Comment.objects.bulk_create(restored_comments(archived_task), batch_size=1000)
+        archived_task.delete()
+
+    return task
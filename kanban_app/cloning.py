@@ -0,0 +1,128 @@
+"""
+Board cloning.
+
+A clone is a new board owned by the cloning user, optionally with the
+source's members, tasks and comments. Rows are read from the source in
+primary key batches and written with bulk inserts inside one transaction on
+the new board's database, which in sharded mode may be another shard than
+the source's. Tasks keep their column and position; their new ids are mapped
+from the old ones so the copied comments point at the copies.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from kanban_app.access import grant_members
+from kanban_app.models import Board, Comment, Task
+from kanban_app.sharding import assign_ids, get_db, place_new_board, use_shard
+
+
+TASK_COLUMNS = [
+    'id',
+    'title',
+    'description',
+    'assigned_to_id',
+    'reviewer_id',
+    'status',
+    'priority',
+    'due_date',
+    'author_id',
+    'comments_count',
+    'position',
+]
+
+COMMENT_COLUMNS = ['id', 'task_id', 'author_id', 'content', 'preview', 'content_length', 'created_at']
+
+
+def iter_batches(queryset, columns, batch_size):
+    """
+    Yield the rows of `queryset` as lists of dicts, in primary key order.
+    """
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).order_by('pk').values(*columns)[:batch_size])
+        if not rows:
+            return
+        last_pk = rows[-1]['id']
+        yield rows
+
+
+def clone_board(source, owner, title=None, members=False, tasks=True, comments=False, batch_size=None):
+    """
+    Copy a board for `owner`. Must be called with the source board's shard current.
+
+    Users who would not have access to the clone (when members are not copied)
+    are dropped as assignee and reviewer, and replaced by the owner as task author.
+    Comments keep their authors and timestamps.
+
+    Args:
+        source (Board): The board to copy.
+        owner (User): Owner of the new board; always one of its members.
+        title (str, optional): Title of the new board; defaults to the source title.
+        members (bool): Copy the source's members.
+        tasks (bool): Copy the source's tasks.
+        comments (bool): Copy the comments of the copied tasks; requires tasks.
+        batch_size (int, optional): Rows per read and insert; defaults to settings.KANBAN_CLONE_BATCH_SIZE.
+
+    Returns:
+        tuple: (the new Board, dict with the number of copied members, tasks and comments)
+    """
+    if batch_size is None:
+        batch_size = settings.KANBAN_CLONE_BATCH_SIZE
+    source_db = get_db()
+    Membership = Board.members.through
+
+    member_ids = {owner.pk}
+    if members:
+        member_ids.update(
+            Membership.objects.using(source_db).filter(board_id=source.pk).values_list('user_id', flat=True)
+        )
+
+    def keep(user_id):
+        return user_id if user_id in member_ids else None
+
+    board_id, shard = place_new_board()
+    copied = {'members': len(member_ids), 'tasks': 0, 'comments': 0}
+
+    with use_shard(shard), transaction.atomic(using=shard):
+        board = Board.objects.create(id=board_id, title=title or source.title, owner=owner)
+        Membership.objects.bulk_create(
+            [Membership(board_id=board.pk, user_id=user_id) for user_id in sorted(member_ids)]
+        )
+        grant_members(board.pk, member_ids)
+
+        task_ids = {}
+        if tasks:
+            source_tasks = Task.objects.using(source_db).filter(board_id=source.pk)
+            for rows in iter_batches(source_tasks, TASK_COLUMNS, batch_size):
+                copies = []
+                for row in rows:
+                    old_id = row.pop('id')
+                    row['assigned_to_id'] = keep(row['assigned_to_id'])
+                    row['reviewer_id'] = keep(row['reviewer_id'])
+                    row['author_id'] = keep(row['author_id']) or owner.pk
+                    if not comments:
+                        row['comments_count'] = 0
+                    copies.append((old_id, Task(board_id=board.pk, **row)))
+
+                assign_ids([task for _, task in copies])
+                Task.objects.bulk_create([task for _, task in copies])
+                task_ids.update((old_id, task.pk) for old_id, task in copies)
+            copied['tasks'] = len(task_ids)
+
+        if tasks and comments:
+            source_comments = Comment.objects.using(source_db).filter(task__board_id=source.pk)
+            for rows in iter_batches(source_comments, COMMENT_COLUMNS, batch_size):
+                copies = []
+                for row in rows:
+                    # Skip comments on tasks added after their batch was copied.
+                    if row['task_id'] not in task_ids:
+                        continue
+                    del row['id']
+                    row['task_id'] = task_ids[row['task_id']]
+                    copies.append(Comment(**row))
+
+                assign_ids(copies)
+                Comment.objects.bulk_create(copies)
+                copied['comments'] += len(copies)
+
+    return board, copied
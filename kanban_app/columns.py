@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs_app.registry import enqueue
+from kanban_app.models import Task
+from kanban_app.positions import key_between, keys_between
+from kanban_app.sharding import get_db
+from kanban_app.signals import tasks_changed
+
+
+def column_tasks(board_id, status):
+    """
+    Return the tasks of one (board, status) column.
+    """
+    return Task.objects.filter(board_id=board_id, status=status)
+
+
+def get_end_of_column(board_id, status, exclude=None):
+    """
+    Return a key behind the last task of the column, and queue a background
+    rebalance of the column if that key has grown too long.
+    """
+    tasks = column_tasks(board_id, status)
+    if exclude is not None:
+        tasks = tasks.exclude(pk=exclude)
+    last = tasks.order_by('-position', '-id').values_list('position', flat=True).first()
+    key = key_between(last or None, None)
+    check_key_length(board_id, status, key)
+    return key
+
+
+def rebalance_column(board_id, status):
+    """
+    Give every task in the column a fresh, short and unique key while keeping
+    the current order. Only needed when keys have grown long or collided.
+
+    Returns:
+        int: The number of tasks in the column.
+    """
+    with transaction.atomic(using=get_db()):
+        tasks = list(column_tasks(board_id, status).order_by('position', 'id').only('id', 'position'))
+        for task, key in zip(tasks, keys_between(None, None, len(tasks))):
+            task.position = key
+        Task.objects.bulk_update(tasks, ['position'], batch_size=1000)
+        tasks_changed.send(sender=Task, task_ids=[task.pk for task in tasks])
+    return len(tasks)
+
+
+def spread_ties(board_id, status, position):
+    """
+    Give the tasks sharing `position` distinct keys between the neighbouring
+    keys, keeping their (position, id) order. Ties come from concurrent
+    appends; only the tied rows are rewritten.
+
+    Returns:
+        int: The number of tied tasks.
+    """
+    with transaction.atomic(using=get_db()):
+        tasks = column_tasks(board_id, status)
+        tied = list(tasks.filter(position=position).order_by('id').only('id', 'position'))
+        before = tasks.filter(position__lt=position).order_by('-position').values_list('position', flat=True).first()
+        after = tasks.filter(position__gt=position).order_by('position').values_list('position', flat=True).first()
+        for task, key in zip(tied, keys_between(before, after, len(tied))):
+            task.position = key
+        Task.objects.bulk_update(tied, ['position'])
+        tasks_changed.send(sender=Task, task_ids=[task.pk for task in tied])
+    return len(tied)
+
+
+def get_neighbour(tasks, position, task_id, after):
+    """
+    Return (position, id) of the task directly after or before the given
+    (position, id) pair, or None at the end of the column.
+    """
+    if after:
+        tasks = tasks.filter(Q(position__gt=position) | Q(position=position, id__gt=task_id)).order_by('position', 'id')
+    else:
+        tasks = tasks.filter(Q(position__lt=position) | Q(position=position, id__lt=task_id)).order_by('-position', '-id')
+    return tasks.values_list('position', 'id').first()
+
+
+def move_task(task, status, prev_id=None, next_id=None, retry=True):
+    """
+    Move a task into a column, between two neighbouring tasks.
+
+    Only the moved task's row is written. If one neighbour is omitted it is
+    looked up, if both are omitted the task goes to the bottom of the column.
+    Should the neighbours share a key, the tied tasks are spread out once
+    first; if keys grow too long a background rebalance is queued.
+
+    Args:
+        task (Task): The task to move.
+        status (str): The target column.
+        prev_id (int, optional): The task that should end up directly above.
+        next_id (int, optional): The task that should end up directly below.
+
+    Raises:
+        ValueError: If prev_id is not above next_id in the column.
+
+    Returns:
+        Task: The task with its new status and position.
+    """
+    tasks = column_tasks(task.board_id, status).exclude(pk=task.pk)
+    above = tasks.filter(pk=prev_id).values_list('position', 'id').first() if prev_id else None
+    below = tasks.filter(pk=next_id).values_list('position', 'id').first() if next_id else None
+
+    if above and not below:
+        below = get_neighbour(tasks, *above, after=True)
+    elif below and not above:
+        above = get_neighbour(tasks, *below, after=False)
+
+    if above is None and below is None:
+        key = get_end_of_column(task.board_id, status, exclude=task.pk)
+    else:
+        try:
+            key = key_between(above[0] if above else None, below[0] if below else None)
+        except ValueError:
+            if not retry or (above and below and above[0] > below[0]):
+                raise
+            spread_ties(task.board_id, status, above[0])
+            return move_task(task, status, prev_id, next_id, retry=False)
+        check_key_length(task.board_id, status, key)
+
+    Task.objects.filter(pk=task.pk).update(status=status, position=key, updated_at=timezone.now())
+    tasks_changed.send(sender=Task, task_ids=[task.pk])
+    task.status = status
+    task.position = key
+    return task
+
+
+def needs_rebalance(key):
+    """
+    Return True if a key has grown long enough to warrant a rebalance.
+    """
+    return len(key) > settings.KANBAN_POSITION_REBALANCE_LENGTH
+
+
+def check_key_length(board_id, status, key):
+    """
+    Queue a background rebalance of the column if `key` is too long, at most
+    once per settings.KANBAN_REBALANCE_QUEUE_SECONDS for each column.
+    """
+    if not needs_rebalance(key):
+        return
+    if cache.add(f'column-rebalance-queued:{board_id}:{status}', True, settings.KANBAN_REBALANCE_QUEUE_SECONDS):
+        enqueue('kanban.rebalance_column', {'board_id': board_id, 'status': status})
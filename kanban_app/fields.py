@@ -0,0 +1,47 @@
+import base64
+import binascii
+import zlib
+
+from django.conf import settings
+from django.db import models
+
+
+class CompressedTextField(models.TextField):
+    """
+    Text column that stores values of settings.TEXT_COMPRESS_MIN_LENGTH
+    characters or more zlib-compressed and base64-encoded behind PREFIX, and
+    hands them back decompressed. Values that start with PREFIX themselves
+    are always compressed when saved, so a stored PREFIX is never ambiguous;
+    plain rows written before the column was compressed that happen to start
+    with PREFIX are read back as they are.
+
+    Exact lookups still work; substring lookups only match uncompressed rows.
+    """
+    PREFIX = 'zlib:'
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return value
+
+        escaped = value.startswith(self.PREFIX)
+        if len(value) < settings.TEXT_COMPRESS_MIN_LENGTH and not escaped:
+            return value
+
+        compressed = self.PREFIX + base64.b64encode(zlib.compress(value.encode())).decode('ascii')
+        return compressed if escaped or len(compressed) < len(value) else value
+
+    @classmethod
+    def decode(cls, value):
+        """
+        Return the text behind a stored value.
+        """
+        if value is None or not value.startswith(cls.PREFIX):
+            return value
+        try:
+            return zlib.decompress(base64.b64decode(value[len(cls.PREFIX):], validate=True)).decode()
+        except (binascii.Error, zlib.error, UnicodeDecodeError):
+            return value
+
+    def from_db_value(self, value, expression, connection):
+        return self.decode(value)
@@ -0,0 +1,105 @@
+"""
+Idempotency keys for task and comment writes.
+
+A client may send an `Idempotency-Key` header with a write. The first
+request with a key claims it by inserting a row (unique per user and key);
+a successful response is stored on that row, a failed one releases the key.
+Retries within settings.IDEMPOTENCY_KEY_TTL_SECONDS get the stored response
+back without the view running again. Expired rows are removed by
+`manage.py prune_idempotency_keys`.
+
+A claim is a lease: if its request has not stored a response within
+settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS, a retry takes the key over.
+Storing and releasing only succeed while the lease is still held, so a
+request that lost its key can roll back its writes.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.utils import timezone
+
+from kanban_app.models import IdempotencyKey
+from kanban_app.purge import delete_in_batches
+
+
+def get_expiry_cutoff():
+    return timezone.now() - datetime.timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+
+
+def get_lock_cutoff():
+    return timezone.now() - datetime.timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+
+
+def get_own_key(record):
+    """
+    Return a queryset of the key row, as long as `record` still holds its lease.
+    """
+    return IdempotencyKey.objects.filter(pk=record.pk, status_code__isnull=True, locked_at=record.locked_at)
+
+
+def claim_key(user, key, method, path):
+    """
+    Find the earlier request holding a key, or claim the key for a new request.
+    A replay costs a single lookup. An unfinished claim of the same request
+    whose lease expired is taken over.
+
+    Returns:
+        tuple: (claimed IdempotencyKey, None) for a new or taken over key, or
+        (None, existing IdempotencyKey or None if it vanished meanwhile).
+    """
+    existing = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if existing is not None:
+        if existing.created_at < get_expiry_cutoff():
+            existing.delete()
+        elif (existing.status_code is None and existing.locked_at < get_lock_cutoff()
+                and (existing.method, existing.path) == (method, path)):
+            now = timezone.now()
+            if get_own_key(existing).update(locked_at=now):
+                existing.locked_at = now
+                return existing, None
+            return None, IdempotencyKey.objects.filter(user=user, key=key).first()
+        else:
+            return None, existing
+
+    try:
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            return IdempotencyKey.objects.create(user=user, key=key, method=method, path=path), None
+    except IntegrityError:
+        return None, IdempotencyKey.objects.filter(user=user, key=key).first()
+
+
+def store_response(record, response):
+    """
+    Keep a successful response for replays; release the key otherwise,
+    so the client can retry the corrected request with it.
+
+    Returns:
+        bool: False if the lease on the key was lost to a retry.
+    """
+    if response.status_code >= 400:
+        return release_key(record)
+    return bool(get_own_key(record).update(status_code=response.status_code, response=response.data))
+
+
+def release_key(record):
+    """
+    Delete the key unless a retry took it over.
+
+    Returns:
+        bool: False if the lease on the key was lost to a retry.
+    """
+    deleted, _ = get_own_key(record).delete()
+    return bool(deleted)
+
+
+def prune_idempotency_keys(batch_size=None):
+    """
+    Delete expired keys in batches.
+
+    Returns:
+        int: The number of deleted keys.
+    """
+    if batch_size is None:
+        batch_size = settings.KANBAN_PURGE_BATCH_SIZE
+    return delete_in_batches(IdempotencyKey.objects.filter(created_at__lt=get_expiry_cutoff()), batch_size)
@@ -0,0 +1,50 @@
+from kanban_app.activity import prune_activity
+from kanban_app.archive import archive_done_tasks
+from kanban_app.columns import rebalance_column
+from kanban_app.idempotency import prune_idempotency_keys
+from kanban_app.models import Board
+from kanban_app.purge import purge_board, purge_deleted_boards
+from kanban_app.sharding import shard_for_board, use_shard
+from kanban_app.snapshots import build_board_snapshot
+from jobs_app.registry import job
+
+
+@job('kanban.purge_board')
+def purge_board_job(board_id):
+    return {'deleted_rows': purge_board(board_id)}
+
+
+@job('kanban.purge_deleted_boards')
+def purge_deleted_boards_job():
+    return {'purged_boards': purge_deleted_boards()}
+
+
+@job('kanban.archive_done_tasks')
+def archive_done_tasks_job(days=None, board_id=None):
+    return {'archived_tasks': archive_done_tasks(days=days, board_id=board_id)}
+
+
+@job('kanban.rebalance_column')
+def rebalance_column_job(board_id, status):
+    with use_shard(shard_for_board(board_id)):
+        return {'tasks': rebalance_column(board_id, status)}
+
+
+@job('kanban.build_board_snapshot')
+def build_board_snapshot_job(board_id):
+    with use_shard(shard_for_board(board_id)):
+        board = Board.objects.filter(pk=board_id).first()
+        if board is None:
+            return {'tasks': 0}
+        build_board_snapshot(board)
+        return {'tasks': board.tasks.count()}
+
+
+@job('kanban.prune_activity')
+def prune_activity_job(days=None):
+    return {'deleted_entries': prune_activity(days=days)}
+
+
+@job('kanban.prune_idempotency_keys')
+def prune_idempotency_keys_job():
+    return {'deleted_keys': prune_idempotency_keys()}
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kanban_app.archive import archive_done_tasks
+
+
+class Command(BaseCommand):
+    help = 'Move done tasks older than KANBAN_ARCHIVE_AFTER_DAYS, with their comments, into the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.KANBAN_ARCHIVE_AFTER_DAYS, help='Minimum age in days since the task was last changed.')
+        parser.add_argument('--batch-size', type=int, default=settings.KANBAN_ARCHIVE_BATCH_SIZE, help='Tasks archived per transaction.')
+        parser.add_argument('--board', type=int, help='Only archive the tasks of this board.')
+
+    def handle(self, *args, **options):
+        archived = archive_done_tasks(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            board_id=options['board'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} tasks.'))
@@ -0,0 +1,135 @@
+import datetime
+import gzip
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import FastJSONRenderer, MessagePackRenderer
+from kanban_app.api.serializers import CommentSerializer, TaskSerializer
+from kanban_app.models import Board, BoardSnapshot, Comment, Task
+from kanban_app.positions import keys_between
+from kanban_app.snapshots import build_board_snapshot, get_board_detail, render_board
+
+
+RENDERERS = [
+    ('drf-json', JSONRenderer()),
+    ('fast-json', FastJSONRenderer()),
+    ('msgpack', MessagePackRenderer()),
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare render time and response size of the JSON and MessagePack renderers on real payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Board to render; defaults to the board with the most tasks.')
+        parser.add_argument('--repeat', type=int, default=20, help='Render each payload this many times and report the fastest run.')
+        parser.add_argument(
+            '--synthetic-tasks',
+            type=int,
+            help='Benchmark a temporary board with this many tasks instead; it is rolled back afterwards.'
+        )
+
+    def handle(self, *args, **options):
+        if options['synthetic_tasks']:
+            try:
+                with transaction.atomic():
+                    board = self.create_synthetic_board(options['synthetic_tasks'])
+                    self.benchmark(board, options['repeat'])
+                    raise Rollback
+            except Rollback:
+                pass
+            return
+
+        if options['board'] is not None:
+            board = Board.objects.filter(pk=options['board']).first()
+        else:
+            board = Board.objects.annotate(total=Count('tasks')).order_by('-total').first()
+
+        if board is None:
+            raise CommandError('No board found. Pass --board or use --synthetic-tasks.')
+
+        self.benchmark(board, options['repeat'])
+
+    def create_synthetic_board(self, task_count):
+        """
+        Create a board with `task_count` tasks spread over the columns, a few
+        comments on the first task and the board's snapshot.
+        """
+        user = User.objects.create(username='benchmark-user', email='benchmark@example.com')
+        board = Board.objects.create(title='Benchmark board', owner=user)
+        board.members.add(user)
+
+        statuses = [['todo', 'in_progress', 'review', 'done'][i % 4] for i in range(task_count)]
+        positions = {status: iter(keys_between(None, None, statuses.count(status))) for status in set(statuses)}
+        Task.objects.bulk_create(
+            Task(
+                board=board,
+                title=f'Task {i}',
+                description='Lorem ipsum dolor sit amet, consectetur adipiscing elit.',
+                status=statuses[i],
+                priority=['low', 'medium', 'high'][i % 3],
+                due_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 365),
+                author=user,
+                assigned_to=user,
+                reviewer=user,
+                position=next(positions[statuses[i]]),
+            )
+            for i in range(task_count)
+        )
+        task = board.tasks.order_by('id').first()
+        comments = [Comment(task=task, author=user, content=f'Comment {i} ' * 10) for i in range(50)]
+        for comment in comments:
+            comment.update_preview()
+        Comment.objects.bulk_create(comments)
+        Task.objects.filter(pk=task.pk).update(comments_count=len(comments))
+
+        build_board_snapshot(board)
+        return board
+
+    def get_payloads(self, board):
+        """
+        Serialize the board the way the current endpoints do. Board detail
+        is assembled from the snapshot when the board has one; otherwise it is
+        rendered live, without queueing a snapshot build.
+        """
+        tasks = Task.objects.filter(board=board).order_by('id')
+        task = tasks.order_by('-comments_count').first()
+        comments = Comment.objects.filter(task=task).order_by('-created_at', '-id')[:50] if task else []
+
+        if BoardSnapshot.objects.filter(board=board).exists():
+            detail = get_board_detail(board)
+        else:
+            detail = render_board(board)
+
+        return [
+            ('board-detail', detail),
+            ('task-list', TaskSerializer(tasks, many=True).data),
+            ('comment-list', CommentSerializer(comments, many=True).data),
+        ]
+
+    def benchmark(self, board, repeat):
+        self.stdout.write(f'Board {board.pk} "{board.title}", best of {repeat} runs\n')
+        self.stdout.write(f'{"payload":<14}{"renderer":<12}{"ms":>10}{"bytes":>12}{"gzip bytes":>12}')
+
+        for payload_name, data in self.get_payloads(board):
+            for renderer_name, renderer in RENDERERS:
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    body = renderer.render(data)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+
+                self.stdout.write(
+                    f'{payload_name:<14}{renderer_name:<12}{best * 1000:>10.3f}'
+                    f'{len(body):>12}{len(gzip.compress(body)):>12}'
+                )
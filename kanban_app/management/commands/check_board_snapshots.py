@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from kanban_app.models import Board
+from kanban_app.sharding import each_shard
+from kanban_app.snapshots import build_board_snapshot, find_differences
+
+
+class Command(BaseCommand):
+    help = 'Compare stored board snapshots against live serialization and optionally rebuild the ones that drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Only check this board.')
+        parser.add_argument('--fix', action='store_true', help='Rebuild every snapshot that differs.')
+
+    def handle(self, *args, **options):
+        checked = drifted = 0
+
+        for alias in each_shard(options['board']):
+            boards = Board.objects.filter(snapshot__isnull=False).order_by('pk')
+            if options['board'] is not None:
+                boards = boards.filter(pk=options['board'])
+
+            for board in boards.iterator(chunk_size=100):
+                checked += 1
+                differences = find_differences(board)
+                if not differences:
+                    continue
+
+                drifted += 1
+                self.stdout.write(f'Board {board.pk}: {", ".join(differences)}')
+                if options['fix']:
+                    build_board_snapshot(board)
+
+        action = 'rebuilt' if options['fix'] else 'out of date'
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} snapshots, {drifted} {action}.'))
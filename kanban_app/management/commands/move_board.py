@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_app.rebalance import move_board
+from kanban_app.sharding import is_enabled
+
+
+class Command(BaseCommand):
+    help = 'Move a board with its tasks, comments, archive and activity to another shard (sharded mode only).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board', type=int, help='The board to move.')
+        parser.add_argument('shard', help='Target database alias, e.g. shard_2.')
+        parser.add_argument('--batch-size', type=int, default=settings.KANBAN_PURGE_BATCH_SIZE, help='Rows copied and deleted per statement.')
+
+    def handle(self, *args, **options):
+        if not is_enabled():
+            raise CommandError('Sharding is off; set KANBAN_SHARDS to use this command.')
+
+        try:
+            moved = move_board(options['board'], options['shard'], batch_size=options['batch_size'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} rows of board {options["board"]} to {options["shard"]}.'))
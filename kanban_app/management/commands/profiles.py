@@ -0,0 +1,79 @@
+import io
+import json
+import pstats
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import get_profile_dir
+
+
+class Command(BaseCommand):
+    help = 'List the captured request profiles, or summarize one of them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help='Profile to summarize (as shown in the list or the X-Profile-Id header).')
+        parser.add_argument('--limit', type=int, default=20, help='Number of functions and statements to show.')
+
+    def handle(self, *args, **options):
+        directory = get_profile_dir()
+
+        if options['name'] is None:
+            self.list_profiles(directory)
+        else:
+            self.summarize(directory, options['name'], options['limit'])
+
+    def list_profiles(self, directory):
+        """
+        Print one line per capture, newest first.
+        """
+        traces = sorted(directory.glob('*.json'), reverse=True)
+        if not traces:
+            self.stdout.write('No profiles captured.')
+            return
+
+        self.stdout.write(f'{"name":<60}{"status":>8}{"ms":>10}{"queries":>9}')
+        for path in traces:
+            trace = json.loads(path.read_text())
+            self.stdout.write(
+                f'{path.stem:<60}{trace["status"]:>8}{trace["duration_ms"]:>10.1f}{len(trace["queries"]):>9}'
+            )
+
+    def summarize(self, directory, name, limit):
+        """
+        Print the hottest functions and an SQL breakdown by origin for one capture.
+        """
+        trace_path = directory / f'{name}.json'
+        profile_path = directory / f'{name}.prof'
+        if not trace_path.exists():
+            raise CommandError(f'Profile "{name}" not found in {directory}.')
+
+        trace = json.loads(trace_path.read_text())
+        queries = trace['queries']
+        sql_ms = sum(query['duration_ms'] for query in queries)
+
+        self.stdout.write(f'{trace["method"]} {trace["path"]} → {trace["status"]} in {trace["duration_ms"]:.1f} ms')
+        self.stdout.write(f'{len(queries)} queries, {sql_ms:.1f} ms in SQL\n')
+
+        by_origin = defaultdict(lambda: [0, 0.0])
+        for query in queries:
+            by_origin[query['origin']][0] += 1
+            by_origin[query['origin']][1] += query['duration_ms']
+
+        self.stdout.write('Queries by origin:')
+        for origin, (count, ms) in sorted(by_origin.items(), key=lambda item: -item[1][1])[:limit]:
+            self.stdout.write(f'{count:>6} {ms:>10.1f} ms  {origin}')
+
+        repeated = Counter(query['sql'] for query in queries).most_common(limit)
+        repeated = [(sql, count) for sql, count in repeated if count > 1]
+        if repeated:
+            self.stdout.write('\nRepeated statements:')
+            for sql, count in repeated:
+                self.stdout.write(f'{count:>6}x  {sql[:160]}')
+
+        if profile_path.exists():
+            self.stdout.write('\nHottest functions (cumulative):')
+            output = io.StringIO()
+            stats = pstats.Stats(str(profile_path), stream=output)
+            stats.sort_stats('cumulative').print_stats(limit)
+            self.stdout.write(output.getvalue())
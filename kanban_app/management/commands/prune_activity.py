@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kanban_app.activity import prune_activity
+
+
+class Command(BaseCommand):
+    help = 'Delete activity log entries older than the retention period, in small batched transactions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ACTIVITY_LOG_RETENTION_DAYS, help='Keep entries younger than this many days.')
+        parser.add_argument('--batch-size', type=int, default=settings.KANBAN_PURGE_BATCH_SIZE, help='Rows deleted per transaction.')
+
+    def handle(self, *args, **options):
+        deleted = prune_activity(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} activity entries.'))
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kanban_app.purge import purge_deleted_boards
+
+
+class Command(BaseCommand):
+    help = 'Physically delete boards marked as deleted, in small batched transactions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.KANBAN_PURGE_BATCH_SIZE, help='Rows deleted per transaction.')
+
+    def handle(self, *args, **options):
+        purged = purge_deleted_boards(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} boards.'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from kanban_app.access import sync_board_access
+from kanban_app.models import Board
+from kanban_app.sharding import each_shard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the BoardAccess rows from board owners and members and report the drift that was fixed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Only reconcile this board.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Boards reconciled per transaction.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        checked = created = deleted = 0
+
+        for alias in each_shard(options['board']):
+            boards = Board.all_objects.order_by('pk')
+            if options['board'] is not None:
+                boards = boards.filter(pk=options['board'])
+
+            last_pk = 0
+            while True:
+                with transaction.atomic(using=alias):
+                    board_ids = list(boards.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+                    if not board_ids:
+                        break
+                    batch_created, batch_deleted = sync_board_access(board_ids)
+
+                checked += len(board_ids)
+                created += batch_created
+                deleted += batch_deleted
+                last_pk = board_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} boards: created {created} and deleted {deleted} access rows.'
+        ))
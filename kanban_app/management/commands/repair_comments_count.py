@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from kanban_app.models import Comment, Task
+from kanban_app.sharding import each_shard
+from kanban_app.signals import tasks_changed
+
+
+class Command(BaseCommand):
+    help = 'Recompute Task.comments_count from the comment table and fix drifted counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Only repair the tasks of this board.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tasks checked per transaction.')
+
+    def handle(self, *args, **options):
+        """
+        Walk the tasks in primary key order, compare the stored counter with
+        the real number of comments and rewrite only the rows that differ.
+        Each batch runs in its own short transaction, shard by shard.
+        """
+        tasks = Task.objects.all()
+        if options['board'] is not None:
+            tasks = tasks.filter(board_id=options['board'])
+
+        # Recounted inside the UPDATE itself, so a comment created between
+        # the check and the fix is not lost.
+        live_count = Coalesce(Subquery(
+            Comment.objects.filter(task=OuterRef('pk'))
+            .order_by()
+            .values('task')
+            .annotate(total=Count('id'))
+            .values('total'),
+            output_field=IntegerField()
+        ), 0)
+
+        batch_size = options['batch_size']
+        checked = repaired = 0
+
+        for alias in each_shard(options['board']):
+            last_pk = 0
+            while True:
+                with transaction.atomic(using=alias):
+                    batch = list(
+                        tasks.filter(pk__gt=last_pk)
+                        .order_by('pk')
+                        .annotate(actual=Count('comments'))
+                        .values_list('pk', 'comments_count', 'actual')[:batch_size]
+                    )
+                    if not batch:
+                        break
+
+                    drifted = [pk for pk, stored, actual in batch if stored != actual]
+                    if drifted:
+                        Task.objects.filter(pk__in=drifted).update(comments_count=live_count)
+                        tasks_changed.send(sender=Task, task_ids=drifted)
+                        repaired += len(drifted)
+
+                checked += len(batch)
+                last_pk = batch[-1][0]
+
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} tasks, repaired {repaired}.'))
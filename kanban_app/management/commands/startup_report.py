@@ -0,0 +1,156 @@
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test.utils import override_settings
+
+from kanban_app.models import Board, User
+
+
+# One line of `python -X importtime` output: self µs | cumulative µs | module.
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$')
+
+DEFAULT_PATHS = [
+    '/api/boards/',
+    '/api/dashboard/',
+    '/api/tasks/assigned-to-me/',
+    '/api/tasks/reviewing/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Start fresh processes and report import time by module and package, the cost of each '
+        'warm-up step and the latency of the first and second request per endpoint, cold and warmed up.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username the sample requests are made as (default: the first user).')
+        parser.add_argument('--path', action='append', default=[], help='Additional GET endpoint to measure; repeatable.')
+        parser.add_argument('--limit', type=int, default=15, help='Number of modules and packages to show.')
+        # Internal: run the measurements in this process and print them as JSON.
+        parser.add_argument('--child', action='store_true', help='Used internally by the report.')
+        parser.add_argument('--warm', action='store_true', help='Used internally by the report.')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure(options)))
+            return
+
+        cold, imports = self.run_child(options, warm=False)
+        warmed, _ = self.run_child(options, warm=True)
+
+        self.report_imports(imports, options['limit'])
+        self.report_warmup(warmed['warmup'])
+        self.report_requests(cold['requests'], warmed['requests'])
+
+    def run_child(self, options, warm):
+        """
+        Run the measurements in a new interpreter with import timing enabled.
+
+        Returns:
+            tuple: (measurements, import time lines)
+        """
+        command = [sys.executable, '-X', 'importtime', str(settings.BASE_DIR / 'manage.py'), 'startup_report', '--child']
+        if warm:
+            command.append('--warm')
+        if options['user']:
+            command += ['--user', options['user']]
+        for path in options['path']:
+            command += ['--path', path]
+
+        result = subprocess.run(command, capture_output=True, text=True, cwd=settings.BASE_DIR)
+        if result.returncode != 0:
+            raise CommandError(f'Measuring process failed:\n{result.stderr[-2000:]}')
+
+        imports = [line for line in result.stderr.splitlines() if line.startswith('import time:')]
+        return json.loads(result.stdout.strip().splitlines()[-1]), imports
+
+    def measure(self, options):
+        """
+        Child mode: optionally warm up, then request every endpoint twice.
+
+        The requests are not rate limited and do not use up the user's shared
+        token buckets. They run in transactions on every database that are
+        rolled back, so writes they cause (such as queued board snapshot
+        jobs) are discarded; caches are per process and end with the child.
+        """
+        from rest_framework.test import APIClient
+
+        from core.warmup import warm_up
+
+        warmup = warm_up(force=True) if options['warm'] else []
+
+        users = User.objects.order_by('pk')
+        user = users.filter(username=options['user']).first() if options['user'] else users.first()
+        if user is None:
+            raise CommandError('No user to make the sample requests as.')
+
+        paths = DEFAULT_PATHS + options['path']
+        board = Board.objects.accessible_to(user).order_by('pk').first()
+        if board is not None:
+            paths.append(f'/api/boards/{board.pk}/')
+
+        client = APIClient()
+        client.force_authenticate(user)
+        requests = []
+        with override_settings(ALLOWED_HOSTS=['testserver'], THROTTLE_RATES={}), ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(transaction.atomic(using=alias))
+            for path in paths:
+                timings = []
+                for _ in range(2):
+                    start = time.perf_counter()
+                    response = client.get(path)
+                    timings.append((time.perf_counter() - start) * 1000)
+                requests.append({'path': path, 'status': response.status_code, 'first_ms': timings[0], 'second_ms': timings[1]})
+            for alias in connections:
+                transaction.set_rollback(True, using=alias)
+
+        return {'warmup': warmup, 'requests': requests}
+
+    def report_imports(self, lines, limit):
+        """
+        Print the slowest modules by cumulative import time and the packages
+        by the sum of their modules' own import time.
+        """
+        modules = []
+        packages = Counter()
+        for line in lines:
+            match = IMPORT_TIME_LINE.match(line)
+            if match is None:
+                continue
+            own, cumulative, _, name = match.groups()
+            modules.append((int(cumulative), name))
+            packages[name.split('.')[0]] += int(own)
+
+        total = sum(packages.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Import time: {total / 1000:.1f} ms in {len(modules)} modules'))
+        self.stdout.write(f'{"module (cumulative)":<60}{"ms":>10}')
+        for cumulative, name in sorted(modules, reverse=True)[:limit]:
+            self.stdout.write(f'{name:<60}{cumulative / 1000:>10.1f}')
+        self.stdout.write(f'\n{"package (self)":<60}{"ms":>10}')
+        for name, own in packages.most_common(limit):
+            self.stdout.write(f'{name:<60}{own / 1000:>10.1f}')
+
+    def report_warmup(self, steps):
+        total = sum(ms for _, _, ms in steps)
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nWarm-up: {total:.1f} ms'))
+        for name, count, ms in steps:
+            self.stdout.write(f'{name:<20}{count:>6} items{ms:>10.1f} ms')
+
+    def report_requests(self, cold, warmed):
+        self.stdout.write(self.style.MIGRATE_HEADING('\nRequest latency (ms)'))
+        self.stdout.write(f'{"endpoint":<36}{"status":>7}{"cold 1st":>10}{"warm 1st":>10}{"2nd":>8}')
+        for before, after in zip(cold, warmed):
+            self.stdout.write(
+                f'{before["path"]:<36}{before["status"]:>7}{before["first_ms"]:>10.1f}'
+                f'{after["first_ms"]:>10.1f}{after["second_ms"]:>8.1f}'
+            )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0006_task_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='created_at_dt',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -0,0 +1,72 @@
+import datetime
+
+from django.db import migrations, transaction
+from django.utils import timezone
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_created_at(apps, schema_editor):
+    """
+    Copy every comment's date into the new datetime column as midnight UTC.
+    Rows are processed in primary key order, one short transaction per batch.
+    """
+    Comment = apps.get_model('kanban_app', 'Comment')
+    db_alias = schema_editor.connection.alias
+    last_pk = 0
+
+    while True:
+        with transaction.atomic(using=db_alias):
+            batch = list(
+                Comment.objects.using(db_alias).filter(pk__gt=last_pk, created_at_dt__isnull=True)
+                .order_by('pk')
+                .only('pk', 'created_at')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            for comment in batch:
+                day = comment.created_at or timezone.now().date()
+                comment.created_at_dt = datetime.datetime.combine(day, datetime.time.min, tzinfo=datetime.timezone.utc)
+            Comment.objects.using(db_alias).bulk_update(batch, ['created_at_dt'])
+
+        last_pk = batch[-1].pk
+
+
+def restore_created_at(apps, schema_editor):
+    """
+    Reverse step: copy the datetime back into the date column, in batches.
+    """
+    Comment = apps.get_model('kanban_app', 'Comment')
+    db_alias = schema_editor.connection.alias
+    last_pk = 0
+
+    while True:
+        with transaction.atomic(using=db_alias):
+            batch = list(
+                Comment.objects.using(db_alias).filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('pk', 'created_at_dt')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            for comment in batch:
+                comment.created_at = comment.created_at_dt.date() if comment.created_at_dt else None
+            Comment.objects.using(db_alias).bulk_update(batch, ['created_at'])
+
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own instead of one long write lock.
+    atomic = False
+
+    dependencies = [
+        ('kanban_app', '0007_comment_created_at_datetime'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_created_at, restore_created_at),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0008_backfill_comment_created_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='comment',
+            name='created_at',
+        ),
+        migrations.RenameField(
+            model_name='comment',
+            old_name='created_at_dt',
+            new_name='created_at',
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_id_idx'),
+        ),
+    ]
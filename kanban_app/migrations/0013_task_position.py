@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+from kanban_app.positions import keys_between
+
+
+def fill_positions(apps, schema_editor):
+    """
+    Number every existing column in id order, one column at a time.
+    """
+    Task = apps.get_model('kanban_app', 'Task')
+    tasks_db = Task.objects.using(schema_editor.connection.alias)
+    columns = tasks_db.order_by().values_list('board_id', 'status').distinct()
+
+    for board_id, status in columns:
+        tasks = list(tasks_db.filter(board_id=board_id, status=status).order_by('id').only('id'))
+        for task, key in zip(tasks, keys_between(None, None, len(tasks))):
+            task.position = key
+        tasks_db.bulk_update(tasks, ['position'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0012_board_deleted_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='position',
+            field=models.CharField(default='V', max_length=255),
+        ),
+        migrations.RunPython(fill_positions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'position', 'id'], name='task_column_position_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_board_access(apps, schema_editor):
+    """
+    Grant every owner and member of an existing board its access row.
+    """
+    Board = apps.get_model('kanban_app', 'Board')
+    BoardAccess = apps.get_model('kanban_app', 'BoardAccess')
+    db_alias = schema_editor.connection.alias
+
+    rows = {
+        (owner_id, board_id): 'owner'
+        for board_id, owner_id in Board.objects.using(db_alias).values_list('id', 'owner_id')
+    }
+    for board_id, user_id in Board.members.through.objects.using(db_alias).values_list('board_id', 'user_id'):
+        rows.setdefault((user_id, board_id), 'member')
+
+    BoardAccess.objects.using(db_alias).bulk_create(
+        (BoardAccess(user_id=user_id, board_id=board_id, role=role) for (user_id, board_id), role in rows.items()),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0015_shard_directory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('owner', 'Owner'), ('member', 'Member')], max_length=10)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access', to='kanban_app.board')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='board_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'board'), name='boardaccess_user_board_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_board_access, migrations.RunPython.noop),
+    ]
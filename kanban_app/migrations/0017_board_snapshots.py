@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0016_board_access'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardSnapshot',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='kanban_app.board')),
+                ('members', models.JSONField(default=list)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskSnapshot',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='kanban_app.task')),
+                ('status', models.CharField(max_length=20)),
+                ('position', models.CharField(max_length=255)),
+                ('data', models.JSONField()),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_snapshots', to='kanban_app.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'status', 'position', 'task'], name='tasksnapshot_column_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:44
+
+import kanban_app.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0017_board_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='content_length',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='preview',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='archivedcomment',
+            name='content',
+            field=kanban_app.fields.CompressedTextField(),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='content',
+            field=kanban_app.fields.CompressedTextField(),
+        ),
+    ]
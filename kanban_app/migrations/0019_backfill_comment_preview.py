@@ -0,0 +1,69 @@
+from django.db import migrations, transaction
+
+from kanban_app.fields import CompressedTextField
+
+
+BATCH_SIZE = 1000
+
+
+def read_raw_content(connection, model, last_pk):
+    """
+    Read a batch of (pk, content) from the table as stored, bypassing the
+    field's decoding: existing plain bodies may start with its prefix.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT {pk}, {content} FROM {table} WHERE {pk} > %s ORDER BY {pk} LIMIT %s'.format(
+                pk=quote(model._meta.pk.column),
+                content=quote(model._meta.get_field('content').column),
+                table=quote(model._meta.db_table),
+            ),
+            [last_pk, BATCH_SIZE]
+        )
+        return cursor.fetchall()
+
+
+def backfill_preview(apps, schema_editor):
+    """
+    Fill preview and content_length of existing comments and rewrite the
+    bodies of live and archived comments, which compresses the long ones and
+    escapes plain ones that start with the compression prefix.
+    Rows are processed in primary key order, one short transaction per batch.
+    """
+    Comment = apps.get_model('kanban_app', 'Comment')
+    ArchivedComment = apps.get_model('kanban_app', 'ArchivedComment')
+    connection = schema_editor.connection
+
+    for model in (Comment, ArchivedComment):
+        fields = ['content', 'preview', 'content_length'] if model is Comment else ['content']
+        last_pk = 0
+
+        while True:
+            with transaction.atomic(using=connection.alias):
+                rows = read_raw_content(connection, model, last_pk)
+                if not rows:
+                    break
+
+                # Rows compressed by an interrupted earlier run are decoded again.
+                batch = [model(pk=pk, content=CompressedTextField.decode(content)) for pk, content in rows]
+                if model is Comment:
+                    for comment in batch:
+                        comment.preview = comment.content[:200]
+                        comment.content_length = len(comment.content)
+                model.objects.using(connection.alias).bulk_update(batch, fields)
+
+            last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own instead of one long write lock.
+    atomic = False
+
+    dependencies = [
+        ('kanban_app', '0018_comment_preview'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_preview, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0020_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='position',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
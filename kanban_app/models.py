@@ -1,12 +1,56 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.utils import timezone
+
+from kanban_app.fields import CompressedTextField
+
+
+class BoardQuerySet(models.QuerySet):
+
+    def accessible_to(self, user):
+        """
+        Boards the user owns or belongs to, joined against BoardAccess.
+        """
+        return self.filter(access__user=user)
+
+
+class TaskQuerySet(models.QuerySet):
+
+    def accessible_to(self, user):
+        """
+        Tasks on boards the user owns or belongs to, joined against BoardAccess.
+        """
+        return self.filter(board__access__user=user)
+
+
+class ActiveBoardManager(models.Manager.from_queryset(BoardQuerySet)):
+    """
+    Hides boards that are marked as deleted and waiting to be purged.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ActiveTaskManager(models.Manager.from_queryset(TaskQuerySet)):
+    """
+    Hides tasks whose board is marked as deleted and waiting to be purged.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(board__deleted_at__isnull=True)
 
 
 class Board(models.Model):
     title = models.CharField(max_length=255)
     members = models.ManyToManyField(User, related_name='board_members')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='board_owner')
+    # Set when the board is deleted; kanban_app.purge removes the rows later.
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = ActiveBoardManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.title
@@ -56,13 +100,252 @@ class Task(models.Model):
         on_delete=models.CASCADE,
         related_name='tasks_creater',
         null=False)
+    # Denormalized number of comments, maintained by the comment views.
+    comments_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Fractional order key within the (board, status) column, see kanban_app.positions.
+    # Left blank, it is set to the bottom of the column when the task is saved.
+    position = models.CharField(max_length=255, blank=True, default='')
+
+    objects = ActiveTaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        # Back the whitelisted orderings of the task list endpoints.
+        indexes = [
+            models.Index(fields=['status', 'id'], name='task_status_id_idx'),
+            models.Index(fields=['priority', 'id'], name='task_priority_id_idx'),
+            models.Index(fields=['due_date', 'id'], name='task_due_date_id_idx'),
+            # Finds archiving candidates (done and untouched since a cutoff).
+            models.Index(fields=['status', 'updated_at'], name='task_status_updated_idx'),
+            # Returns each board column already in display order.
+            models.Index(fields=['board', 'status', 'position', 'id'], name='task_column_position_idx'),
+        ]
 
     def __str__(self):
       return self.title
+
+    def save(self, *args, **kwargs):
+        if not self.position:
+            from kanban_app.columns import get_end_of_column
+            self.position = get_end_of_column(self.board_id, self.status)
+        super().save(*args, **kwargs)
     
 
 class Comment(models.Model):
+    PREVIEW_LENGTH = 200
+
     task = models.ForeignKey(Task, related_name='comments', on_delete=models.CASCADE)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
-    content = models.TextField()
-    created_at = models.DateField(auto_now_add=True)
+    content = CompressedTextField()
+    # The start of content and its full length, so comment lists can defer content.
+    preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True, default='')
+    content_length = models.PositiveIntegerField(default=0)
+    # A default instead of auto_now_add, so archived comments keep their timestamp on restore.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        # Covers the keyset-paginated comment timeline of a task.
+        indexes = [
+            models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.update_preview()
+        super().save(*args, **kwargs)
+
+    def update_preview(self):
+        """
+        Derive preview and content_length from content. Code that creates
+        comments with bulk_create() has to call this itself.
+        """
+        self.preview = self.content[:self.PREVIEW_LENGTH]
+        self.content_length = len(self.content)
+
+
+class ArchivedTask(models.Model):
+    """
+    Cold storage for done tasks moved out of the Task table by kanban_app.archive.
+    Keeps the original primary key so a restored task gets its old id back.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='archived_tasks')
+    title = models.CharField(max_length=255)
+    description = models.CharField(max_length=255)
+    assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_assigned_tasks')
+    reviewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_reviewed_tasks')
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    priority = models.CharField(max_length=20, choices=Task.PRIORITY_CHOICES)
+    due_date = models.DateField()
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_tasks_creater')
+    comments_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'id'], name='archivedtask_board_id_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """
+    A comment that was archived together with its task.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(ArchivedTask, related_name='comments', on_delete=models.CASCADE)
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_comments')
+    content = CompressedTextField()
+    created_at = models.DateTimeField()
+
+
+class Activity(models.Model):
+    """
+    Append-only audit entry for a board. Written in batches by kanban_app.activity.
+    task_id is a plain column so entries outlive archived or deleted tasks.
+    """
+    VERB_CHOICES = [
+        ('task_status_changed', 'Task status changed'),
+        ('task_reassigned', 'Task reassigned'),
+        ('comment_added', 'Comment added'),
+        ('comment_deleted', 'Comment deleted'),
+        ('member_added', 'Member added'),
+        ('member_removed', 'Member removed'),
+    ]
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='activities')
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='activities')
+    verb = models.CharField(max_length=30, choices=VERB_CHOICES)
+    task_id = models.BigIntegerField(null=True, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Serves the per-board feed, newest first.
+            models.Index(fields=['board', 'id'], name='activity_board_id_idx'),
+            # Serves retention pruning by age.
+            models.Index(fields=['created_at'], name='activity_created_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.verb} on board {self.board_id}'
+
+
+class ShardSequence(models.Model):
+    """
+    Global id counter for sharded mode (see kanban_app.sharding). Boards,
+    tasks and comments draw their ids from here, so ids stay unique when a
+    board moves to another shard. Always stored in the default database.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    last_id = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name}: {self.last_id}'
+
+
+class BoardLocation(models.Model):
+    """
+    Directory entry naming the shard database that holds a board in sharded
+    mode. Always stored in the default database.
+    """
+    board_id = models.BigIntegerField(primary_key=True)
+    shard = models.CharField(max_length=50)
+
+    def __str__(self):
+        return f'Board {self.board_id} → {self.shard}'
+
+
+class BoardAccess(models.Model):
+    """
+    Materialized access list: one row per user who may see a board, either as
+    its owner or as a member. Maintained by kanban_app.access from the owner
+    field and the membership table, so querysets can filter by access in SQL.
+    """
+    ROLE_CHOICES = [
+        ('owner', 'Owner'),
+        ('member', 'Member'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='board_access')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='access')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+
+    class Meta:
+        constraints = [
+            # Doubles as the (user, board) index behind accessible_to().
+            models.UniqueConstraint(fields=['user', 'board'], name='boardaccess_user_board_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} → board {self.board_id} ({self.role})'
+
+
+class BoardSnapshot(models.Model):
+    """
+    Pre-rendered part of the board detail response, kept up to date by
+    kanban_app.snapshots. Holds the serialized member list; the tasks are
+    stored one fragment each in TaskSnapshot.
+    """
+    board = models.OneToOneField(Board, on_delete=models.CASCADE, primary_key=True, related_name='snapshot')
+    members = models.JSONField(default=list)
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Snapshot of board {self.board_id}'
+
+
+class TaskSnapshot(models.Model):
+    """
+    A task as serialized for board detail. status and position are copied
+    from the task so the fragments can be read back in column order.
+    """
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, primary_key=True, related_name='snapshot')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='task_snapshots')
+    status = models.CharField(max_length=20)
+    position = models.CharField(max_length=255)
+    data = models.JSONField()
+
+    class Meta:
+        indexes = [
+            # Returns a board's fragments in the order of Task's column index.
+            models.Index(fields=['board', 'status', 'position', 'task'], name='tasksnapshot_column_idx'),
+        ]
+
+    def __str__(self):
+        return f'Snapshot of task {self.task_id}'
+
+
+class IdempotencyKey(models.Model):
+    """
+    Outcome of a write sent with an Idempotency-Key header, replayed when the
+    same user retries with the same key (see kanban_app.idempotency).
+    Always stored in the default database.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    # Null while the first request with the key is still being processed.
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    # When the request processing the key claimed it; a retry may take over
+    # an unfinished claim older than settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS.
+    locked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotencykey_user_key_uniq'),
+        ]
+        indexes = [
+            # Serves pruning of expired keys.
+            models.Index(fields=['created_at'], name='idempotencykey_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.method} {self.path} ({self.key})'
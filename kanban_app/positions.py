@@ -0,0 +1,116 @@
+"""
+Fractional position keys for ordering tasks within a (board, status) column.
+
+A key is a string over DIGITS read as the digits of a fraction between 0 and
+1, so plain string comparison orders keys. Between any two distinct keys a
+new one can always be generated, which lets a task be moved by rewriting its
+own row only. Keys never end in the smallest digit, so there is always room
+in front of the first key as well.
+"""
+
+# Ascending in ASCII, so the database's binary collation sorts keys correctly.
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+
+def midpoint(a, b):
+    """
+    Return a key strictly between a and b.
+
+    Args:
+        a (str): The lower key, '' for the start of the range.
+        b (str | None): The upper key, None for the end of the range.
+    """
+    if b is not None:
+        # Copy the common prefix, padding a with zero digits.
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+
+    # Adjacent first digits: b's first digit alone works if b continues,
+    # otherwise keep a's first digit and go one level deeper.
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + midpoint(a[1:], None)
+
+
+def shift(key, length, delta):
+    """
+    Read `key`, cut or zero-padded to `length` digits, as an integer in base
+    len(DIGITS), add `delta` and return the result as a key without trailing
+    zero digits.
+    """
+    base = len(DIGITS)
+    value = 0
+    for char in key[:length].ljust(length, DIGITS[0]):
+        value = value * base + DIGITS.index(char)
+    value += delta
+
+    digits = []
+    for _ in range(length):
+        value, digit = divmod(value, base)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip(DIGITS[0])
+
+
+def increment(a):
+    """
+    Return a short key after `a`, for appending.
+
+    `a` is counted up by one in its last digit at a depth of 2 * m + 2, where
+    m is the number of its leading maximal digits, i.e. how close it is to
+    the end of the range. Each such level holds about len(DIGITS) ** (m + 1)
+    keys, so after n appends keys are about 2 * log(n, len(DIGITS)) digits long.
+    """
+    leading = len(a) - len(a.lstrip(DIGITS[-1]))
+    return shift(a, 2 * leading + 2, 1)
+
+
+def decrement(b):
+    """
+    Return a short key before `b`, for prepending; the mirror image of
+    increment(), counting down at a depth set by b's leading zero digits.
+    """
+    leading = len(b) - len(b.lstrip(DIGITS[0]))
+    return shift(b, 2 * leading + 2, -1)
+
+
+def key_between(a=None, b=None):
+    """
+    Return a key that sorts after `a` and before `b`.
+
+    Args:
+        a (str | None): The key of the previous task, None at the top of the column.
+        b (str | None): The key of the next task, None at the bottom of the column.
+
+    Raises:
+        ValueError: If a is not smaller than b.
+    """
+    a = a or ''
+    if b is not None and a >= b:
+        raise ValueError(f'Cannot place a key between {a!r} and {b!r}.')
+
+    if a and b is None:
+        return increment(a)
+    if not a and b is not None:
+        return decrement(b)
+    return midpoint(a, b)
+
+
+def keys_between(a, b, count):
+    """
+    Return `count` ascending, evenly spread keys between a and b.
+    Keys stay short because the range is split recursively.
+    """
+    if count <= 0:
+        return []
+    mid = key_between(a, b)
+    left = (count - 1) // 2
+    return keys_between(a, mid, left) + [mid] + keys_between(mid, b, count - 1 - left)
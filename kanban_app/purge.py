@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.db import transaction
+
+from kanban_app.models import (
+    Activity, ArchivedComment, ArchivedTask, Board, BoardAccess, BoardLocation, BoardSnapshot, Comment, Task,
+    TaskSnapshot,
+)
+from kanban_app.sharding import each_shard, get_db, shard_for_board, use_shard
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete the rows of a queryset, at most `batch_size` per transaction.
+
+    Args:
+        queryset (QuerySet): The rows to delete.
+        batch_size (int): Rows deleted per transaction.
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    model = queryset.model
+    deleted = 0
+
+    while True:
+        with transaction.atomic(using=get_db()):
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            model._base_manager.filter(pk__in=ids).delete()
+        deleted += len(ids)
+
+    return deleted
+
+
+def get_board_rows(board_id):
+    """
+    Return querysets of every row hanging off a board, children first.
+    """
+    return [
+        TaskSnapshot.objects.filter(board_id=board_id),
+        BoardSnapshot.objects.filter(board_id=board_id),
+        Comment.objects.filter(task__board_id=board_id),
+        ArchivedComment.objects.filter(task__board_id=board_id),
+        ArchivedTask.objects.filter(board_id=board_id),
+        Task.all_objects.filter(board_id=board_id),
+        Activity.objects.filter(board_id=board_id),
+        BoardAccess.objects.filter(board_id=board_id),
+        Board.members.through.objects.filter(board_id=board_id),
+    ]
+
+
+def purge_board(board_id, batch_size=None):
+    """
+    Physically delete a board marked as deleted, bottom up: snapshots, comments,
+    archived rows, tasks, activity entries, access rows and memberships in bounded batches, then the
+    board itself and its shard directory entry.
+
+    Nothing is loaded beyond one batch of ids at a time, and no transaction
+    covers more than one batch.
+
+    Args:
+        board_id (int): The board to purge.
+        batch_size (int, optional): Rows per transaction; defaults to settings.KANBAN_PURGE_BATCH_SIZE.
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    if batch_size is None:
+        batch_size = settings.KANBAN_PURGE_BATCH_SIZE
+
+    deleted = 0
+    with use_shard(shard_for_board(board_id)):
+        if not Board.all_objects.filter(pk=board_id, deleted_at__isnull=False).exists():
+            return 0
+        for queryset in get_board_rows(board_id):
+            deleted += delete_in_batches(queryset, batch_size)
+        deleted += delete_in_batches(Board.all_objects.filter(pk=board_id), batch_size)
+
+    BoardLocation.objects.filter(board_id=board_id).delete()
+    return deleted
+
+
+def purge_deleted_boards(batch_size=None):
+    """
+    Purge every board currently marked as deleted, on every shard.
+
+    Returns:
+        int: The number of purged boards.
+    """
+    board_ids = []
+    for alias in each_shard():
+        board_ids += Board.all_objects.filter(deleted_at__isnull=False).values_list('pk', flat=True)
+    for board_id in board_ids:
+        purge_board(board_id, batch_size)
+    return len(board_ids)
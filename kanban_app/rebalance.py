@@ -0,0 +1,96 @@
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from kanban_app.models import Activity, Board, BoardAccess, BoardLocation
+from kanban_app.purge import delete_in_batches, get_board_rows
+from kanban_app.sharding import get_shard_aliases, shard_for_board, use_shard
+
+
+def copy_rows(queryset, source, target, batch_size):
+    """
+    Copy the rows of a queryset from one database to another with plain
+    INSERTs, so no auto_now or default value is re-applied on the way.
+
+    Rows of models whose ids never leave their database (memberships, access
+    rows and activity entries) get fresh ids from the target, everything else
+    keeps its global id.
+
+    Returns:
+        int: The number of copied rows.
+    """
+    model = queryset.model
+    keep_ids = model not in (Board.members.through, BoardAccess, Activity)
+    fields = [field for field in model._meta.concrete_fields if keep_ids or not field.primary_key]
+
+    connection = connections[target]
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+
+    rows = (
+        queryset.using(source)
+        .order_by('pk')
+        .values_list(*[field.attname for field in fields])
+        .iterator(chunk_size=batch_size)
+    )
+    copied = 0
+    with connection.cursor() as cursor:
+        while batch := list(islice(rows, batch_size)):
+            cursor.executemany(sql, [
+                [field.get_db_prep_save(value, connection) for field, value in zip(fields, row)]
+                for row in batch
+            ])
+            copied += len(batch)
+    return copied
+
+
+def move_board(board_id, target, batch_size=None):
+    """
+    Move a board with all its rows to another shard.
+
+    The rows are copied into the target in one transaction, then the shard
+    directory is switched and the source rows are deleted in batches. Writes
+    to the board while it is being copied are lost, so only move idle boards.
+
+    Args:
+        board_id (int): The board to move.
+        target (str): The alias of the target shard.
+        batch_size (int, optional): Rows per statement; defaults to settings.KANBAN_PURGE_BATCH_SIZE.
+
+    Raises:
+        ValueError: If the target is no shard or the board is unknown.
+
+    Returns:
+        int: The number of moved rows.
+    """
+    if batch_size is None:
+        batch_size = settings.KANBAN_PURGE_BATCH_SIZE
+    if target not in get_shard_aliases():
+        raise ValueError(f'"{target}" is not a shard.')
+
+    source = shard_for_board(board_id)
+    if not Board.all_objects.using(source).filter(pk=board_id).exists():
+        raise ValueError(f'Board {board_id} not found.')
+    if source == target:
+        return 0
+
+    board = Board.all_objects.filter(pk=board_id)
+    querysets = [board] + list(reversed(get_board_rows(board_id)))
+
+    moved = 0
+    with transaction.atomic(using=target):
+        for queryset in querysets:
+            moved += copy_rows(queryset, source, target, batch_size)
+
+    BoardLocation.objects.update_or_create(board_id=board_id, defaults={'shard': target})
+
+    with use_shard(source):
+        for queryset in get_board_rows(board_id) + [board]:
+            delete_in_batches(queryset, batch_size)
+
+    return moved
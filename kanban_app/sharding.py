@@ -0,0 +1,323 @@
+"""
+Optional board sharding.
+
+With settings.KANBAN_SHARDS > 0 every board lives, together with its tasks,
+comments, archive rows, activity and memberships, in one of the databases
+shard_0 … shard_<N-1>. Users, tokens, jobs, idempotency keys and the shard
+directory stay in the default database; each shard keeps a read-only replica
+of the user table so foreign keys and member joins resolve inside the shard.
+
+Which shard a query goes to is decided by the current shard of the thread:
+ShardMiddleware sets it from the URL of board, task and comment views, and
+code outside requests uses use_shard() or each_shard(). With sharding off
+every helper here falls back to the default database.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from rest_framework.response import Response
+
+from kanban_app.models import ArchivedTask, BoardLocation, ShardSequence, Task, User
+
+
+# kanban_app models that stay in the default database in sharded mode.
+GLOBAL_MODELS = {'kanban_app.shardsequence', 'kanban_app.boardlocation', 'kanban_app.idempotencykey'}
+
+_local = threading.local()
+
+
+def is_enabled():
+    return settings.KANBAN_SHARDS > 0
+
+
+def get_shard_aliases():
+    """
+    Return the database aliases that hold boards, or just the default database
+    when sharding is off.
+    """
+    if not is_enabled():
+        return [DEFAULT_DB_ALIAS]
+    return [f'shard_{index}' for index in range(settings.KANBAN_SHARDS)]
+
+
+def is_sharded(model):
+    return model._meta.app_label == 'kanban_app' and model._meta.label_lower not in GLOBAL_MODELS
+
+
+def get_current_shard():
+    return getattr(_local, 'shard', None)
+
+
+def get_db():
+    """
+    Return the alias sharded queries currently go to. Pass it to
+    transaction.atomic() and on_commit() so they cover the right database.
+    """
+    return get_current_shard() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_shard(alias):
+    """
+    Route sharded queries inside the block to `alias`.
+    """
+    previous = get_current_shard()
+    _local.shard = alias
+    try:
+        yield alias
+    finally:
+        _local.shard = previous
+
+
+def each_shard(board_id=None):
+    """
+    Iterate the shards, routing queries to each one in turn. With `board_id`
+    only the board's own shard is visited.
+    """
+    aliases = get_shard_aliases() if board_id is None else [shard_for_board(board_id)]
+    for alias in aliases:
+        with use_shard(alias):
+            yield alias
+
+
+def shard_for_board(board_id):
+    """
+    Look up the shard of a board in the directory.
+
+    Returns:
+        str: The alias, or the default database if sharding is off or the board is unknown.
+    """
+    if not is_enabled():
+        return DEFAULT_DB_ALIAS
+    try:
+        board_id = int(board_id)
+    except (TypeError, ValueError):
+        return DEFAULT_DB_ALIAS
+    shard = BoardLocation.objects.filter(board_id=board_id).values_list('shard', flat=True).first()
+    return shard or DEFAULT_DB_ALIAS
+
+
+def find_shard(model, pk):
+    """
+    Return the shard holding the row `pk` of a sharded model, asking each shard
+    by primary key. Tasks are not kept in the directory, so creating and
+    archiving them only ever writes to one database.
+    """
+    if not is_enabled():
+        return DEFAULT_DB_ALIAS
+    for alias in get_shard_aliases():
+        if model._base_manager.using(alias).filter(pk=pk).exists():
+            return alias
+    return DEFAULT_DB_ALIAS
+
+
+SHARD_LOOKUPS = {
+    'board': shard_for_board,
+    'task': lambda pk: find_shard(Task, pk),
+    'archived_task': lambda pk: find_shard(ArchivedTask, pk),
+}
+
+
+def allocate_ids(name, count=1):
+    """
+    Reserve `count` consecutive ids from the global sequence `name`.
+
+    Returns:
+        range: The reserved ids.
+    """
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        ShardSequence.objects.get_or_create(name=name)
+        ShardSequence.objects.filter(name=name).update(last_id=F('last_id') + count)
+        last_id = ShardSequence.objects.filter(name=name).values_list('last_id', flat=True).get()
+    return range(last_id - count + 1, last_id + 1)
+
+
+def place_new_board():
+    """
+    Allocate the id of a new board and register it on the shard chosen from
+    that id (board id modulo the number of shards).
+
+    Returns:
+        tuple: (board id or None when sharding is off, shard alias)
+    """
+    if not is_enabled():
+        return None, DEFAULT_DB_ALIAS
+
+    board_id = allocate_ids('board')[0]
+    aliases = get_shard_aliases()
+    shard = aliases[board_id % len(aliases)]
+    BoardLocation.objects.create(board_id=board_id, shard=shard)
+    return board_id, shard
+
+
+def assign_ids(instances):
+    """
+    Give unsaved tasks or comments a global id before a bulk_create, which
+    bypasses the pre_save hook. Does nothing when sharding is off.
+    """
+    instances = [instance for instance in instances if instance.pk is None]
+    if not is_enabled() or not instances:
+        return
+    ids = allocate_ids(instances[0]._meta.label_lower, len(instances))
+    for instance, pk in zip(instances, ids):
+        instance.pk = pk
+
+
+def assign_global_id(sender, instance, raw=False, **kwargs):
+    """
+    pre_save hook for Task and Comment in sharded mode.
+    """
+    if instance.pk is None and not raw:
+        instance.pk = allocate_ids(sender._meta.label_lower)[0]
+
+
+def copy_users(users, aliases=None):
+    """
+    Insert or refresh the replicas of the given users on the shards.
+    """
+    names = [field.attname for field in User._meta.concrete_fields]
+    for alias in aliases or get_shard_aliases():
+        User.objects.using(alias).bulk_create(
+            [User(**{name: getattr(user, name) for name in names}) for user in users],
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=[name for name in names if name != 'id'],
+        )
+
+
+def replicate_user(sender, instance, using, raw=False, **kwargs):
+    """
+    post_save hook for User: push the saved row to every shard.
+    """
+    if using == DEFAULT_DB_ALIAS and not raw:
+        copy_users([instance])
+
+
+def delete_user_replica(sender, instance, using, **kwargs):
+    """
+    post_delete hook for User. Deleting the replica cascades to the user's
+    tasks and comments inside each shard.
+    """
+    if using == DEFAULT_DB_ALIAS:
+        for alias in get_shard_aliases():
+            User.objects.using(alias).filter(pk=instance.pk).delete()
+
+
+def sync_user_replicas(sender, using, **kwargs):
+    """
+    post_migrate hook: copy all users into a freshly migrated shard.
+    """
+    if using not in get_shard_aliases():
+        return
+    users = User.objects.using(DEFAULT_DB_ALIAS).order_by('pk')
+    batch = []
+    for user in users.iterator(chunk_size=1000):
+        batch.append(user)
+        if len(batch) == 1000:
+            copy_users(batch, [using])
+            batch = []
+    if batch:
+        copy_users(batch, [using])
+
+
+def get_view_shard(view_func, view_kwargs):
+    """
+    Return the shard a view with `shard_lookup` works on, or None.
+    """
+    lookup = getattr(getattr(view_func, 'view_class', None), 'shard_lookup', None)
+    if lookup is None or not is_enabled():
+        return None
+    kind, kwarg = lookup
+    return SHARD_LOOKUPS[kind](view_kwargs[kwarg])
+
+
+class BoardShardRouter:
+    """
+    Database router for sharded mode.
+
+    Sharded models go to the database of the instance they are reached from,
+    otherwise to the current shard. Users are written to the default database
+    only and read from a shard's replica when reached through a sharded row.
+    Every database gets every table, so migrations run unchanged per alias.
+    """
+
+    def db_for_read(self, model, **hints):
+        return self.get_db(model, hints, write=False)
+
+    def db_for_write(self, model, **hints):
+        return self.get_db(model, hints, write=True)
+
+    def get_db(self, model, hints, write):
+        instance = hints.get('instance')
+        instance_db = getattr(getattr(instance, '_state', None), 'db', None)
+        from_shard = instance_db is not None and instance_db != DEFAULT_DB_ALIAS
+
+        if is_sharded(model):
+            return instance_db if from_shard else get_db()
+        if model is User and from_shard and not write:
+            return instance_db
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+class ShardMiddleware:
+    """
+    Sets the current shard for views that declare `shard_lookup`, a pair of
+    (lookup kind, URL kwarg) such as ('task', 'pk'), and clears it afterwards.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            _local.shard = None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _local.shard = get_view_shard(view_func, view_kwargs)
+        return None
+
+
+def sort_like_queryset(objects, ordering):
+    """
+    Sort merged rows the way the database sorted each shard's part,
+    with NULLs first in ascending order like SQLite.
+    """
+    for field in reversed(ordering or ['pk']):
+        name = field.lstrip('-')
+        objects.sort(
+            key=lambda obj: (getattr(obj, name) is not None, getattr(obj, name)),
+            reverse=field.startswith('-')
+        )
+    return objects
+
+
+class CrossShardListMixin:
+    """
+    Lists rows from all shards for list views spanning several boards: the
+    view's queryset runs once per shard and the results are merged in its order.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not is_enabled():
+            return super().list(request, *args, **kwargs)
+
+        objects = []
+        ordering = None
+        for alias in each_shard():
+            queryset = self.filter_queryset(self.get_queryset())
+            ordering = queryset.query.order_by
+            objects.extend(queryset)
+
+        serializer = self.get_serializer(sort_like_queryset(objects, ordering), many=True)
+        return Response(serializer.data)
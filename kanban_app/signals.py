@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+
+# Sent after task rows were changed with update() or bulk_update(), which
+# skip post_save (sender: Task, task_ids: the changed primary keys).
+tasks_changed = Signal()
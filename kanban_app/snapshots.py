@@ -0,0 +1,279 @@
+"""
+Pre-rendered board detail responses.
+
+Every board that has been opened keeps a BoardSnapshot with its serialized
+member list and one TaskSnapshot per task holding the TaskSerializer output.
+Board detail is assembled from these rows instead of serializing every task
+on each request; a write re-renders only the fragments it touched.
+
+Regular ORM saves are followed through signals, bulk task updates send
+kanban_app.signals.tasks_changed, and the membership views call
+refresh_members() themselves. User deletions null or cascade rows without
+any of those, so the affected rows are looked up before and re-rendered
+after the delete. `manage.py check_board_snapshots` compares snapshots
+against live serialization and rebuilds any that drifted.
+
+Snapshots are built by the `kanban.build_board_snapshot` job, queued the
+first time a board without one is opened. Board detail GETs therefore never
+render or store a snapshot themselves; the only write on that path is the
+queued Job row, at most once per settings.BOARD_SNAPSHOT_QUEUE_SECONDS.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, transaction
+from django.db.models import Prefetch, Q
+
+from jobs_app.registry import enqueue
+from kanban_app.api.serializers import BoardDetailReadSerializer, MiniUserSerializer, TaskSerializer
+from kanban_app.models import Board, BoardSnapshot, Task, TaskSnapshot, User
+from kanban_app.sharding import each_shard, get_db
+
+
+logger = logging.getLogger(__name__)
+
+
+# User fields that end up in MiniUserSerializer output.
+RENDERED_USER_FIELDS = {'username', 'email'}
+
+
+def render_members(board_id):
+    """
+    Serialize the members of a board, ordered by id.
+    """
+    users = User.objects.using(get_db()).filter(board_members=board_id).order_by('id')
+    return MiniUserSerializer(users, many=True).data
+
+
+def save_fragments(tasks):
+    """
+    Render the given tasks and insert or replace their fragments.
+
+    Returns:
+        int: The number of fragments written.
+    """
+    tasks = list(tasks)
+    fragments = [
+        TaskSnapshot(task_id=task.pk, board_id=task.board_id, status=task.status, position=task.position, data=data)
+        for task, data in zip(tasks, TaskSerializer(tasks, many=True).data)
+    ]
+    TaskSnapshot.objects.bulk_create(
+        fragments,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['task'],
+        update_fields=['board', 'status', 'position', 'data'],
+    )
+    return len(fragments)
+
+
+def build_board_snapshot(board):
+    """
+    Render the whole board: its member list and a fragment for every task.
+
+    The snapshot row is written before any task is read. That takes the
+    database write lock, so a concurrent task write either committed before
+    and is rendered here, or waits for this transaction and then finds the
+    snapshot in refresh_tasks(). Rendering first would let such a write skip
+    the board and leave its fragment stale.
+
+    Returns:
+        BoardSnapshot: The stored snapshot.
+    """
+    with transaction.atomic(using=get_db()):
+        snapshot, _ = BoardSnapshot.objects.update_or_create(
+            board=board,
+            defaults={'members': render_members(board.pk)}
+        )
+        save_fragments(Task.objects.filter(board=board))
+    return snapshot
+
+
+def render_board(board):
+    """
+    Serialize a board detail response live, members ordered by id like in a snapshot.
+    """
+    tasks = Task.objects.order_by('status', 'position', 'id')
+    board = Board.objects.prefetch_related('members', Prefetch('tasks', queryset=tasks)).get(pk=board.pk)
+    data = dict(BoardDetailReadSerializer(board).data)
+    data['members'] = sorted(data['members'], key=lambda user: user['id'])
+    return data
+
+
+def queue_snapshot(board_id):
+    """
+    Queue a background build of a board's snapshot, at most once per
+    settings.BOARD_SNAPSHOT_QUEUE_SECONDS. Failing to queue (e.g. on a
+    read-only database) only means the board is served live a while longer.
+    """
+    if not cache.add(f'board-snapshot-queued:{board_id}', True, settings.BOARD_SNAPSHOT_QUEUE_SECONDS):
+        return
+    try:
+        enqueue('kanban.build_board_snapshot', {'board_id': board_id})
+    except DatabaseError:
+        logger.warning('Could not queue the snapshot of board %s', board_id, exc_info=True)
+
+
+def get_board_detail(board):
+    """
+    Assemble the board detail response from the stored fragments. Boards
+    without a snapshot yet are serialized live and get one built in the background.
+
+    Returns:
+        dict: The same data BoardDetailReadSerializer produces.
+    """
+    try:
+        snapshot = board.snapshot
+    except BoardSnapshot.DoesNotExist:
+        queue_snapshot(board.pk)
+        return render_board(board)
+
+    tasks = (
+        TaskSnapshot.objects.filter(board=board)
+        .order_by('status', 'position', 'task')
+        .values_list('data', flat=True)
+    )
+    return {
+        'id': board.pk,
+        'title': board.title,
+        'owner_id': board.owner_id,
+        'members': snapshot.members,
+        'tasks': list(tasks),
+    }
+
+
+def refresh_tasks(task_ids):
+    """
+    Re-render the fragments of the given tasks, skipping boards without a snapshot.
+    """
+    if not task_ids:
+        return 0
+    return save_fragments(Task.objects.filter(pk__in=task_ids, board__snapshot__isnull=False))
+
+
+def refresh_members(board_id):
+    """
+    Re-render the member list of a board if it has a snapshot.
+    """
+    BoardSnapshot.objects.filter(board_id=board_id).update(members=render_members(board_id))
+
+
+def task_saved(sender, instance, raw=False, **kwargs):
+    """
+    post_save hook for Task.
+    """
+    if not raw:
+        refresh_tasks([instance.pk])
+
+
+def tasks_changed(sender, task_ids, **kwargs):
+    """
+    Receiver of kanban_app.signals.tasks_changed.
+    """
+    refresh_tasks(list(task_ids))
+
+
+def members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    m2m_changed hook for Board.members, from either side of the relation.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        refresh_members(instance.pk)
+    elif pk_set:
+        for board_id in pk_set:
+            refresh_members(board_id)
+
+
+def find_user_rows(user_id):
+    """
+    Return the snapshot rows on every shard that show a user.
+
+    Returns:
+        dict: alias → (ids of tasks assigned to or reviewed by the user, ids of boards it is a member of)
+    """
+    rows = {}
+    for alias in each_shard():
+        task_ids = (
+            Task.objects.filter(Q(assigned_to=user_id) | Q(reviewer=user_id), board__snapshot__isnull=False)
+            .values_list('pk', flat=True)
+        )
+        board_ids = BoardSnapshot.objects.filter(board__members=user_id).values_list('board_id', flat=True)
+        rows[alias] = (list(task_ids), list(board_ids))
+    return rows
+
+
+def refresh_user_rows(rows):
+    """
+    Re-render the rows found by find_user_rows().
+    """
+    for alias in each_shard():
+        task_ids, board_ids = rows.get(alias, ([], []))
+        refresh_tasks(task_ids)
+        for board_id in board_ids:
+            refresh_members(board_id)
+
+
+def user_saved(sender, instance, using, raw=False, update_fields=None, **kwargs):
+    """
+    post_save hook for User: re-render the fragments and member lists that
+    show the user, unless only unrendered fields (like last_login) changed.
+    """
+    if raw or using != DEFAULT_DB_ALIAS:
+        return
+    if update_fields is not None and not RENDERED_USER_FIELDS & set(update_fields):
+        return
+    refresh_user_rows(find_user_rows(instance.pk))
+
+
+def user_deleting(sender, instance, using, **kwargs):
+    """
+    pre_delete hook for User: note the rows that show the user. The delete
+    clears assignee and reviewer with SET_NULL updates and drops memberships
+    in a cascade, none of which sends post_save or m2m_changed.
+    """
+    if using == DEFAULT_DB_ALIAS:
+        instance._snapshot_rows = find_user_rows(instance.pk)
+
+
+def user_deleted(sender, instance, using, **kwargs):
+    """
+    post_delete hook for User: re-render the rows noted by user_deleting().
+    """
+    rows = getattr(instance, '_snapshot_rows', None)
+    if using == DEFAULT_DB_ALIAS and rows:
+        refresh_user_rows(rows)
+
+
+def find_differences(board):
+    """
+    Compare a board's snapshot against live serialization.
+
+    Returns:
+        list: Descriptions of every difference; empty if the snapshot is current
+        or the board has none.
+    """
+    if not BoardSnapshot.objects.filter(board=board).exists():
+        return []
+
+    live = render_board(board)
+    stored = get_board_detail(Board.objects.select_related('snapshot').get(pk=board.pk))
+
+    differences = []
+    if live['members'] != stored['members']:
+        differences.append('members')
+
+    live_tasks = {task['id']: task for task in live['tasks']}
+    stored_tasks = {task['id']: task for task in stored['tasks']}
+    for task_id in sorted(live_tasks.keys() | stored_tasks.keys()):
+        if task_id not in stored_tasks:
+            differences.append(f'task {task_id} missing')
+        elif task_id not in live_tasks:
+            differences.append(f'task {task_id} stale')
+        elif live_tasks[task_id] != stored_tasks[task_id]:
+            differences.append(f'task {task_id} changed')
+    if not differences and [task['id'] for task in live['tasks']] != [task['id'] for task in stored['tasks']]:
+        differences.append('task order')
+    return differences
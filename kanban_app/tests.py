@@ -1,3 +1,991 @@
-from django.test import TestCase
+import datetime
+import importlib
+import random
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jobs_app.models import Job
+from kanban_app import activity, snapshots, user_directory
+from kanban_app.admin import EstimatedCountPaginator
+from kanban_app.api.serializers import TaskSerializer
+from kanban_app.api.views import DashboardView, TaskViewSet
+from kanban_app.columns import move_task
+from kanban_app.jobs import build_board_snapshot_job, purge_board_job
+from kanban_app.fields import CompressedTextField
+from kanban_app.models import (
+    Activity, ArchivedComment, ArchivedTask, Board, BoardAccess, BoardLocation, BoardSnapshot, Comment,
+    IdempotencyKey, Task
+)
+from kanban_app.positions import DIGITS, key_between, keys_between
+from kanban_app.sharding import get_db, get_shard_aliases, shard_for_board, use_shard
+from kanban_app.snapshots import find_differences, render_board
+
+
+class KanbanTestCase(TestCase):
+    """
+    Creates two users and a board through the API, so the board lands on
+    its shard when sharding is enabled.
+    """
+    databases = '__all__'
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw')
+        self.other = User.objects.create_user('bob', 'bob@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.board_id = self.create_board('Board', members=[self.other.pk])
+
+    def create_board(self, title, members=()):
+        response = self.client.post('/api/boards/', {'title': title, 'members': list(members)}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+    def create_task(self, title='Task', **fields):
+        data = {
+            'board': self.board_id, 'title': title, 'description': 'd', 'status': 'todo',
+            'priority': 'medium', 'assignee_id': self.user.pk, 'due_date': '2025-01-01',
+        }
+        data.update(fields)
+        response = self.client.post('/api/tasks/', data, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+    def create_comment(self, task_id, content='Comment'):
+        response = self.client.post(f'/api/tasks/{task_id}/comments/', {'content': content}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+    def shard(self):
+        return use_shard(shard_for_board(self.board_id))
+
+
+class TaskListQueryTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ids = [
+            self.create_task(f'Task {i}', status=['todo', 'done'][i % 2], priority=['low', 'high', 'medium'][i % 3],
+                             due_date=f'2025-01-0{i + 1}')
+            for i in range(5)
+        ]
+
+    def test_filters_and_ordering(self):
+        response = self.client.get('/api/tasks/?status=todo&ordering=-due_date')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([task['id'] for task in response.json()], [self.ids[4], self.ids[2], self.ids[0]])
+
+        response = self.client.get('/api/tasks/assigned-to-me/?due_after=2025-01-02&due_before=2025-01-03')
+        self.assertEqual([task['id'] for task in response.json()], self.ids[1:3])
+
+        response = self.client.get(f'/api/tasks/?board={self.board_id}&priority=high')
+        self.assertEqual([task['id'] for task in response.json()], [self.ids[1], self.ids[4]])
+
+    def test_sparse_fieldsets(self):
+        response = self.client.get('/api/tasks/?fields=id,title')
+        self.assertEqual(response.json()[0], {'id': self.ids[0], 'title': 'Task 0'})
+
+        # Writes always return the full representation.
+        response = self.client.post('/api/tasks/?fields=id', {
+            'board': self.board_id, 'title': 'New', 'description': 'd', 'due_date': '2025-02-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertIn('title', response.json())
+
+    def test_invalid_parameters_are_rejected(self):
+        for query in ['status=nope', 'ordering=title', 'fields=bogus', 'due_before=tomorrow']:
+            self.assertEqual(self.client.get(f'/api/tasks/?{query}').status_code, 400, query)
+
+
+class DashboardTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        today = timezone.localdate()
+        end_of_week = today + datetime.timedelta(days=6 - today.weekday())
+        yesterday = today - datetime.timedelta(days=1)
+        for status, priority, due_date, assignee, reviewer in [
+            ('todo', 'high', yesterday, self.user, None),
+            ('done', 'low', yesterday, self.user, self.user),
+            ('in_progress', 'medium', today, self.other, self.user),
+            ('review', 'medium', end_of_week, self.user, None),
+            ('todo', 'low', end_of_week + datetime.timedelta(days=1), self.other, None),
+        ]:
+            reviewer_field = {'reviewer_id': reviewer.pk} if reviewer else {}
+            self.create_task(status=status, priority=priority, due_date=due_date.isoformat(), assignee_id=assignee.pk,
+                             **reviewer_field)
+
+        # Neither a deleted board nor a board the user is not on is counted.
+        deleted_id = self.create_board('Deleted')
+        self.create_task(board=deleted_id, due_date=yesterday.isoformat())
+        self.assertEqual(self.client.delete(f'/api/boards/{deleted_id}/').status_code, 204)
+
+        self.other_client = APIClient()
+        self.other_client.force_authenticate(self.other)
+        response = self.other_client.post('/api/boards/', {'title': 'Private', 'members': []}, format='json')
+        response = self.other_client.post('/api/tasks/', {
+            'board': response.json()['id'], 'title': 'Private', 'description': 'd', 'status': 'todo',
+            'priority': 'high', 'assignee_id': self.other.pk, 'due_date': yesterday.isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_counts_tasks_of_accessible_boards(self):
+        response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'tasks_by_status': {'todo': 2, 'in_progress': 1, 'review': 1, 'done': 1},
+            'tasks_by_priority': {'low': 2, 'medium': 2, 'high': 1},
+            'overdue_count': 1,
+            'due_this_week_count': 2,
+            'assigned_to_me_count': 3,
+            'reviewing_count': 2,
+        })
+
+    def test_cached_per_user(self):
+        self.assertEqual(self.client.get('/api/dashboard/').json()['overdue_count'], 1)
+        self.create_task(due_date='2000-01-01', assignee_id=self.other.pk)
+
+        # Alice gets her cached result, Bob his own counts including the new task.
+        self.assertEqual(self.client.get('/api/dashboard/').json()['overdue_count'], 1)
+        data = self.other_client.get('/api/dashboard/').json()
+        self.assertEqual(
+            (data['overdue_count'], data['tasks_by_priority']['high'], data['assigned_to_me_count'], data['reviewing_count']),
+            (3, 2, 4, 0)
+        )
+
+
+class CommentTimelineTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task_id = self.create_task()
+        self.ids = [self.create_comment(self.task_id, f'Comment {i}') for i in range(7)]
+
+    def read_timeline(self, page_size):
+        seen = []
+        url = f'/api/tasks/{self.task_id}/comments/?page_size={page_size}'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            seen += [comment['id'] for comment in response.json()['results']]
+            url = response.json()['next']
+        return seen
+
+    def test_pages_follow_the_keyset_newest_first(self):
+        self.assertEqual(self.read_timeline(3), self.ids[::-1])
+
+    def test_equal_timestamps_are_ordered_by_id(self):
+        with self.shard():
+            created_at = Comment.objects.get(pk=self.ids[0]).created_at
+            Comment.objects.filter(task_id=self.task_id).update(created_at=created_at)
+        self.assertEqual(self.read_timeline(2), self.ids[::-1])
+
+    def test_new_comments_do_not_shift_later_pages(self):
+        first = self.client.get(f'/api/tasks/{self.task_id}/comments/?page_size=3').json()
+        self.create_comment(self.task_id, 'Newer')
+        second = self.client.get(first['next']).json()
+        self.assertEqual([comment['id'] for comment in second['results']], self.ids[3:0:-1])
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ['zz', 'bm90LWEtY3Vyc29y']:
+            response = self.client.get(f'/api/tasks/{self.task_id}/comments/?cursor={cursor}')
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class CommentsCountTests(KanbanTestCase):
+    def comments_count(self, task_id):
+        tasks = self.client.get('/api/tasks/?fields=id,comments_count').json()
+        return next(task['comments_count'] for task in tasks if task['id'] == task_id)
+
+    def test_counter_follows_comment_writes(self):
+        task_id, other_id = self.create_task(), self.create_task()
+        comment_ids = [self.create_comment(task_id) for _ in range(3)]
+        self.assertEqual(self.comments_count(task_id), 3)
+
+        response = self.client.delete(f'/api/tasks/{task_id}/comments/{comment_ids[0]}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual((self.comments_count(task_id), self.comments_count(other_id)), (2, 0))
+
+    def test_repair_command_fixes_drifted_counters(self):
+        task_id, other_id = self.create_task(), self.create_task()
+        self.create_comment(task_id)
+        with self.shard():
+            Task.objects.filter(board_id=self.board_id).update(comments_count=9)
+
+        call_command('repair_comments_count', batch_size=1, stdout=StringIO())
+        self.assertEqual((self.comments_count(task_id), self.comments_count(other_id)), (1, 0))
+
+
+class ArchiveTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ids = [self.create_task(f'Task {i}', status=['todo', 'done'][i % 2]) for i in range(5)]
+        self.done = self.ids[1::2]
+        for task_id in self.done:
+            self.create_comment(task_id)
+        with self.shard():
+            self.comment_times = dict(Comment.objects.filter(task_id__in=self.done).values_list('task_id', 'created_at'))
+            Task.objects.filter(pk__in=self.done).update(updated_at=timezone.now() - datetime.timedelta(days=100))
+
+    def board_task_ids(self):
+        return sorted(task['id'] for task in self.client.get(f'/api/boards/{self.board_id}/').json()['tasks'])
+
+    def test_old_done_tasks_are_archived_with_comments(self):
+        call_command('archive_tasks', batch_size=1, stdout=StringIO())
+        self.assertEqual(self.board_task_ids(), self.ids[0::2])
+        with self.shard():
+            self.assertEqual(sorted(ArchivedTask.objects.values_list('id', flat=True)), self.done)
+            self.assertEqual(ArchivedComment.objects.count(), 2)
+
+        response = self.client.get(f'/api/boards/{self.board_id}/archived-tasks/?page_size=1')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertIsNotNone(response.json()['next'])
+
+    def test_recent_done_tasks_stay(self):
+        call_command('archive_tasks', days=101, stdout=StringIO())
+        self.assertEqual(self.board_task_ids(), self.ids)
+
+    def test_restore_keeps_id_comments_and_timestamps(self):
+        call_command('archive_tasks', stdout=StringIO())
+        task_id = self.done[0]
+        response = self.client.post(f'/api/archived-tasks/{task_id}/restore/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual((response.json()['id'], response.json()['comments_count']), (task_id, 1))
+
+        self.assertEqual(self.board_task_ids(), sorted(self.ids[0::2] + [task_id]))
+        with self.shard():
+            self.assertEqual(Comment.objects.get(task_id=task_id).created_at, self.comment_times[task_id])
+            self.assertEqual(list(ArchivedTask.objects.values_list('id', flat=True)), [self.done[1]])
+
+
+class ActivityTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task_id = self.create_task()
+        self.alias = shard_for_board(self.board_id)
+        activity.get_buffer().clear()
+        self.addCleanup(activity.get_buffer().clear)
+
+    def add_entries(self, *ages_in_days):
+        now = timezone.now()
+        with self.shard():
+            return [
+                Activity.objects.create(board_id=self.board_id, verb='comment_added', actor=self.user,
+                                        created_at=now - datetime.timedelta(days=days)).pk
+                for days in ages_in_days
+            ]
+
+    def test_committed_events_are_written_in_one_insert(self):
+        with self.captureOnCommitCallbacks(execute=True, using=self.alias):
+            self.create_comment(self.task_id, 'First')
+            self.create_comment(self.task_id, 'Second')
+            self.assertEqual(activity.get_buffer(), [])
+        self.assertEqual(len(activity.get_buffer()), 2)
+
+        with self.assertNumQueries(1, using=self.alias):
+            self.assertEqual(activity.flush(), 2)
+        with self.shard():
+            self.assertEqual(list(Activity.objects.values_list('verb', flat=True)), ['comment_added'] * 2)
+
+    def test_rolled_back_events_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True, using=self.alias):
+            with self.assertRaises(RuntimeError), self.shard(), transaction.atomic(using=self.alias):
+                activity.record(self.board_id, 'member_added', actor=self.user, user_id=self.other.pk)
+                raise RuntimeError
+        self.assertEqual(activity.flush(), 0)
+        with self.shard():
+            self.assertFalse(Activity.objects.exists())
+
+    def test_feed_is_paginated_for_members_only(self):
+        ids = self.add_entries(0, 0, 0)
+
+        first = self.client.get(f'/api/boards/{self.board_id}/activity/', {'page_size': 2}).json()
+        self.assertEqual([entry['id'] for entry in first['results']], ids[:0:-1])
+        self.assertEqual(first['results'][0]['actor']['id'], self.user.pk)
+        second = self.client.get(first['next']).json()
+        self.assertEqual([entry['id'] for entry in second['results']], ids[:1])
+        self.assertIsNone(second['next'])
+
+        stranger = APIClient()
+        stranger.force_authenticate(User.objects.create_user('carl', 'carl@example.com', 'pw'))
+        self.assertEqual(stranger.get(f'/api/boards/{self.board_id}/activity/').status_code, 403)
+
+    def test_prune_drops_entries_past_retention(self):
+        recent, _ = self.add_entries(10, 181)
+
+        out = StringIO()
+        call_command('prune_activity', stdout=out)
+        self.assertIn('Deleted 1 activity entries.', out.getvalue())
+        with self.shard():
+            self.assertEqual(list(Activity.objects.values_list('id', flat=True)), [recent])
+
+        call_command('prune_activity', days=5, batch_size=1, stdout=StringIO())
+        with self.shard():
+            self.assertFalse(Activity.objects.exists())
+
+
+class BoardMembersTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.carl = User.objects.create_user('carl', 'carl@example.com', 'pw')
+        self.url = f'/api/boards/{self.board_id}/members/'
+
+    def test_add_writes_only_new_members(self):
+        response = self.client.post(self.url, {'user_ids': [self.other.pk], 'emails': ['carl@example.com']}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), {'added': [self.carl.pk], 'member_count': 3})
+
+        carl = APIClient()
+        carl.force_authenticate(self.carl)
+        self.assertEqual(carl.get(f'/api/boards/{self.board_id}/').status_code, 200)
+
+    def test_remove_members(self):
+        self.client.post(self.url, {'user_ids': [self.carl.pk]}, format='json')
+        response = self.client.delete(self.url, {'user_ids': [self.carl.pk, self.other.pk]}, format='json')
+        self.assertEqual(response.json(), {'removed': [self.other.pk, self.carl.pk], 'member_count': 1})
+
+        other = APIClient()
+        other.force_authenticate(self.other)
+        self.assertEqual(other.get(f'/api/boards/{self.board_id}/').status_code, 403)
+
+    def test_invalid_batches_are_rejected(self):
+        for data in [{}, {'emails': ['nobody@example.com']}, {'user_ids': [999999]}]:
+            self.assertEqual(self.client.post(self.url, data, format='json').status_code, 400, data)
+        self.assertEqual(self.client.delete(self.url, {'user_ids': [self.user.pk]}, format='json').status_code, 400)
+        self.assertEqual(len(self.client.get(f'/api/boards/{self.board_id}/').json()['members']), 2)
+
+    def test_non_members_cannot_change_members(self):
+        carl = APIClient()
+        carl.force_authenticate(self.carl)
+        self.assertEqual(carl.post(self.url, {'user_ids': [self.carl.pk]}, format='json').status_code, 403)
+
+
+class BoardDeletionTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task_ids = [self.create_task(f'Task {i}') for i in range(3)]
+        self.comment_id = self.create_comment(self.task_ids[0])
+        self.other_board_id = self.create_board('Other')
+
+    def test_deleted_board_disappears_at_once(self):
+        self.assertEqual(self.client.delete(f'/api/boards/{self.board_id}/').status_code, 204)
+
+        self.assertEqual(self.client.get(f'/api/boards/{self.board_id}/').status_code, 404)
+        self.assertEqual([board['id'] for board in self.client.get('/api/boards/').json()], [self.other_board_id])
+        self.assertEqual(self.client.get('/api/tasks/').json(), [])
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task_ids[0]}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task_ids[0]}/comments/{self.comment_id}/').status_code, 404)
+
+        job = Job.objects.get(name='kanban.purge_board')
+        self.assertEqual(job.payload, {'board_id': self.board_id})
+        with self.shard():
+            self.assertEqual(Task.all_objects.filter(board_id=self.board_id).count(), 3)
+
+    @override_settings(KANBAN_PURGE_BATCH_SIZE=2)
+    def test_purge_removes_rows_in_batches(self):
+        self.client.delete(f'/api/boards/{self.board_id}/')
+        purge_board_job(self.board_id)
+
+        with self.shard():
+            self.assertFalse(Board.all_objects.filter(pk=self.board_id).exists())
+            self.assertFalse(Task.all_objects.filter(board_id=self.board_id).exists())
+            self.assertFalse(Comment.objects.filter(pk=self.comment_id).exists())
+            self.assertFalse(Board.members.through.objects.filter(board_id=self.board_id).exists())
+        self.assertEqual(self.client.get(f'/api/boards/{self.other_board_id}/').status_code, 200)
+
+
+@skipUnless(settings.KANBAN_SHARDS, 'Sharding is off (set KANBAN_SHARDS).')
+class ShardingTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.board_ids = [self.board_id] + [self.create_board(f'Board {i}') for i in range(len(get_shard_aliases()))]
+
+    def test_boards_are_spread_by_id(self):
+        aliases = get_shard_aliases()
+        for board_id in self.board_ids:
+            shard = shard_for_board(board_id)
+            self.assertEqual(shard, aliases[board_id % len(aliases)])
+            self.assertEqual(
+                [alias for alias in aliases if Board.objects.using(alias).filter(pk=board_id).exists()], [shard]
+            )
+        self.assertEqual({shard_for_board(board_id) for board_id in self.board_ids}, set(aliases))
+
+    def test_users_are_replicated_to_every_shard(self):
+        carl = User.objects.create_user('carl', 'carl@example.com', 'pw')
+        carl.first_name = 'Carl'
+        carl.save()
+        for alias in get_shard_aliases():
+            self.assertEqual(User.objects.using(alias).get(pk=carl.pk).first_name, 'Carl')
+
+    def test_lists_merge_all_shards(self):
+        task_ids = []
+        for index, board_id in enumerate(self.board_ids):
+            task_ids.append(self.create_task(f'Task {index}', board=board_id, due_date=f'2025-01-0{index + 1}'))
+        self.assertEqual(len(set(task_ids)), len(task_ids))
+
+        response = self.client.get('/api/tasks/?ordering=-due_date')
+        self.assertEqual([task['id'] for task in response.json()], task_ids[::-1])
+        response = self.client.get('/api/boards/')
+        self.assertEqual(sorted(board['id'] for board in response.json()), sorted(self.board_ids))
+
+    def test_move_board_keeps_it_reachable(self):
+        task_id = self.create_task()
+        comment_id = self.create_comment(task_id)
+        source = shard_for_board(self.board_id)
+        target = next(alias for alias in get_shard_aliases() if alias != source)
+
+        call_command('move_board', self.board_id, target, stdout=StringIO())
+        self.assertEqual(BoardLocation.objects.get(board_id=self.board_id).shard, target)
+        self.assertFalse(Task.all_objects.using(source).filter(board_id=self.board_id).exists())
+
+        response = self.client.get(f'/api/boards/{self.board_id}/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([task['id'] for task in response.json()['tasks']], [task_id])
+        self.assertEqual(self.client.get(f'/api/tasks/{task_id}/comments/{comment_id}/').status_code, 200)
+
+
+class BoardAccessTests(KanbanTestCase):
+    def access_rows(self):
+        with self.shard():
+            return sorted(BoardAccess.objects.filter(board_id=self.board_id).values_list('user_id', 'role'))
+
+    def test_rows_follow_owner_and_members(self):
+        self.assertEqual(self.access_rows(), [(self.user.pk, 'owner'), (self.other.pk, 'member')])
+        carl = User.objects.create_user('carl', 'carl@example.com', 'pw')
+
+        with self.shard():
+            board = Board.objects.get(pk=self.board_id)
+            board.members.add(carl)
+            board.members.remove(self.other)
+            self.assertEqual(self.access_rows(), [(self.user.pk, 'owner'), (carl.pk, 'member')])
+
+            # The previous owner stays in the membership table.
+            board.owner = carl
+            board.save()
+            self.assertEqual(self.access_rows(), [(self.user.pk, 'member'), (carl.pk, 'owner')])
+
+    def test_lists_only_show_accessible_boards(self):
+        stranger = User.objects.create_user('carl', 'carl@example.com', 'pw')
+        client = APIClient()
+        client.force_authenticate(stranger)
+        foreign_board = client.post('/api/boards/', {'title': 'Foreign', 'members': []}, format='json').json()['id']
+        client.post('/api/tasks/', {
+            'board': foreign_board, 'title': 'Foreign', 'description': 'd', 'due_date': '2025-01-01',
+        }, format='json')
+        task_id = self.create_task()
+
+        self.assertEqual([board['id'] for board in self.client.get('/api/boards/').json()], [self.board_id])
+        self.assertEqual([task['id'] for task in self.client.get('/api/tasks/').json()], [task_id])
+        self.assertEqual(self.client.get(f'/api/boards/{foreign_board}/').status_code, 403)
+
+    def test_reconcile_command_repairs_drift(self):
+        with self.shard():
+            BoardAccess.objects.filter(board_id=self.board_id).delete()
+        call_command('reconcile_board_access', stdout=StringIO())
+        self.assertEqual(self.access_rows(), [(self.user.pk, 'owner'), (self.other.pk, 'member')])
+
+
+class BatchTests(KanbanTestCase):
+    def test_sub_requests_run_in_order(self):
+        task_id = self.create_task()
+        self.create_comment(task_id)
+        paths = [
+            f'/api/boards/{self.board_id}/', '/api/tasks/assigned-to-me/?fields=id',
+            f'/api/tasks/{task_id}/comments/', '/api/nope/', 'tasks/999999/',
+        ]
+        response = self.client.post('/api/batch/', {'requests': [{'path': path} for path in paths]}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        responses = response.json()['responses']
+        self.assertEqual([(entry['path'], entry['status']) for entry in responses],
+                         list(zip(paths, [200, 200, 200, 404, 404])))
+        self.assertEqual(responses[0]['body'], self.client.get(paths[0]).json())
+        self.assertEqual(responses[1]['body'], [{'id': task_id}])
+        self.assertEqual(len(responses[2]['body']['results']), 1)
+
+    def test_sub_requests_check_access(self):
+        carl = User.objects.create_user('carl', 'carl@example.com', 'pw')
+        client = APIClient()
+        client.force_authenticate(carl)
+        response = client.post('/api/batch/', {'requests': [{'path': f'/api/boards/{self.board_id}/'}]}, format='json')
+        self.assertEqual(response.json()['responses'][0]['status'], 403)
+
+    def test_failing_sub_request_only_fails_its_entry(self):
+        paths = ['/api/dashboard/', f'/api/boards/{self.board_id}/']
+        with mock.patch.object(DashboardView, 'get', side_effect=RuntimeError('boom')):
+            with self.assertLogs('kanban_app.api.views', 'ERROR') as logs:
+                response = self.client.post('/api/batch/', {'requests': [{'path': path} for path in paths]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual([entry['status'] for entry in responses], [500, 200])
+        self.assertEqual(responses[0]['body'], {'detail': 'A server error occurred.'})
+        self.assertIn('/api/dashboard/', logs.output[0])
+
+    def test_invalid_batches_are_rejected(self):
+        for requests in [[], [{'method': 'POST', 'path': '/api/tasks/'}]]:
+            response = self.client.post('/api/batch/', {'requests': requests}, format='json')
+            self.assertEqual(response.status_code, 400, requests)
+        response = APIClient().post('/api/batch/', {'requests': [{'path': '/api/boards/'}]}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+
+class BoardCloneTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task_ids = [
+            self.create_task(f'Task {i}', status=['todo', 'review'][i % 2], assignee_id=self.other.pk,
+                             reviewer_id=self.other.pk)
+            for i in range(5)
+        ]
+        for task_id in self.task_ids[:2]:
+            self.create_comment(task_id)
+
+    def clone(self, **options):
+        response = self.client.post(f'/api/boards/{self.board_id}/clone/', options, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def tasks(self, board_id):
+        with use_shard(shard_for_board(board_id)):
+            return list(
+                Task.objects.filter(board_id=board_id).order_by('status', 'position')
+                .values_list('id', 'title', 'status', 'position', 'assigned_to_id', 'author_id', 'comments_count')
+            )
+
+    def test_clone_without_members_drops_their_assignments(self):
+        data = self.clone(title='Copy')
+        self.assertEqual((data['title'], data['copied']), ('Copy', {'members': 1, 'tasks': 5, 'comments': 0}))
+
+        source, copy = self.tasks(self.board_id), self.tasks(data['id'])
+        self.assertEqual([row[1:4] for row in copy], [row[1:4] for row in source])
+        self.assertEqual({row[4:] for row in copy}, {(None, self.user.pk, 0)})
+        self.assertTrue(set(row[0] for row in copy).isdisjoint(self.task_ids))
+
+        other = APIClient()
+        other.force_authenticate(self.other)
+        self.assertEqual(other.get(f'/api/boards/{data["id"]}/').status_code, 403)
+
+    @override_settings(KANBAN_CLONE_BATCH_SIZE=2)
+    def test_clone_with_members_and_comments(self):
+        data = self.clone(members=True, comments=True)
+        self.assertEqual(data['copied'], {'members': 2, 'tasks': 5, 'comments': 2})
+
+        copy = self.tasks(data['id'])
+        self.assertEqual({row[4] for row in copy}, {self.other.pk})
+        with use_shard(shard_for_board(data['id'])):
+            comments = Comment.objects.filter(task__board_id=data['id'])
+            self.assertEqual(sorted(comment.task.title for comment in comments), ['Task 0', 'Task 1'])
+        self.assertEqual(sorted(row[6] for row in copy), [0, 0, 0, 1, 1])
+        self.assertEqual(len(self.tasks(self.board_id)), 5)
+
+    def test_invalid_clones_are_rejected(self):
+        response = self.client.post(f'/api/boards/{self.board_id}/clone/', {'tasks': False, 'comments': True}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        carl = User.objects.create_user('carl', 'carl@example.com', 'pw')
+        client = APIClient()
+        client.force_authenticate(carl)
+        self.assertEqual(client.post(f'/api/boards/{self.board_id}/clone/', {}, format='json').status_code, 403)
+
+
+class PositionKeyTests(TestCase):
+    def test_appended_keys_grow_logarithmically(self):
+        key = None
+        for _ in range(10000):
+            new = key_between(key, None)
+            self.assertTrue(key is None or new > key)
+            key = new
+        self.assertLessEqual(len(key), 4)
+
+    def test_prepended_keys_grow_logarithmically(self):
+        key = None
+        for _ in range(10000):
+            new = key_between(None, key)
+            self.assertTrue(key is None or new < key)
+            key = new
+        self.assertLessEqual(len(key), 4)
+
+    def test_random_inserts_stay_ordered(self):
+        rng = random.Random(0)
+        keys = []
+        for _ in range(2000):
+            index = rng.randint(0, len(keys))
+            before = keys[index - 1] if index else None
+            after = keys[index] if index < len(keys) else None
+            keys.insert(index, key_between(before, after))
+        self.assertEqual(keys, sorted(set(keys)))
+        self.assertFalse(any(key.endswith(DIGITS[0]) for key in keys))
+
+    def test_keys_between_spreads_evenly(self):
+        keys = keys_between('1', '2', 100)
+        self.assertEqual(keys, sorted(set(keys)))
+        self.assertTrue(all('1' < key < '2' for key in keys))
+
+    def test_key_between_rejects_unordered_bounds(self):
+        with self.assertRaises(ValueError):
+            key_between('b', 'a')
+        with self.assertRaises(ValueError):
+            key_between('a', 'a')
+
+
+class ColumnTests(KanbanTestCase):
+    def column(self, status='todo'):
+        with self.shard():
+            return list(
+                Task.objects.filter(board_id=self.board_id, status=status)
+                .order_by('position', 'id').values_list('id', flat=True)
+            )
+
+    def test_created_tasks_are_appended(self):
+        ids = [self.create_task(f'Task {i}') for i in range(3)]
+        self.assertEqual(self.column(), ids)
+
+        with self.shard():
+            board = Board.objects.get(pk=self.board_id)
+            task = Task.objects.create(board=board, title='ORM', description='d', author=self.user, due_date='2025-01-01')
+        self.assertEqual(self.column(), ids + [task.pk])
+
+    def test_move_between_neighbours(self):
+        first, second, third = [self.create_task(f'Task {i}') for i in range(3)]
+        response = self.client.patch(f'/api/tasks/{third}/move/', {'prev_id': first, 'next_id': second}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.column(), [first, third, second])
+
+        response = self.client.patch(f'/api/tasks/{first}/move/', {'status': 'done'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.column(), [third, second])
+        self.assertEqual(self.column('done'), [first])
+
+    def test_tied_keys_are_spread_without_touching_other_tasks(self):
+        ids = [self.create_task(f'Task {i}') for i in range(5)]
+        with self.shard():
+            tied = Task.objects.get(pk=ids[1]).position
+            Task.objects.filter(pk__in=ids[1:4]).update(position=tied)
+            untouched = dict(Task.objects.filter(pk__in=[ids[0], ids[4]]).values_list('id', 'position'))
+            task = Task.objects.get(pk=ids[0])
+            move_task(task, 'todo', prev_id=ids[1], next_id=ids[2])
+
+            self.assertEqual(self.column(), [ids[1], ids[0], ids[2], ids[3], ids[4]])
+            self.assertEqual(Task.objects.get(pk=ids[4]).position, untouched[ids[4]])
+            positions = list(Task.objects.filter(pk__in=ids).values_list('position', flat=True))
+        self.assertEqual(len(set(positions)), 5)
+
+    @override_settings(KANBAN_POSITION_REBALANCE_LENGTH=1)
+    def test_long_appended_key_queues_rebalance_once_per_column(self):
+        cache.clear()
+        self.create_task('First')
+        self.assertFalse(Job.objects.filter(name='kanban.rebalance_column').exists())
+        for title in ('Second', 'Third', 'Fourth'):
+            self.create_task(title)
+        self.create_task('Done', status='done')
+        self.create_task('Done too', status='done')
+
+        payloads = Job.objects.filter(name='kanban.rebalance_column').order_by('id').values_list('payload', flat=True)
+        self.assertEqual(list(payloads), [
+            {'board_id': self.board_id, 'status': 'todo'},
+            {'board_id': self.board_id, 'status': 'done'},
+        ])
+
+
+class BoardSnapshotTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.task_id = self.create_task('Task', assignee_id=self.other.pk, reviewer_id=self.other.pk)
+
+    def live(self):
+        with self.shard():
+            return render_board(Board.objects.get(pk=self.board_id))
+
+    def test_first_get_is_served_live_and_queues_build(self):
+        for _ in range(2):
+            response = self.client.get(f'/api/boards/{self.board_id}/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), self.live())
+        with self.shard():
+            self.assertFalse(BoardSnapshot.objects.exists())
+        job = Job.objects.get(name='kanban.build_board_snapshot')
+        self.assertEqual(job.payload, {'board_id': self.board_id})
+
+        build_board_snapshot_job(self.board_id)
+        with self.shard():
+            self.assertTrue(BoardSnapshot.objects.filter(board_id=self.board_id).exists())
+        self.assertEqual(self.client.get(f'/api/boards/{self.board_id}/').json(), self.live())
+
+    def test_task_write_during_build_is_not_lost(self):
+        save_fragments = snapshots.save_fragments
+        writes = []
+
+        def save_then_write(tasks):
+            written = save_fragments(tasks)
+            if writes:
+                return written
+            writes.append(self.task_id)
+            # A write landing after the build has read the tasks but before it commits.
+            with self.shard():
+                task = Task.objects.get(pk=self.task_id)
+                task.title = 'Renamed'
+                task.save()
+            return written
+
+        with mock.patch.object(snapshots, 'save_fragments', side_effect=save_then_write):
+            build_board_snapshot_job(self.board_id)
+
+        data = self.client.get(f'/api/boards/{self.board_id}/').json()
+        self.assertEqual(data['tasks'][0]['title'], 'Renamed')
+        with self.shard():
+            self.assertEqual(find_differences(Board.objects.get(pk=self.board_id)), [])
+
+    def test_deleting_a_user_refreshes_snapshot(self):
+        build_board_snapshot_job(self.board_id)
+        self.other.delete()
+
+        data = self.client.get(f'/api/boards/{self.board_id}/').json()
+        self.assertEqual([member['id'] for member in data['members']], [self.user.pk])
+        self.assertIsNone(data['tasks'][0]['assignee'])
+        self.assertIsNone(data['tasks'][0]['reviewer'])
+        with self.shard():
+            self.assertEqual(find_differences(Board.objects.get(pk=self.board_id)), [])
+
+
+@override_settings(TEXT_COMPRESS_MIN_LENGTH=100)
+class CompressedTextFieldTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task_id = self.create_task()
+
+    def raw_content(self, comment_id):
+        with self.shard():
+            with connections[get_db()].cursor() as cursor:
+                cursor.execute('SELECT content FROM kanban_app_comment WHERE id = %s', [comment_id])
+                return cursor.fetchone()[0]
+
+    def test_round_trip(self):
+        short = 'short comment'
+        long = ' '.join(['a long and repetitive comment'] * 20)
+        prefixed = 'zlib: not actually compressed'
+        ids = [self.create_comment(self.task_id, content) for content in (short, long, prefixed)]
+
+        self.assertEqual(self.raw_content(ids[0]), short)
+        self.assertTrue(self.raw_content(ids[1]).startswith(CompressedTextField.PREFIX))
+        self.assertLess(len(self.raw_content(ids[1])), len(long))
+        # Plain text that starts with the prefix is escaped by compressing it.
+        self.assertNotEqual(self.raw_content(ids[2]), prefixed)
+
+        with self.shard():
+            contents = dict(Comment.objects.filter(pk__in=ids).values_list('id', 'content'))
+        self.assertEqual([contents[pk] for pk in ids], [short, long, prefixed])
+
+        data = self.client.get(f'/api/tasks/{self.task_id}/comments/?preview=1').json()
+        entry = next(entry for entry in data['results'] if entry['id'] == ids[1])
+        self.assertEqual((entry['preview'], entry['content_length'], entry['truncated']), (long[:200], len(long), True))
+
+    def test_legacy_row_with_prefix_is_read_as_is(self):
+        comment_id = self.create_comment(self.task_id, 'placeholder')
+        with self.shard():
+            with connections[get_db()].cursor() as cursor:
+                cursor.execute(
+                    'UPDATE kanban_app_comment SET content = %s, preview = %s WHERE id = %s',
+                    ['zlib:legacy', '', comment_id]
+                )
+            self.assertEqual(Comment.objects.get(pk=comment_id).content, 'zlib:legacy')
+
+            migration = importlib.import_module('kanban_app.migrations.0019_backfill_comment_preview')
+            migration.backfill_preview(apps, SimpleNamespace(connection=connections[get_db()]))
+            comment = Comment.objects.get(pk=comment_id)
+        self.assertEqual((comment.content, comment.preview, comment.content_length), ('zlib:legacy', 'zlib:legacy', 11))
+        self.assertNotEqual(self.raw_content(comment_id), 'zlib:legacy')
+
+
+@override_settings(IDEMPOTENCY_LOCK_TIMEOUT_SECONDS=60)
+class IdempotencyKeyTests(KanbanTestCase):
+    def post_task(self, key, title='Task', **extra):
+        data = {
+            'board': self.board_id, 'title': title, 'description': 'd', 'status': 'todo',
+            'priority': 'medium', 'assignee_id': self.user.pk, 'due_date': '2025-01-01',
+        }
+        data.update(extra)
+        return self.client.post('/api/tasks/', data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def task_count(self):
+        with self.shard():
+            return Task.objects.filter(board_id=self.board_id).count()
+
+    def claim(self, key, age):
+        return IdempotencyKey.objects.create(
+            user=self.user, key=key, method='POST', path='/api/tasks/',
+            locked_at=timezone.now() - datetime.timedelta(seconds=age)
+        )
+
+    def test_retry_replays_stored_response(self):
+        first = self.post_task('k1')
+        self.assertEqual(first.status_code, 201, first.content)
+        retry = self.post_task('k1', title='Changed')
+        self.assertEqual((retry.status_code, retry.json()), (201, first.json()))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(self.task_count(), 1)
+
+    def test_key_reused_for_other_endpoint_is_rejected(self):
+        task_id = self.post_task('k1').json()['id']
+        response = self.client.post(
+            f'/api/tasks/{task_id}/comments/', {'content': 'Hi'}, format='json', HTTP_IDEMPOTENCY_KEY='k1'
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_running_claim_conflicts(self):
+        self.claim('k1', age=10)
+        self.assertEqual(self.post_task('k1').status_code, 409)
+        self.assertEqual(self.task_count(), 0)
+
+    def test_expired_claim_is_taken_over(self):
+        self.claim('k1', age=61)
+        response = self.post_task('k1')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 201)
+        self.assertEqual(self.post_task('k1').json(), response.json())
+        self.assertEqual(self.task_count(), 1)
+
+    def test_failed_request_releases_key(self):
+        self.assertEqual(self.post_task('k1', title='').status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post_task('k1').status_code, 201)
+
+    def test_lost_lease_rolls_back_writes(self):
+        perform_create = TaskViewSet.perform_create
+
+        def taken_over(view, serializer):
+            perform_create(view, serializer)
+            # A retry takes the key over while this request is still running.
+            IdempotencyKey.objects.update(locked_at=timezone.now() + datetime.timedelta(seconds=1))
+
+        with mock.patch.object(TaskViewSet, 'perform_create', taken_over):
+            self.assertEqual(self.post_task('k1').status_code, 409)
+        self.assertEqual(self.task_count(), 0)
+        self.assertIsNone(IdempotencyKey.objects.get().status_code)
+
+
+class UserDirectoryTests(KanbanTestCase):
+    def setUp(self):
+        super().setUp()
+        self.carl = User.objects.create_user('carl', 'carl@example.com', 'pw')
+        user_directory.clear()
+        self.addCleanup(user_directory.clear)
+
+    def test_list_loads_missing_users_in_one_query(self):
+        self.create_task('A', assignee_id=self.user.pk, reviewer_id=self.other.pk)
+        self.create_task('B', assignee_id=self.carl.pk)
+        user_directory.clear()
+        with self.shard():
+            tasks = list(Task.objects.order_by('id'))
+
+            with self.assertNumQueries(1, using='default'):
+                data = TaskSerializer(tasks, many=True).data
+            with self.assertNumQueries(0, using='default'):
+                TaskSerializer(tasks, many=True).data
+
+        self.assertEqual(
+            [(task['assignee'], task['reviewer']) for task in data],
+            [
+                ({'id': self.user.pk, 'email': 'alice@example.com', 'fullname': 'alice'},
+                 {'id': self.other.pk, 'email': 'bob@example.com', 'fullname': 'bob'}),
+                ({'id': self.carl.pk, 'email': 'carl@example.com', 'fullname': 'carl'}, None),
+            ]
+        )
+
+    @override_settings(USER_DIRECTORY_MAX_ENTRIES=2)
+    def test_evicts_least_recently_used(self):
+        user_directory.get_users([self.user.pk, self.other.pk])
+        user_directory.get_user(self.user.pk)
+        user_directory.get_user(self.carl.pk)
+
+        with self.assertNumQueries(0, using='default'):
+            user_directory.get_users([self.user.pk, self.carl.pk])
+        with self.assertNumQueries(1, using='default'):
+            self.assertEqual(user_directory.get_user(self.other.pk)['fullname'], 'bob')
+
+    def test_saved_and_deleted_users_are_evicted(self):
+        self.assertEqual(user_directory.get_user(self.carl.pk)['email'], 'carl@example.com')
+
+        self.carl.email = 'carl@example.org'
+        self.carl.save()
+        self.assertEqual(user_directory.get_user(self.carl.pk)['email'], 'carl@example.org')
+
+        carl_id = self.carl.pk
+        self.carl.delete()
+        self.assertIsNone(user_directory.get_user(carl_id))
+
+    @override_settings(USER_DIRECTORY_TTL_SECONDS=60)
+    def test_entries_expire_after_ttl(self):
+        with mock.patch.object(user_directory, 'time') as clock:
+            clock.monotonic.return_value = 1000
+            user_directory.get_user(self.carl.pk)
+            # Updates from other processes send no signal here.
+            User.objects.filter(pk=self.carl.pk).update(email='carl@example.org')
+
+            clock.monotonic.return_value = 1059
+            self.assertEqual(user_directory.get_user(self.carl.pk)['email'], 'carl@example.com')
+            clock.monotonic.return_value = 1061
+            self.assertEqual(user_directory.get_user(self.carl.pk)['email'], 'carl@example.org')
+
+
+class AdminTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.add_rows(3)
+        Board.objects.filter(pk=self.boards[0].pk).update(deleted_at=timezone.now())
+
+    def add_rows(self, count):
+        # The admin reads the default database, so the rows are created there directly.
+        self.boards = getattr(self, 'boards', [])
+        for i in range(count):
+            board = Board.objects.create(title=f'Board {len(self.boards)}', owner=self.admin)
+            task = Task.objects.create(board=board, title='Task', description='d', due_date='2025-01-01',
+                                       assigned_to=self.admin, author=self.admin)
+            Comment.objects.create(task=task, author=self.admin, content='A comment')
+            self.boards.append(board)
+
+    def get_changelist(self, model):
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.get(f'/admin/kanban_app/{model}/')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    @override_settings(ADMIN_COUNT_LIMIT=2)
+    def test_count_is_capped(self):
+        paginator = EstimatedCountPaginator(Task.objects.order_by('-id'), 1)
+        self.assertEqual((paginator.count, paginator.num_pages), (2, 2))
+
+    def test_changelists_use_a_fixed_number_of_queries(self):
+        before = {model: self.get_changelist(model)[1] for model in ('board', 'task', 'comment')}
+        self.add_rows(5)
+        for model, query_count in before.items():
+            response, after = self.get_changelist(model)
+            self.assertEqual(after, query_count, model)
+            # Tasks on the deleted board are hidden by Task.objects.
+            self.assertEqual(response.context['cl'].result_count, {'board': 8, 'task': 7, 'comment': 8}[model])
+
+        # Boards waiting to be purged are listed too.
+        response, _ = self.get_changelist('board')
+        self.assertIn(self.boards[0], response.context['cl'].result_list)
+
+    def test_comment_changelist_defers_content(self):
+        response, _ = self.get_changelist('comment')
+        comments = response.context['cl'].result_list
+        self.assertTrue(comments)
+        self.assertTrue(all('content' in comment.get_deferred_fields() for comment in comments))
+        self.assertContains(response, 'A comment')
@@ -0,0 +1,92 @@
+"""
+Process-wide cache of the nested user representation ({id, email, fullname}).
+
+Task, archive, activity and board serializers show users through
+DirectoryUserField, which resolves a user id here instead of joining the
+user table. Misses are loaded in one query per call, the cache keeps at most
+USER_DIRECTORY_MAX_ENTRIES users (least recently used are dropped), and a
+saved or deleted user is evicted in this process. Other processes pick up
+the change once their entry is older than USER_DIRECTORY_TTL_SECONDS.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+
+from kanban_app.models import User
+
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # user id -> (expires at, representation)
+
+
+def render_user(user_id, email, username):
+    """
+    Build the representation MiniUserSerializer produces for a user.
+    """
+    return {'id': user_id, 'email': email, 'fullname': username}
+
+
+def get_users(user_ids):
+    """
+    Return the representation of each existing user in `user_ids`, loading
+    the ones not cached yet in a single query. The returned dicts are shared
+    between callers and must not be modified.
+
+    Returns:
+        dict: user id → representation
+    """
+    now = time.monotonic()
+    found = {}
+    missing = []
+
+    with _lock:
+        for user_id in set(user_ids):
+            entry = _entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                _entries.move_to_end(user_id)
+                found[user_id] = entry[1]
+            else:
+                missing.append(user_id)
+
+    if missing:
+        rows = User.objects.filter(pk__in=missing).values_list('id', 'email', 'username')
+        expires = now + settings.USER_DIRECTORY_TTL_SECONDS
+        with _lock:
+            for row in rows:
+                user_id = row[0]
+                found[user_id] = render_user(*row)
+                _entries[user_id] = (expires, found[user_id])
+                _entries.move_to_end(user_id)
+            while len(_entries) > settings.USER_DIRECTORY_MAX_ENTRIES:
+                _entries.popitem(last=False)
+
+    return found
+
+
+def get_user(user_id):
+    """
+    Return the representation of one user, or None if it does not exist.
+    """
+    return get_users([user_id]).get(user_id)
+
+
+def invalidate(user_id):
+    with _lock:
+        _entries.pop(user_id, None)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def user_changed(sender, instance, using, **kwargs):
+    """
+    post_save and post_delete hook for User. The entry is dropped right away
+    and again after commit, in case another thread reloaded the old row meanwhile.
+    """
+    invalidate(instance.pk)
+    transaction.on_commit(lambda: invalidate(instance.pk), using=using)